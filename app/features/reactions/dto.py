@@ -60,6 +60,16 @@ class ReactionCount:
     count: int
 
 
+@dataclass(frozen=True)
+class CountDrift:
+    """A stored reaction counter that disagrees with post_reactions."""
+
+    post_id: int
+    reaction_type: str
+    stored: int
+    actual: int
+
+
 @dataclass(frozen=True)
 class PostReactionsData:
     """All reaction data for a post."""
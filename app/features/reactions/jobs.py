@@ -0,0 +1,14 @@
+"""Background jobs for reactions feature."""
+from app.common.db import db_session
+from app.features.reactions.repo import ReactionsRepo
+from app.features.reactions.service import ReactionsService
+
+
+def reconcile_reaction_counts() -> int:
+    """Scheduler entry point: repair counters that drifted from post_reactions. Returns rows fixed.
+
+    Every web worker schedules this; the reconcile lock lets one run at a time.
+    """
+    with db_session() as session:
+        drift = ReactionsService(ReactionsRepo(session)).reconcile_counts()
+    return len(drift or [])
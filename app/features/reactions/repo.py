@@ -1,4 +1,4 @@
-"""Repository for reactions data access - owns post_reactions table exclusively."""
+"""Repository for reactions data access - owns post_reactions and post_reaction_counts exclusively."""
 from datetime import datetime
 from typing import List, Optional
 
@@ -6,7 +6,9 @@ from sqlalchemy import text
 from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from app.features.reactions.dto import ReactionCount, ReactionData
+from app.features.reactions.dto import CountDrift, ReactionCount, ReactionData
+
+RECONCILE_LOCK_KEY = 0x5245_4143  # pg advisory lock id for counter reconciliation ("REAC")
 
 
 class ReactionsRepo:
@@ -42,23 +44,33 @@ class ReactionsRepo:
         return None
 
     def insert_reaction(self, post_id: int, user_id: int, reaction_type: str) -> None:
-        """Insert a new reaction."""
+        """Insert a new reaction and bump its counter, in the caller's transaction."""
         query = text("""
             INSERT INTO post_reactions (post_id, user_id, reaction_type, created_at)
             VALUES (:post_id, :user_id, :reaction_type, CURRENT_TIMESTAMP)
         """)
 
-        self.session.execute(
-            query, {"post_id": post_id, "user_id": user_id, "reaction_type": reaction_type}
-        )
+        params = {"post_id": post_id, "user_id": user_id, "reaction_type": reaction_type}
+        self.session.execute(query, params)
+        # Only reached if the insert succeeded, so a duplicate never double counts
+        self.increment_reaction_count(post_id, reaction_type)
+
+    def increment_reaction_count(self, post_id: int, reaction_type: str) -> None:
+        """Add one to the post's counter for reaction_type."""
+        query = text("""
+            INSERT INTO post_reaction_counts (post_id, reaction_type, count)
+            VALUES (:post_id, :reaction_type, 1)
+            ON CONFLICT (post_id, reaction_type) DO UPDATE SET count = post_reaction_counts.count + 1
+        """)
+
+        self.session.execute(query, {"post_id": post_id, "reaction_type": reaction_type})
 
     def get_reaction_counts(self, post_id: int) -> List[ReactionCount]:
         """Get reaction counts for a post."""
         query = text("""
-            SELECT reaction_type, COUNT(*) as count
-            FROM post_reactions
-            WHERE post_id = :post_id
-            GROUP BY reaction_type
+            SELECT reaction_type, count
+            FROM post_reaction_counts
+            WHERE post_id = :post_id AND count > 0
             ORDER BY reaction_type
         """)
 
@@ -74,10 +86,9 @@ class ReactionsRepo:
         # Use IN clause for SQLite compatibility
         placeholders = ','.join([str(pid) for pid in post_ids])
         query = text(f"""
-            SELECT post_id, reaction_type, COUNT(*) as count
-            FROM post_reactions
-            WHERE post_id IN ({placeholders})
-            GROUP BY post_id, reaction_type
+            SELECT post_id, reaction_type, count
+            FROM post_reaction_counts
+            WHERE post_id IN ({placeholders}) AND count > 0
             ORDER BY post_id, reaction_type
         """)
 
@@ -116,6 +127,18 @@ class ReactionsRepo:
 
     def delete_user_reactions(self, user_id: int) -> int:
         """Delete all reactions by a user (for account deletion)."""
+        # Take the user's reactions off the counters first, while they can still be seen
+        self.session.execute(text("""
+            UPDATE post_reaction_counts
+            SET count = count - (
+                SELECT COUNT(*) FROM post_reactions r
+                WHERE r.user_id = :user_id
+                  AND r.post_id = post_reaction_counts.post_id
+                  AND r.reaction_type = post_reaction_counts.reaction_type
+            )
+            WHERE post_id IN (SELECT post_id FROM post_reactions WHERE user_id = :user_id)
+        """), {"user_id": user_id})
+
         query = text("""
             DELETE FROM post_reactions
             WHERE user_id = :user_id
@@ -126,6 +149,9 @@ class ReactionsRepo:
 
     def delete_post_reactions(self, post_id: int) -> int:
         """Delete all reactions for a post (for post deletion)."""
+        self.session.execute(
+            text("DELETE FROM post_reaction_counts WHERE post_id = :post_id"), {"post_id": post_id}
+        )
         query = text("""
             DELETE FROM post_reactions
             WHERE post_id = :post_id
@@ -137,11 +163,72 @@ class ReactionsRepo:
     def get_reaction_stats(self) -> dict[str, int]:
         """Get overall reaction statistics."""
         query = text("""
-            SELECT reaction_type, COUNT(*) as count
-            FROM post_reactions
+            SELECT reaction_type, SUM(count) as count
+            FROM post_reaction_counts
             GROUP BY reaction_type
+            HAVING SUM(count) > 0
             ORDER BY count DESC
         """)
 
         results = self.session.execute(query).fetchall()
-        return {row.reaction_type: row.count for row in results}
\ No newline at end of file
+        return {row.reaction_type: row.count for row in results}
+
+    def find_count_drift(self) -> List[CountDrift]:
+        """Counters that disagree with a fresh COUNT(*) over post_reactions."""
+        query = text("""
+            SELECT a.post_id, a.reaction_type, COALESCE(c.count, 0) as stored, a.actual
+            FROM (
+                SELECT post_id, reaction_type, COUNT(*) as actual
+                FROM post_reactions
+                GROUP BY post_id, reaction_type
+            ) a
+            LEFT JOIN post_reaction_counts c
+              ON c.post_id = a.post_id AND c.reaction_type = a.reaction_type
+            WHERE c.count IS NULL OR c.count <> a.actual
+            UNION ALL
+            SELECT c.post_id, c.reaction_type, c.count as stored, 0 as actual
+            FROM post_reaction_counts c
+            WHERE c.count <> 0 AND NOT EXISTS (
+                SELECT 1 FROM post_reactions r
+                WHERE r.post_id = c.post_id AND r.reaction_type = c.reaction_type
+            )
+        """)
+
+        results = self.session.execute(query).fetchall()
+        return [
+            CountDrift(post_id=row.post_id, reaction_type=row.reaction_type, stored=row.stored, actual=row.actual)
+            for row in results
+        ]
+
+    def try_reconcile_lock(self) -> bool:
+        """Take the transaction-scoped reconcile lock; False if another worker holds it.
+
+        Postgres advisory lock, released on commit or rollback. Other databases
+        run a single process, so the lock is always granted there.
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return True
+        return bool(self.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+        ).scalar())
+
+    def apply_count_drift(self, drift: List[CountDrift]) -> None:
+        """Correct counters by (actual - stored).
+
+        Applied as a delta rather than an absolute value, so a reaction that
+        committed after the drift was read keeps its increment.
+        """
+        if not drift:
+            return
+        query = text("""
+            INSERT INTO post_reaction_counts (post_id, reaction_type, count)
+            VALUES (:post_id, :reaction_type, :delta)
+            ON CONFLICT (post_id, reaction_type) DO UPDATE
+            SET count = post_reaction_counts.count + EXCLUDED.count
+        """)
+
+        self.session.execute(
+            query,
+            [{"post_id": d.post_id, "reaction_type": d.reaction_type, "delta": d.actual - d.stored}
+             for d in drift],
+        )
\ No newline at end of file
@@ -1,5 +1,5 @@
 """Business logic for reactions feature."""
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy.exc import IntegrityError
 from psycopg2 import errors as pg_errors
@@ -7,6 +7,7 @@ from psycopg2 import errors as pg_errors
 from app.common.errors import ValidationError, NotFound
 from app.common.logging import get_feature_logger
 from app.features.reactions.dto import (
+    CountDrift,
     GetReactionsInput,
     GetReactionsResult,
     PostReactionsData,
@@ -33,6 +34,8 @@ class ReactionsService:
         Create a single reaction with proper business rules.
 
         Implements the "insert once, then show message" flow with race condition handling.
+        The post's per-type counter is bumped by the same insert, so it commits or rolls
+        back together with the reaction.
         """
         # Validate reaction type
         if input_data.reaction_type not in VALID_REACTIONS:
@@ -193,6 +196,32 @@ class ReactionsService:
         """Get list of valid reaction types."""
         return VALID_REACTIONS.copy()
 
+    def reconcile_counts(self, fix: bool = True) -> Optional[List[CountDrift]]:
+        """Recompute reaction counters from post_reactions; report and (unless fix=False) repair drift.
+
+        Returns None without reading anything if another worker is reconciling.
+        """
+        if not self.repo.try_reconcile_lock():
+            logger.info("Reaction counter reconciliation already running elsewhere, skipping")
+            return None
+        drift = self.repo.find_count_drift()
+
+        if drift:
+            logger.warning(
+                "Reaction counters drifted from post_reactions",
+                extra={
+                    "drifted": len(drift),
+                    "sample": [(d.post_id, d.reaction_type, d.stored, d.actual) for d in drift[:10]],
+                    "fixed": fix,
+                },
+            )
+            if fix:
+                self.repo.apply_count_drift(drift)
+        else:
+            logger.info("Reaction counters match post_reactions")
+
+        return drift
+
     def get_reaction_statistics(self) -> dict[str, int]:
         """Get overall reaction statistics."""
         logger.info("Getting reaction statistics")
@@ -5,7 +5,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.features.reactions.repo import ReactionsRepo
-from app.features.reactions.dto import ReactionData, ReactionCount
+from app.features.reactions.dto import CountDrift, ReactionData, ReactionCount
 
 
 class TestReactionsRepo:
@@ -29,6 +29,14 @@ class TestReactionsRepo:
                     UNIQUE(post_id, user_id)
                 )
             """))
+            conn.execute(text("""
+                CREATE TABLE post_reaction_counts (
+                    post_id INTEGER NOT NULL,
+                    reaction_type TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (post_id, reaction_type)
+                )
+            """))
             conn.commit()
 
         Session = sessionmaker(bind=engine)
@@ -162,6 +170,11 @@ class TestReactionsRepo:
         assert repo.get_user_reaction(post_id=2, user_id=123) is None
         assert repo.get_user_reaction(post_id=3, user_id=456) is not None  # Other user unaffected
 
+        # Counters follow the deleted reactions
+        assert repo.get_reaction_counts(post_id=1) == []
+        assert repo.get_reaction_counts(post_id=3) == [ReactionCount(reaction_type="star", count=1)]
+        assert repo.find_count_drift() == []
+
     def test_delete_post_reactions(self, repo, db_session):
         """Test deleting all reactions for a post."""
         # Insert reactions for multiple posts
@@ -180,6 +193,7 @@ class TestReactionsRepo:
         assert repo.get_user_reaction(post_id=1, user_id=123) is None
         assert repo.get_user_reaction(post_id=1, user_id=456) is None
         assert repo.get_user_reaction(post_id=2, user_id=123) is not None  # Other post unaffected
+        assert repo.get_reaction_counts_bulk([1, 2]) == {2: [ReactionCount(reaction_type="star", count=1)]}
 
     def test_get_reaction_stats(self, repo, db_session):
         """Test getting overall reaction statistics."""
@@ -209,4 +223,58 @@ class TestReactionsRepo:
         from sqlalchemy.exc import IntegrityError
         with pytest.raises(IntegrityError):
             repo.insert_reaction(post_id=1, user_id=2, reaction_type="fire")
-            db_session.commit()
\ No newline at end of file
+            db_session.commit()
+
+    def test_failed_duplicate_does_not_count(self, repo, db_session):
+        """Test that a rejected duplicate leaves the counters alone."""
+        from sqlalchemy.exc import IntegrityError
+        repo.insert_reaction(post_id=1, user_id=2, reaction_type="love")
+        db_session.commit()
+
+        with pytest.raises(IntegrityError):
+            repo.insert_reaction(post_id=1, user_id=2, reaction_type="love")
+        db_session.rollback()
+
+        assert repo.get_reaction_counts(post_id=1) == [ReactionCount(reaction_type="love", count=1)]
+
+    def test_find_and_repair_count_drift(self, repo, db_session):
+        """Test that drifted counters are found and overwritten with actual counts."""
+        repo.insert_reaction(post_id=1, user_id=1, reaction_type="love")
+        repo.insert_reaction(post_id=1, user_id=2, reaction_type="love")
+        repo.insert_reaction(post_id=2, user_id=1, reaction_type="fire")
+        # Drift: a lost increment, a stale counter and a reaction written around the repo
+        db_session.execute(text("UPDATE post_reaction_counts SET count = 1 WHERE post_id = 1"))
+        db_session.execute(text("INSERT INTO post_reaction_counts VALUES (3, 'star', 4)"))
+        db_session.execute(text("INSERT INTO post_reactions (post_id, user_id, reaction_type) VALUES (2, 2, 'peace')"))
+        db_session.commit()
+
+        drift = sorted(repo.find_count_drift(), key=lambda d: d.post_id)
+        assert drift == [
+            CountDrift(post_id=1, reaction_type="love", stored=1, actual=2),
+            CountDrift(post_id=2, reaction_type="peace", stored=0, actual=1),
+            CountDrift(post_id=3, reaction_type="star", stored=4, actual=0),
+        ]
+
+        repo.apply_count_drift(drift)
+        db_session.commit()
+
+        assert repo.find_count_drift() == []
+        assert repo.get_reaction_counts(post_id=1) == [ReactionCount(reaction_type="love", count=2)]
+        assert repo.get_reaction_counts(post_id=3) == []
+
+    def test_reaction_committed_after_drift_read_is_kept(self, repo, db_session):
+        """Test that repairs apply as deltas, so reactions racing the reconcile keep their increment."""
+        repo.insert_reaction(post_id=1, user_id=1, reaction_type="love")
+        db_session.execute(text("UPDATE post_reaction_counts SET count = 0 WHERE post_id = 1"))
+        db_session.commit()
+
+        drift = repo.find_count_drift()
+        assert drift == [CountDrift(post_id=1, reaction_type="love", stored=0, actual=1)]
+        repo.insert_reaction(post_id=1, user_id=2, reaction_type="love")
+        db_session.commit()
+
+        repo.apply_count_drift(drift)
+        db_session.commit()
+
+        assert repo.find_count_drift() == []
+        assert repo.get_reaction_counts(post_id=1) == [ReactionCount(reaction_type="love", count=2)]
@@ -8,6 +8,7 @@ from psycopg2 import errors as pg_errors
 from app.common.errors import ValidationError
 from app.features.reactions.service import ReactionsService, VALID_REACTIONS
 from app.features.reactions.dto import (
+    CountDrift,
     ReactOnceInput,
     ReactOnceResult,
     ReactionData,
@@ -253,4 +254,34 @@ class TestReactionsService:
         mock_repo.get_reaction_stats.assert_called_once()
         assert stats["love"] == 10
         assert stats["fire"] == 5
-        assert stats["star"] == 3
\ No newline at end of file
+        assert stats["star"] == 3
+
+    def test_reconcile_counts_repairs_drift(self, service, mock_repo):
+        """Test that reconciliation rewrites drifted counters."""
+        drift = [CountDrift(post_id=1, reaction_type="love", stored=1, actual=2)]
+        mock_repo.find_count_drift.return_value = drift
+
+        assert service.reconcile_counts() == drift
+        mock_repo.apply_count_drift.assert_called_once_with(drift)
+
+    def test_reconcile_counts_dry_run(self, service, mock_repo):
+        """Test that a dry run only reports drift."""
+        mock_repo.find_count_drift.return_value = [CountDrift(post_id=1, reaction_type="love", stored=1, actual=2)]
+
+        assert len(service.reconcile_counts(fix=False)) == 1
+        mock_repo.apply_count_drift.assert_not_called()
+
+    def test_reconcile_counts_consistent(self, service, mock_repo):
+        """Test that consistent counters are left alone."""
+        mock_repo.find_count_drift.return_value = []
+
+        assert service.reconcile_counts() == []
+        mock_repo.apply_count_drift.assert_not_called()
+
+    def test_reconcile_counts_skips_while_locked(self, service, mock_repo):
+        """Test that a worker that loses the reconcile lock reads and writes nothing."""
+        mock_repo.try_reconcile_lock.return_value = False
+
+        assert service.reconcile_counts() is None
+        mock_repo.find_count_drift.assert_not_called()
+        mock_repo.apply_count_drift.assert_not_called()
@@ -4,14 +4,6 @@ from flask import current_app
 def register_cli(app):
     """Register CLI commands for the app"""
 
-    @app.cli.command("jobs.decay")
-    def jobs_decay():
-        """Run boost decay task manually"""
-        with current_app.app_context():
-            from tasks.decay import run_decay_task
-            run_decay_task()
-            click.echo("✅ Boost decay task executed")
-
     @app.cli.command("jobs.wars")
     def jobs_wars():
         """Run war finishing task manually"""
@@ -20,16 +12,59 @@ def register_cli(app):
             close_expired_wars_and_award()
             click.echo("✅ War finishing task executed")
 
+    @app.cli.command("stats.check")
+    @click.option("--rebuild", is_flag=True, help="Recompute user_score_stats from scores")
+    def stats_check(rebuild):
+        """Check the user_score_stats rollup against scores"""
+        with current_app.app_context():
+            from services import score_stats
+            if rebuild:
+                n = score_stats.rebuild()
+                click.echo(f"✅ Rebuilt user_score_stats ({n} rows)")
+            report = score_stats.check()
+            if report["ok"]:
+                click.echo(f"✅ user_score_stats consistent ({report['rows']} rows)")
+            else:
+                click.echo(f"❌ user_score_stats drift: {report['missing']} missing, {report['extra']} extra, "
+                           f"{report['different']} different; sample {report['sample']}")
+                raise SystemExit(1)
+
+    @app.cli.command("stats.histogram")
+    def stats_histogram():
+        """Rebuild the score_histogram table from scores"""
+        with current_app.app_context():
+            from services import score_distribution
+            n = score_distribution.rebuild()
+            click.echo(f"✅ Rebuilt score_histogram from {n} completed games")
+
+    @app.cli.command("reactions.reconcile")
+    @click.option("--dry-run", is_flag=True, help="Report drift without repairing it")
+    def reactions_reconcile(dry_run):
+        """Check post_reaction_counts against post_reactions and repair drift"""
+        with current_app.app_context():
+            from app.common.db import db_session
+            from app.features.reactions.repo import ReactionsRepo
+            from app.features.reactions.service import ReactionsService
+            with db_session() as session:
+                drift = ReactionsService(ReactionsRepo(session)).reconcile_counts(fix=not dry_run)
+            if drift is None:
+                click.echo("⏳ Another worker is reconciling post_reaction_counts; try again shortly")
+                raise SystemExit(1)
+            if not drift:
+                click.echo("✅ post_reaction_counts consistent")
+            else:
+                verb = "found" if dry_run else "repaired"
+                click.echo(f"❌ post_reaction_counts drift {verb} on {len(drift)} counters; sample "
+                           f"{[(d.post_id, d.reaction_type, d.stored, d.actual) for d in drift[:10]]}")
+                if dry_run:
+                    raise SystemExit(1)
+
     @app.cli.command("jobs.all")
     def jobs_all():
         """Run all background tasks manually"""
         with current_app.app_context():
-            from tasks.decay import run_decay_task
             from tasks.wars_finish import close_expired_wars_and_award
 
-            run_decay_task()
-            click.echo("✅ Boost decay task executed")
-
             close_expired_wars_and_award()
             click.echo("✅ War finishing task executed")
 
@@ -4,13 +4,55 @@ Based on SoulBridge AI patterns adapted for open community
 """
 
 from datetime import datetime, date, timedelta
-from sqlalchemy import text
+from sqlalchemy import text, tuple_
 from models import db, Post, PostReaction, PostReport, UserCommunityStats, CommunityMute, User
+from services.boost_decay import effective_boost
+from services.author_cards import build_card
+from services.ranked_feed import ranked_feed
 from flask import current_app
+import base64
 import logging
 
 logger = logging.getLogger(__name__)
 
+class FeedPost:
+    """A post as the community feeds show it: author, reaction counts and the viewer's reaction"""
+
+    def __init__(self, post, user, reaction_counts, user_reaction=None, card=None):
+        self.id = post.id
+        self.user_id = post.user_id
+        self.body = post.body
+        self.image_url = post.image_url
+        self.category = post.category
+        self.content_type = post.content_type
+        self.boost_score = effective_boost(post)
+        self.last_boost_at = post.last_boost_at
+        self.created_at = post.created_at
+        self.user = user                        # User, or None if the author is gone
+        self.reaction_counts = reaction_counts  # {reaction_type: count}
+        self.reaction_total = sum(reaction_counts.values())
+        self.user_reaction = user_reaction
+        self.card = card                        # cached author card (services/author_cards.py), if given
+
+    def author(self):
+        return self.card or build_card(self.user_id, self.user)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "body": self.body,
+            "image_url": self.image_url,
+            "category": self.category,
+            "boost_score": self.boost_score,
+            "last_boost_at": self.last_boost_at.isoformat() if self.last_boost_at else None,
+            "created_at": self.created_at.isoformat(),
+            "author": self.author(),
+            "reaction_counts": self.reaction_counts,
+            "reaction_total": self.reaction_total,
+            "user_reaction": self.user_reaction
+        }
+
 class CommunityService:
     """Main service for community operations with proper rate limiting and stats tracking"""
 
@@ -173,6 +215,7 @@ class CommunityService:
         stats.updated_at = datetime.utcnow()
 
         db.session.commit()
+        ranked_feed.update([post])
 
         logger.info(f"User {user_id} created post {post.id} in category {category}")
         return post, "Post created successfully"
@@ -226,15 +269,10 @@ class CommunityService:
 
             post_author_id = post_check[1]
 
-            # Insert the reaction
+            # Insert the reaction (and bump the post's reaction counter in this transaction)
             try:
-                db.session.execute(
-                    text("""
-                        INSERT INTO post_reactions (post_id, user_id, reaction_type, created_at)
-                        VALUES (:post_id, :user_id, :reaction_type, NOW())
-                    """),
-                    {"post_id": post_id, "user_id": user_id, "reaction_type": reaction_type},
-                )
+                from app.features.reactions.repo import ReactionsRepo
+                ReactionsRepo(db.session).insert_reaction(post_id, user_id, reaction_type)
 
                 # Update user stats (reactor)
                 reactor_stats = CommunityService.get_or_create_user_stats(user_id)
@@ -350,8 +388,29 @@ class CommunityService:
         return mute, "User muted successfully"
 
     @staticmethod
-    def get_community_feed(user_id=None, category=None, limit=10, offset=0):
-        """Get community feed with proper filtering and mute handling"""
+    def encode_feed_cursor(post):
+        """Opaque keyset cursor for the feed position after post"""
+        raw = f"{post.created_at.isoformat()}|{post.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_feed_cursor(cursor):
+        """(created_at, id) from encode_feed_cursor; raises ValueError if malformed"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, post_id = raw.split("|")
+            return datetime.fromisoformat(created_at), int(post_id)
+        except Exception as e:
+            raise ValueError("invalid cursor") from e
+
+    @staticmethod
+    def get_community_feed(user_id=None, category=None, limit=10, cursor=None):
+        """
+        Get community feed with proper filtering and mute handling
+        Keyset-paginated on (created_at, id), newest first, so every page costs the
+        same however deep it is (served by ix_posts_feed_visible).
+        Returns (feed posts, next_cursor or None on the last page).
+        """
 
         # Filter posts with backward compatibility for existing posts
         query = Post.query.filter_by(is_hidden=False)
@@ -376,59 +435,56 @@ class CommunityService:
             muted_users = db.session.query(CommunityMute.muted_user_id).filter_by(muter_user_id=user_id)
             query = query.filter(~Post.user_id.in_(muted_users))
 
-        # Order by creation time (newest first) and apply pagination
-        posts = query.order_by(Post.created_at.desc()).offset(offset).limit(limit).all()
+        # Continue after the cursor's post; the tuple comparison matches the index order
+        if cursor:
+            query = query.filter(tuple_(Post.created_at, Post.id) < tuple_(*CommunityService.decode_feed_cursor(cursor)))
 
-        # Get additional data for each post
-        for post in posts:
-            # Get user info
-            post.user = User.query.get(post.user_id)
+        # Order by creation time (newest first), one extra row tells whether there is a next page
+        posts = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1).all()
+        next_cursor = CommunityService.encode_feed_cursor(posts[limit - 1]) if len(posts) > limit else None
 
-            # Get reaction counts with backward compatibility
+        return CommunityService.assemble_feed(posts[:limit], viewer_id=user_id), next_cursor
+
+    @staticmethod
+    def assemble_feed(posts, viewer_id=None, author_cards=None):
+        """
+        Wrap posts in FeedPost view models for the community page and the feed APIs.
+        Authors, per-type reaction counters and the viewer's reactions are one query each
+        for the whole page, never per post. Pass author_cards ({user_id: card}, with war
+        badges) to skip the authors query.
+        """
+        if not posts:
+            return []
+        post_ids = [p.id for p in posts]
+
+        authors = {}
+        if author_cards is None:
+            author_ids = list({p.user_id for p in posts})
+            authors = {u.id: u for u in User.query.filter(User.id.in_(author_ids)).all()}
+
+        counts = {pid: {} for pid in post_ids}
+        try:
+            # Maintained counters (post_reaction_counts), not a COUNT over post_reactions
+            from app.features.reactions.repo import ReactionsRepo
+            for pid, rows in ReactionsRepo(db.session).get_reaction_counts_bulk(post_ids).items():
+                counts[pid] = {rc.reaction_type: int(rc.count) for rc in rows}
+        except Exception as e:
+            # Transaction may be aborted, need to rollback before any new queries
+            db.session.rollback()
+            logger.warning(f"Failed to get reaction counts for feed posts {post_ids}: {e}")
+
+        user_reactions = {}
+        if viewer_id:
             try:
-                post.reaction_counts = db.session.execute(
-                    text("SELECT reaction_type, COUNT(*) as count FROM post_reactions WHERE post_id = :post_id GROUP BY reaction_type"),
-                    {"post_id": post.id}
-                ).all()
+                rows = db.session.query(PostReaction.post_id, PostReaction.reaction_type).filter(
+                    PostReaction.post_id.in_(post_ids), PostReaction.user_id == viewer_id).all()
+                user_reactions = {pid: reaction_type for pid, reaction_type in rows}
             except Exception as e:
-                # Transaction may be aborted, need to rollback before any new queries
                 db.session.rollback()
+                logger.warning(f"Failed to get reactions of user {viewer_id} for feed posts: {e}")
 
-                # Handle different database schema issues
-                if "reaction_type" in str(e) or "does not exist" in str(e):
-                    try:
-                        post.reaction_counts = db.session.execute(
-                            text("SELECT 'love' as reaction_type, COUNT(*) as count FROM post_reactions WHERE post_id = :post_id"),
-                            {"post_id": post.id}
-                        ).all()
-                    except Exception as fallback_e:
-                        # If even the fallback fails, assume table doesn't exist or has major issues
-                        post.reaction_counts = []
-                        logger.warning(f"Failed to get reaction counts for post {post.id}: {fallback_e}")
-                else:
-                    post.reaction_counts = []
-                    logger.warning(f"Unexpected error getting reaction counts for post {post.id}: {e}")
-
-            # Get user's reaction if logged in with backward compatibility
-            if user_id:
-                try:
-                    user_reaction = PostReaction.query.filter_by(post_id=post.id, user_id=user_id).first()
-                    post.user_reaction = user_reaction.reaction_type if user_reaction else None
-                except Exception as e:
-                    # Transaction may be aborted, need to rollback
-                    db.session.rollback()
-
-                    # Handle missing id column in post_reactions table
-                    if "does not exist" in str(e) or "aborted" in str(e):
-                        post.user_reaction = None
-                        logger.warning(f"Failed to get user reaction for post {post.id}, user {user_id}: {e}")
-                    else:
-                        post.user_reaction = None
-                        logger.error(f"Unexpected error getting user reaction for post {post.id}, user {user_id}: {e}")
-            else:
-                post.user_reaction = None
-
-        return posts
+        return [FeedPost(p, authors.get(p.user_id), counts[p.id], user_reactions.get(p.id),
+                         (author_cards or {}).get(p.user_id)) for p in posts]
 
     @staticmethod
     def get_user_community_summary(user_id):
@@ -461,12 +517,10 @@ class CommunityService:
                 logger.warning(f"User {user_id} attempted to delete post {post_id} belonging to user {post.user_id}")
                 return False
 
-            # Delete associated reactions first
+            # Delete associated reactions (and their counters) first
             try:
-                deleted_reactions = db.session.execute(
-                    text("DELETE FROM post_reactions WHERE post_id = :post_id"),
-                    {"post_id": post_id}
-                ).rowcount
+                from app.features.reactions.repo import ReactionsRepo
+                deleted_reactions = ReactionsRepo(db.session).delete_post_reactions(post_id)
                 logger.info(f"Deleted {deleted_reactions} reactions for post {post_id}")
             except Exception as e:
                 logger.error(f"Error deleting reactions for post {post_id}: {e}")
@@ -491,6 +545,7 @@ class CommunityService:
 
             # Commit all changes
             db.session.commit()
+            ranked_feed.remove([post_id])
 
             logger.info(f"Successfully deleted post {post_id} by user {user_id}")
             return True
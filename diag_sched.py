@@ -22,12 +22,57 @@ def scheduler_status():
         return jsonify(
             ok=True,
             heartbeats=heartbeats,
-            workers_expected=["decay", "wars"],
+            workers_expected=["wars", "puzzle_pool", "score_ingest", "season_archive", "reaction_counts"],
             timestamp=datetime.utcnow().isoformat()
         )
     except Exception as e:
         return jsonify(ok=False, error=str(e)), 500
 
+@bp.get("/puzzle-pool")
+def puzzle_pool_status():
+    """Show pre-generated puzzle pool depth, hit rate and refill timings"""
+    try:
+        from services.puzzle_pool import puzzle_pool
+        return jsonify(puzzle_pool.stats())
+    except Exception as e:
+        return jsonify(ok=False, error=str(e)), 500
+
+@bp.get("/puzzle-catalog")
+def puzzle_catalog_status():
+    """Show this worker's PuzzleBank catalog size, version and LRU counters"""
+    try:
+        from services.puzzle_catalog import puzzle_catalog
+        return jsonify(puzzle_catalog.stats())
+    except Exception as e:
+        return jsonify(ok=False, error=str(e)), 500
+
+@bp.get("/puzzle-cache")
+def puzzle_cache_status():
+    """Show this worker's seed -> puzzle cache size and hit rate"""
+    try:
+        from services.puzzle_cache import puzzle_cache
+        return jsonify(puzzle_cache.stats())
+    except Exception as e:
+        return jsonify(ok=False, error=str(e)), 500
+
+@bp.get("/score-ingest")
+def score_ingest_status():
+    """Show queued and parked /api/score submissions"""
+    try:
+        from services.score_ingest import score_ingest
+        return jsonify(score_ingest.stats())
+    except Exception as e:
+        return jsonify(ok=False, error=str(e)), 500
+
+@bp.get("/live-events")
+def live_events_status():
+    """Show open SSE streams on this worker"""
+    try:
+        from services.live_events import live_events
+        return jsonify(live_events.stats())
+    except Exception as e:
+        return jsonify(ok=False, error=str(e)), 500
+
 @bp.get("/routes")
 def routes_list():
     """List all registered routes for debugging"""
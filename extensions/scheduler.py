@@ -1,28 +1,51 @@
-import atexit
+import atexit, random, time
+from datetime import datetime, timedelta
 from threading import Thread, Event
 
 _stop = Event()
 _threads = []
 
+HEARTBEAT_MIN_SEC = 60  # workers that tick more often write their heartbeat row at most this often
+SHARED_START_JITTER_SEC = 600  # shared jobs first run within this long after boot, not at boot
+
 def init_scheduler(app):
     """Start background workers with proper app context and clean shutdown."""
 
-    def make_worker(name, interval_s, fn_path, heartbeat_name):
+    def ran_elsewhere(heartbeat_name, interval_s):
+        """True if some worker ran this job within the last interval (its heartbeat is that recent)"""
+        from models import db, Heartbeat
+        hb = db.session.get(Heartbeat, heartbeat_name)
+        recent = bool(hb) and hb.last_run > datetime.utcnow() - timedelta(seconds=interval_s)
+        db.session.rollback()  # don't sit idle in a transaction until the next tick
+        return recent
+
+    def make_worker(name, interval_s, fn_path, heartbeat_name, shared=False):
+        """shared: a heavy job that needs one run per interval across all workers, not one per worker"""
         def worker():
+            last_beat = None
+            if shared:
+                # Not at boot, so a deploy doesn't start it in every worker at once
+                _stop.wait(random.uniform(0, min(interval_s, SHARED_START_JITTER_SEC)))
             with app.app_context():
                 while not _stop.is_set():
                     try:
+                        if shared and ran_elsewhere(heartbeat_name, interval_s):
+                            _stop.wait(interval_s)
+                            continue
                         # Lazy import to avoid cycles
                         mod_name, func_name = fn_path.rsplit(".", 1)
                         mod = __import__(mod_name, fromlist=[func_name])
                         fn = getattr(mod, func_name)
                         fn()  # run task
-                        # heartbeat
-                        try:
-                            from models import Heartbeat
-                            Heartbeat.beat(heartbeat_name)
-                        except Exception as hb_err:
-                            app.logger.warning(f"Heartbeat error: {hb_err}")
+                        # heartbeat, throttled so fast workers don't write a row every tick
+                        now = time.monotonic()
+                        if last_beat is None or now - last_beat >= HEARTBEAT_MIN_SEC:
+                            try:
+                                from models import Heartbeat
+                                Heartbeat.beat(heartbeat_name)
+                                last_beat = now
+                            except Exception as hb_err:
+                                app.logger.warning(f"Heartbeat error: {hb_err}")
                     except Exception as e:
                         app.logger.error(f"{name} error: {e}")
                     _stop.wait(interval_s)
@@ -36,11 +59,14 @@ def init_scheduler(app):
         import os
         FAST = os.getenv("FAST_SCHEDULE") == "1"
         specs = [
-            ("DecayWorker", 5 if FAST else 1080, "tasks.decay.run_decay_task", "decay"),  # 18 min
-            ("WarsWorker",  5 if FAST else 300,  "tasks.wars_finish.close_expired_wars_and_award", "wars"),  # 5 min
+            ("WarsWorker",  5 if FAST else 300,  "tasks.wars_finish.close_expired_wars_and_award", "wars", False),  # 5 min
+            ("PuzzlePoolWorker", 5 if FAST else 30, "services.puzzle_pool.refill_pools", "puzzle_pool", False),  # 30 s
+            ("ScoreIngestWorker", 1 if FAST else 2, "services.score_ingest.drain_scores", "score_ingest", False),  # 2 s
+            ("SeasonArchiveWorker", 5 if FAST else 3600, "services.season_archive.archive_seasons", "season_archive", True),  # 1 h
+            ("ReactionCountsWorker", 5 if FAST else 86400, "app.features.reactions.jobs.reconcile_reaction_counts", "reaction_counts", True),  # 24 h, once across workers
         ]
-        for wname, interval, target, hb in specs:
-            t = Thread(target=make_worker(wname, interval, target, hb), daemon=True, name=wname)
+        for wname, interval, target, hb, shared in specs:
+            t = Thread(target=make_worker(wname, interval, target, hb, shared), daemon=True, name=wname)
             t.start()
             _threads.append(t)
             app.logger.info(f"Started {wname} (every {interval}s)")
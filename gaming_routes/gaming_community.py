@@ -1,10 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
-from models import db, Post, PostBoost, User, UserBadge
+from models import db, Post, PostBoost, User
 from services.credits import spend_credits_v2, NotEnoughCredits
-from services.war_badges_catalog import level_theme
 from csrf_utils import require_csrf
 from promotion_war_service import PromotionWarService
+from community_service import CommunityService
+from services.live_events import live_events
+from services.boost_decay import add_boost, ranked_posts
+from services.ranked_feed import ranked_feed
+from services.author_cards import author_cards
 from datetime import datetime
 import json
 import logging
@@ -15,6 +19,7 @@ gaming_community_bp = Blueprint("gaming_community", __name__)
 
 BASE_PROMOTION_COST = 10
 BASE_PROMOTION_POINTS = 10
+FEED_SIZE = 100  # posts in the boost-ranked feed
 
 def _check_boost_penalty(user_id):
     """Check if user is under boost penalty."""
@@ -74,15 +79,16 @@ def boost_post():
         # Deduct credits first - this will raise NotEnoughCredits if insufficient
         remaining = spend_credits_v2(current_user.id, promotion_cost, "promotion", meta={"post_id": post.id})
 
-        # Apply promotion to post
-        post.boost_score = (post.boost_score or 0) + promotion_points
-        post.last_boost_at = datetime.utcnow()
+        # Apply promotion on top of what is left of the post's decayed boost
+        now = datetime.utcnow()
+        add_boost(post, promotion_points, now)
+        post.last_boost_at = now
 
         # Record the promotion transaction
         db.session.add(PostBoost(post_id=post.id, user_id=current_user.id, credits_spent=promotion_cost))
 
         # Record promotion in any active war
-        PromotionWarService.record_promotion_during_war(current_user.id, post_id, promotion_points, promotion_cost)
+        war_scores = PromotionWarService.record_promotion_during_war(current_user.id, post_id, promotion_points, promotion_cost)
 
         # Use discount if applicable
         if promotion_cost < BASE_PROMOTION_COST:
@@ -93,6 +99,14 @@ def boost_post():
 
         logger.info(f"Post {post_id} promoted successfully by user {current_user.id}. Cost: {promotion_cost}, Points: {promotion_points}, Remaining credits: {remaining}")
 
+        ranked_feed.update([post])
+
+        # Push the new war score to both sides' live streams
+        if war_scores:
+            event = dict(war_scores, user_id=current_user.id, post_id=post.id, delta=promotion_points)
+            for uid in (war_scores["challenger_user_id"], war_scores["challenged_user_id"]):
+                live_events.publish(f"promotion-war:user:{uid}", "war_score", event)
+
         cost_message = ""
         if promotion_cost < BASE_PROMOTION_COST:
             cost_message = f" (discount applied: {promotion_cost} credits instead of {BASE_PROMOTION_COST})"
@@ -119,51 +133,36 @@ def boost_post():
 @gaming_community_bp.route("/api/community/feed", methods=["GET"])
 @login_required
 def community_feed():
-    posts = (Post.query
-             .filter_by(is_hidden=False)
-             .order_by(
-                 Post.boost_score.desc(),
-                 Post.last_boost_at.desc().nullslast(),
-                 Post.created_at.desc()
-             )
-             .limit(100).all())
-
-    def get_author_info(user_id):
-        user = User.query.get(user_id)
-        if not user:
-            return {"id": user_id, "name": "Unknown", "avatar": None, "war_badge": None}
-
-        badge = UserBadge.query.filter_by(user_id=user.id, code="war_champion_lvl").first()
-        war_badge = None
-        if badge:
-            theme = level_theme(badge.level)
-            if theme:
-                war_badge = {
-                    "level": badge.level,
-                    "wins": user.war_wins or 0,
-                    "name": theme["name"],
-                    "icon": theme["icon"],
-                    "theme": theme["theme"]
-                }
-
-        return {
-            "id": user.id,
-            "name": user.display_name or user.username,
-            "avatar": user.profile_image_data or user.profile_image_url,
-            "war_badge": war_badge
-        }
-
-    feed_posts = []
-    for post in posts:
-        feed_posts.append({
-            "id": post.id,
-            "user_id": post.user_id,
-            "body": post.body,
-            "image_url": post.image_url,
-            "boost_score": post.boost_score or 0,
-            "last_boost_at": post.last_boost_at.isoformat() if post.last_boost_at else None,
-            "created_at": post.created_at.isoformat(),
-            "author": get_author_info(post.user_id)
-        })
+    """
+    Community feed as JSON
+    Default: top FEED_SIZE posts by effective boost. sort=new: the /community feed, newest first,
+    keyset-paginated; pass next_cursor back as cursor for the next page.
+    Query (sort=new): category, limit=10 (max 50), cursor
+    """
+    if request.args.get("sort") == "new":
+        limit = max(1, min(50, int(request.args.get("limit", 10))))
+        try:
+            feed, next_cursor = CommunityService.get_community_feed(
+                user_id=current_user.id,
+                category=request.args.get("category"),
+                limit=limit,
+                cursor=request.args.get("cursor")
+            )
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid cursor"}), 400
+        return jsonify({"posts": [fp.to_dict() for fp in feed], "next_cursor": next_cursor})
+
+    # One range read of the Redis ranked feed, then the posts by primary key
+    ids = ranked_feed.ids(FEED_SIZE)
+    if ids is None:
+        posts = ranked_posts(Post.query.filter_by(is_hidden=False), FEED_SIZE)
+    else:
+        rows = {p.id: p for p in Post.query.filter(Post.id.in_(ids), Post.is_hidden == False).all()}
+        posts = [rows[pid] for pid in ids if pid in rows]
+
+    # Author name, avatar and war badge from the card cache (one MGET)
+    cards = author_cards.get_many(p.user_id for p in posts)
+    feed_posts = [fp.to_dict() for fp in
+                  CommunityService.assemble_feed(posts, viewer_id=current_user.id, author_cards=cards)]
 
     return jsonify({"posts": feed_posts})
\ No newline at end of file
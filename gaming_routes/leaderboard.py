@@ -1,32 +1,31 @@
-from flask import Blueprint, jsonify
+import re
+from flask import Blueprint, jsonify, request
 from models import User, Score, db
 from sqlalchemy import func, desc, text
 from utils.public import public
+from utils.http_cache import conditional
 
 leaderboard_bp = Blueprint("leaderboard", __name__)
 
 @leaderboard_bp.route("/api/leaderboard/word-finder", methods=["GET"])
 @public
+@conditional(lambda: ["word_finder:*"])
 def word_finder_leaderboard():
     """Get Word Finder leaderboard showing top players by completion rate and speed"""
     try:
-        # Use raw SQL for database compatibility
+        # Read the user_score_stats rollup (mode '*' = all modes) instead of aggregating scores
         sql = text("""
             SELECT
                 u.id as user_id,
                 COALESCE(u.display_name, u.username) as name,
                 COALESCE(u.profile_image_data, u.profile_image_url) as avatar,
-                COUNT(s.id) as completed_games,
-                AVG(s.duration_sec) as avg_time,
-                AVG(s.found_count * 100.0 / GREATEST(COALESCE(s.found_count, 1), 1)) as avg_completion_rate,
-                MAX(s.created_at) as last_played
-            FROM scores s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.found_count > 0
-                AND (s.game_mode = 'mini_word_finder' OR s.game_mode IS NULL)
-            GROUP BY u.id, u.display_name, u.username, u.profile_image_data, u.profile_image_url
-            HAVING COUNT(s.id) >= 3
-            ORDER BY COUNT(s.id) DESC, AVG(s.duration_sec) ASC
+                st.games as completed_games,
+                st.duration_sum * 1.0 / NULLIF(st.duration_count, 0) as avg_time,
+                st.last_played
+            FROM user_score_stats st
+            JOIN users u ON st.user_id = u.id
+            WHERE st.mode = '*' AND st.games >= 3
+            ORDER BY st.games DESC, avg_time ASC
             LIMIT 50
         """)
 
@@ -45,7 +44,7 @@ def word_finder_leaderboard():
                 "avatar": leader.avatar,
                 "completed_games": leader.completed_games,
                 "avg_time": f"{avg_minutes}:{avg_seconds:02d}",
-                "avg_completion_rate": round(leader.avg_completion_rate or 0, 1),
+                "avg_completion_rate": 100.0,  # only games with found_count > 0 are counted
                 "last_played": leader.last_played.strftime('%Y-%m-%d') if leader.last_played else None
             })
 
@@ -56,30 +55,27 @@ def word_finder_leaderboard():
 
 @leaderboard_bp.route("/api/leaderboard/word-finder/<mode>", methods=["GET"])
 @public
+@conditional(lambda mode: [f"word_finder:{mode}"])
 def word_finder_mode_leaderboard(mode):
     """Get Word Finder leaderboard for specific difficulty mode (easy/medium/hard)"""
     if mode not in ['easy', 'medium', 'hard']:
         return jsonify({"error": "Invalid mode. Use easy, medium, or hard"}), 400
 
     try:
-        # Use raw SQL for database compatibility
+        # Read the user_score_stats rollup instead of aggregating scores
         sql = text("""
             SELECT
                 u.id as user_id,
                 COALESCE(u.display_name, u.username) as name,
                 COALESCE(u.profile_image_data, u.profile_image_url) as avatar,
-                COUNT(s.id) as completed_games,
-                MIN(s.duration_sec) as best_time,
-                AVG(s.duration_sec) as avg_time,
-                MAX(s.created_at) as last_played
-            FROM scores s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.found_count > 0
-                AND (s.game_mode = 'mini_word_finder' OR s.game_mode IS NULL)
-                AND s.mode = :mode
-            GROUP BY u.id, u.display_name, u.username, u.profile_image_data, u.profile_image_url
-            HAVING COUNT(s.id) >= 1
-            ORDER BY MIN(s.duration_sec) ASC, COUNT(s.id) DESC
+                st.games as completed_games,
+                st.best_time,
+                st.duration_sum * 1.0 / NULLIF(st.duration_count, 0) as avg_time,
+                st.last_played
+            FROM user_score_stats st
+            JOIN users u ON st.user_id = u.id
+            WHERE st.mode = :mode AND st.games >= 1
+            ORDER BY st.best_time ASC, st.games DESC
             LIMIT 25
         """)
 
@@ -115,8 +111,54 @@ def word_finder_mode_leaderboard(mode):
     except Exception as e:
         return jsonify({"error": str(e), "leaders": []}), 500
 
+@leaderboard_bp.route("/api/leaderboard/word-finder/distribution", methods=["GET"])
+@public
+def word_finder_distribution():
+    """
+    Percentile standing and score histogram for word finder leaderboard scores
+    Query: mode=all|easy|medium|hard, season=current|2025-W38|all, score and/or user_id, buckets=10
+    "games" covers every completed game in (mode, season); "players" ranks each player's
+    best score on the weekly leaderboard, which has no modes, so it is only given for mode=all.
+    """
+    from services.leaderboard import leaderboard_service
+    from services.score_distribution import distribution, ALL
+    from services.score_ingest import LEADERBOARD_GAME
+
+    mode = request.args.get("mode", "all")
+    if mode not in ['all', 'easy', 'medium', 'hard']:
+        return jsonify({"error": "Invalid mode. Use all, easy, medium, or hard"}), 400
+    season = request.args.get("season", "current")
+    if season == "current":
+        season = leaderboard_service.iso_week_season()
+    elif season != "all" and not re.fullmatch(r"\d{4}-W\d{2}", season):
+        return jsonify({"error": "Invalid season. Use current, all, or a week like 2025-W38"}), 400
+    try:
+        score = int(request.args["score"]) if request.args.get("score") else None
+    except ValueError:
+        return jsonify({"error": "invalid_score"}), 400
+    user_id = request.args.get("user_id") or None
+    buckets = leaderboard_service.clamp_int(request.args.get("buckets"), 1, 50, 10)
+
+    try:
+        players = None
+        if season == "all":
+            if score is None and user_id:
+                score = leaderboard_service.get_user_best(LEADERBOARD_GAME, user_id)["best_all_time"]
+        elif mode == "all":
+            players = leaderboard_service.get_distribution(LEADERBOARD_GAME, season, user_id=user_id,
+                                                           score=score, buckets=buckets)
+            score = players["score"]
+        elif score is None and user_id:
+            score = leaderboard_service.get_user_rank(LEADERBOARD_GAME, user_id, season)["score"]
+        games = distribution(ALL if mode == "all" else mode, ALL if season == "all" else season, score, buckets)
+        return jsonify({"mode": mode, "season": season, "score": score, "games": games, "players": players})
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @leaderboard_bp.route("/api/leaderboard/war-wins", methods=["GET"])
 @public
+@conditional(lambda: ["war_wins"])
 def war_wins_leaderboard():
     leaders = (User.query
                .filter(User.war_wins > 0)
@@ -7,9 +7,13 @@ from flask import Blueprint, request, jsonify
 from services.leaderboard import leaderboard_service
 from csrf_utils import csrf_exempt
 from utils.public import public
+from utils.sse import sse_response
+from utils.http_cache import conditional
 
 redis_leaderboard_bp = Blueprint("redis_leaderboard", __name__)
 
+MAX_BOARDS = 20  # (game, season) pairs per /top_many request
+
 @redis_leaderboard_bp.route("/api/leaderboard/submit", methods=["POST"])
 @csrf_exempt
 def submit_score():
@@ -48,8 +52,14 @@ def submit_score():
 
     return jsonify(result)
 
+def _top_boards():
+    game_code = request.args.get("game_code", "").strip()
+    season_id = request.args.get("season_id") or leaderboard_service.iso_week_season()
+    return [f"lb:{game_code}:{season_id}"]
+
 @redis_leaderboard_bp.route("/api/leaderboard/top", methods=["GET"])
 @public
+@conditional(_top_boards)
 def top_scores():
     """
     Get top N scores
@@ -70,6 +80,40 @@ def top_scores():
 
     return jsonify(result)
 
+@redis_leaderboard_bp.route("/api/leaderboard/top_many", methods=["GET"])
+@public
+def top_scores_many():
+    """
+    Get top N scores for several games and seasons in one call
+    Query: game_code=a,b (required), season_id=2025-W38,2025-W39 (optional, default current), n=10
+    Returns one board per (game_code, season_id) pair
+    """
+    game_codes = [g.strip() for g in request.args.get("game_code", "").split(",") if g.strip()]
+    if not game_codes:
+        return jsonify({"ok": False, "error": "missing_game_code"}), 400
+    season_ids = [s.strip() for s in request.args.get("season_id", "").split(",") if s.strip()] or [None]
+
+    boards = [(g, sid) for g in game_codes for sid in season_ids]
+    if len(boards) > MAX_BOARDS:
+        return jsonify({"ok": False, "error": "too_many_boards", "max": MAX_BOARDS}), 400
+
+    n = int(request.args.get("n", 10))
+
+    return jsonify(leaderboard_service.get_top_scores_many(boards, n=n))
+
+@redis_leaderboard_bp.route("/api/leaderboard/stream", methods=["GET"])
+@public
+def leaderboard_stream():
+    """
+    Server-Sent Events for a game's leaderboard: a rank event per submission batch
+    Query: game_code (required)
+    Event data: {game_code, season_id, entries: [{user_id, display_name, rank, score}]}
+    """
+    game_code = request.args.get("game_code", "").strip()
+    if not game_code:
+        return jsonify({"ok": False, "error": "missing_game_code"}), 400
+    return sse_response([f"leaderboard:{game_code}"])
+
 @redis_leaderboard_bp.route("/api/leaderboard/around", methods=["GET"])
 @public
 def around_me():
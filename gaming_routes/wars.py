@@ -5,6 +5,10 @@ from models import db, Post, BoostWar, BoostWarAction, User, PromotionWar
 from services.credits import spend_credits_v2, NotEnoughCredits
 from csrf_utils import require_csrf
 from promotion_war_service import PromotionWarService
+from services.live_events import live_events
+from services.boost_decay import add_boost, effective_boost
+from services.ranked_feed import ranked_feed
+from utils.sse import sse_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -63,7 +67,7 @@ def wars_challenge():
     # Get the post to verify it's actually boosted
     if challenger_post_id:
         post = Post.query.get(challenger_post_id)
-        if not post or post.boost_score <= 0:
+        if not post or effective_boost(post) <= 0:
             return jsonify({"success": False, "error": "You can only challenge boosted posts"}), 400
 
     logger.info(f"User {current_user.id} challenging user {challenged_user_id} to boost war")
@@ -174,7 +178,7 @@ def wars_action():
         return jsonify({"success": False, "error": str(e)}), 400
 
     post = Post.query.get(target_post_id)
-    post.boost_score = max((post.boost_score or 0) + delta, 0)
+    add_boost(post, delta)
 
     db.session.add(BoostWarAction(
         war_id=war.id,
@@ -185,6 +189,16 @@ def wars_action():
         points_delta=delta
     ))
     db.session.commit()
+    ranked_feed.update([post])
+
+    live_events.publish(f"war:{war.id}", "war_score", {
+        "war_id": war.id,
+        "actor_user_id": current_user.id,
+        "action": action,
+        "post_id": post.id,
+        "boost_score": post.boost_score,
+        "delta": delta
+    })
 
     return jsonify({
         "success": True,
@@ -212,6 +226,15 @@ def wars_status():
         }
     })
 
+@wars_bp.route("/api/wars/stream", methods=["GET"])
+@login_required
+def wars_stream():
+    """Server-Sent Events for one war: a war_score event per boost or unboost"""
+    war_id = request.args.get("warId", type=int)
+    if not war_id:
+        return jsonify({"success": False, "error": "Missing warId"}), 400
+    return sse_response([f"war:{war_id}"])
+
 # New Promotion War System Routes
 
 @wars_bp.route("/api/promotion-wars/challenge", methods=["POST"])
@@ -276,4 +299,10 @@ def promotion_wars_status():
     return jsonify({
         "success": True,
         "status": user_status
-    })
\ No newline at end of file
+    })
+
+@wars_bp.route("/api/promotion-wars/stream", methods=["GET"])
+@login_required
+def promotion_wars_stream():
+    """Server-Sent Events for the current user's promotion wars: a war_score event per promotion"""
+    return sse_response([f"promotion-war:user:{current_user.id}"])
@@ -1,6 +1,7 @@
 import os, json, hashlib, random, psycopg2
 from psycopg2.extras import execute_values
-from puzzles import generate_puzzle_from_words, MODE_CONFIG
+from puzzles import generate_puzzles_batch, MODE_CONFIG
+from word_index import category_words
 
 def sha1(d):
     return hashlib.sha1(json.dumps(d, sort_keys=True).encode()).hexdigest()
@@ -14,19 +15,9 @@ def fetch_category_keys(conn, only=None):
             cur.execute("SELECT key FROM categories ORDER BY key")
         return [r[0] for r in cur.fetchall()]
 
-def pick_words(conn, category, k, max_len):
-    """Pick words from database for specific category"""
-    with conn.cursor() as cur:
-        cur.execute("""
-          SELECT w.text
-          FROM words w
-          JOIN word_categories wc ON wc.word_id = w.id
-          JOIN categories c ON c.id = wc.category_id
-          WHERE c.key = %s AND w.is_banned = FALSE AND w.length <= %s
-          ORDER BY random()
-          LIMIT %s
-        """, (category, max_len, k))
-        return [r[0].upper() for r in cur.fetchall()]
+def pick_words(category, k, max_len, rnd):
+    """Pick words for specific category from the in-process word index"""
+    return category_words.sample(category, k, max_len, rnd=rnd)
 
 def flush(cur, rows):
     """Flush rows to puzzle_bank table"""
@@ -43,6 +34,7 @@ if __name__ == "__main__":
     ap.add_argument("--modes", default="easy,medium,hard")
     ap.add_argument("--categories", nargs="*", help="optional list of category keys")
     ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None, help="generator processes (default: CPU count)")
     args = ap.parse_args()
 
     url = os.getenv("DATABASE_URL")
@@ -50,6 +42,7 @@ if __name__ == "__main__":
 
     conn = psycopg2.connect(url)
     cur = conn.cursor()
+    category_words.refresh(conn, force=True)
 
     # Fetch categories from database
     cats = fetch_category_keys(conn, args.categories)
@@ -71,17 +64,24 @@ if __name__ == "__main__":
         for mode in modes:
             n = MODE_CONFIG[mode]["size"]
             k = MODE_CONFIG[mode]["words"]
-            generated = 0
+            jobs = []
 
             for i in range(args.per_mode):
                 seed = rnd.randint(1, 2_000_000_000)
-                words = pick_words(conn, cat, k, n)
+                words = pick_words(cat, k, n, rnd)
 
                 if len(words) < k:
                     print(f"  Warning: Only found {len(words)} words for {cat}/{mode}, skipping")
                     continue
 
-                P = generate_puzzle_from_words(mode, words, seed=seed)
+                jobs.append((i, words, seed))
+
+            puzzles = generate_puzzles_batch(
+                mode, [w for _, w, _ in jobs], [s for _, _, s in jobs], workers=args.workers
+            )
+            generated = 0
+
+            for (i, _, _), P in zip(jobs, puzzles):
                 payload = {
                     "mode": mode,
                     "category": cat,
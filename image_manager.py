@@ -8,6 +8,7 @@ import logging
 from typing import Dict, Any, Optional, Tuple
 from PIL import Image
 from models import db, User
+from services.author_cards import author_cards
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,7 @@ class ProfileImageManager:
             user.profile_image_url = None
 
             db.session.commit()
+            author_cards.invalidate([user.id])
 
             logger.info(f"Profile image uploaded successfully for user {user_id}: {format_type}")
 
@@ -236,6 +238,7 @@ class ProfileImageManager:
             user.profile_image_url = None  # Also clear old file-based URL
 
             db.session.commit()
+            author_cards.invalidate([user.id])
 
             logger.info(f"Profile image deleted for user {user_id}")
             return {"success": True, "message": "Profile image deleted successfully"}
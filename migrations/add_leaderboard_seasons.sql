@@ -0,0 +1,24 @@
+-- Archived weekly seasons of the Redis leaderboard (services/season_archive.py).
+-- Once a season is snapshotted here its lb:/user: keys in Redis get a TTL,
+-- and /api/leaderboard/* reads for that season come from these tables.
+
+CREATE TABLE IF NOT EXISTS leaderboard_seasons (
+    game_code VARCHAR(64) NOT NULL,
+    season_id VARCHAR(16) NOT NULL,
+    players INTEGER NOT NULL DEFAULT 0,
+    archived_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (game_code, season_id)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_season_entries (
+    game_code VARCHAR(64) NOT NULL,
+    season_id VARCHAR(16) NOT NULL,
+    rank INTEGER NOT NULL,
+    user_id VARCHAR(64) NOT NULL,
+    display_name VARCHAR(32),
+    score BIGINT NOT NULL,
+    PRIMARY KEY (game_code, season_id, rank)
+);
+
+CREATE INDEX IF NOT EXISTS ix_leaderboard_season_entries_user
+    ON leaderboard_season_entries (game_code, season_id, user_id);
@@ -0,0 +1,18 @@
+-- Denormalized reaction counters behind feed and reactions API reads
+-- One row per (post, reaction type), bumped in the same transaction as the
+-- post_reactions insert. The reactions reconciliation job (and
+-- `flask reactions.reconcile`) repairs any drift from post_reactions.
+
+CREATE TABLE IF NOT EXISTS post_reaction_counts (
+    post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+    reaction_type VARCHAR(20) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (post_id, reaction_type)
+);
+
+-- Backfill from existing reactions
+INSERT INTO post_reaction_counts (post_id, reaction_type, count)
+SELECT post_id, reaction_type, COUNT(*)
+FROM post_reactions
+GROUP BY post_id, reaction_type
+ON CONFLICT (post_id, reaction_type) DO UPDATE SET count = EXCLUDED.count;
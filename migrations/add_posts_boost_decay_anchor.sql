@@ -0,0 +1,15 @@
+-- Lazy boost decay (services/boost_decay.py): replaces the periodic decay UPDATE.
+-- boost_decay_anchor is when a post's boost runs out; the effective boost is
+-- the whole 18-minute steps left until then, and the ranked community feed
+-- orders by it.
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS boost_decay_anchor TIMESTAMP;
+
+-- The old decay job moved last_boost_at to each tick, so this continues from the last tick
+UPDATE posts
+SET boost_decay_anchor = COALESCE(last_boost_at, NOW()) + boost_score * INTERVAL '18 minutes'
+WHERE boost_score > 0 AND boost_decay_anchor IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_posts_boost_decay_anchor
+    ON posts (boost_decay_anchor DESC, id DESC)
+    WHERE boost_decay_anchor IS NOT NULL;
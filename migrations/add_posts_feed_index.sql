@@ -0,0 +1,15 @@
+-- Partial indexes for the keyset-paginated community feed
+-- (CommunityService.get_community_feed): visible, approved posts newest first,
+-- paged with WHERE (created_at, id) < (:created_at, :id). The predicate must
+-- match the feed's filters for the planner to use them.
+-- CONCURRENTLY cannot run inside a transaction block; apply with plain psql -f.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_feed_visible
+    ON posts (created_at DESC, id DESC)
+    WHERE is_hidden = false AND is_deleted = false
+      AND (moderation_status = 'approved' OR moderation_status IS NULL);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_feed_visible_category
+    ON posts (category, created_at DESC, id DESC)
+    WHERE is_hidden = false AND is_deleted = false
+      AND (moderation_status = 'approved' OR moderation_status IS NULL);
@@ -0,0 +1,12 @@
+-- Bucketed leaderboard-score histogram behind /api/leaderboard/word-finder/distribution
+-- One row per (mode, ISO week season, bucket of 100 points), with '*' rows for
+-- all modes and all time. Kept current by the score ingest worker;
+-- `flask stats.histogram` rebuilds it from scores (use that to backfill).
+
+CREATE TABLE IF NOT EXISTS score_histogram (
+    mode VARCHAR(16) NOT NULL,
+    season_id VARCHAR(16) NOT NULL,
+    bucket INTEGER NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (mode, season_id, bucket)
+);
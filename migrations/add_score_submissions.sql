@@ -0,0 +1,13 @@
+-- Idempotency keys for queued /api/score submissions
+-- The score ingest worker inserts one row per submission before writing its score,
+-- so a retried or re-queued submission is skipped instead of scored twice
+
+CREATE TABLE IF NOT EXISTS score_submissions (
+    submission_key VARCHAR(64) PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_score_submissions_user_id ON score_submissions (user_id);
+
+COMMENT ON TABLE score_submissions IS 'One row per /api/score submission key; enforces write-behind idempotency';
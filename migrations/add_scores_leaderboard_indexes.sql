@@ -0,0 +1,6 @@
+-- Indexes for seeding the materialized word search leaderboards
+-- (services/score_boards.py): top-N by points per mode, all-time and per day
+
+CREATE INDEX IF NOT EXISTS ix_scores_mode_points ON scores (mode, points DESC);
+
+CREATE INDEX IF NOT EXISTS ix_scores_mode_created_at ON scores (mode, created_at);
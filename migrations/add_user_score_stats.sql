@@ -0,0 +1,34 @@
+-- Per-user word finder rollup behind /api/leaderboard/word-finder[/<mode>]
+-- One row per (user, mode) plus mode '*' across all modes. Kept current by
+-- the score ingest worker; `flask stats.check [--rebuild]` verifies or
+-- recomputes it from scores.
+
+CREATE TABLE IF NOT EXISTS user_score_stats (
+    user_id INTEGER NOT NULL,
+    mode VARCHAR(16) NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    duration_sum BIGINT NOT NULL DEFAULT 0,
+    duration_count INTEGER NOT NULL DEFAULT 0,
+    best_time INTEGER,
+    last_played TIMESTAMP,
+    PRIMARY KEY (user_id, mode)
+);
+
+CREATE INDEX IF NOT EXISTS ix_user_score_stats_mode_games ON user_score_stats (mode, games);
+
+CREATE INDEX IF NOT EXISTS ix_user_score_stats_mode_best_time ON user_score_stats (mode, best_time);
+
+-- Backfill from existing scores (run once, before the new worker starts)
+INSERT INTO user_score_stats (user_id, mode, games, duration_sum, duration_count, best_time, last_played)
+SELECT user_id, mode, COUNT(*), COALESCE(SUM(duration_sec), 0), COUNT(duration_sec), MIN(duration_sec), MAX(created_at)
+FROM scores
+WHERE found_count > 0 AND (game_mode = 'mini_word_finder' OR game_mode IS NULL)
+  AND user_id IS NOT NULL AND mode IS NOT NULL
+GROUP BY user_id, mode
+UNION ALL
+SELECT user_id, '*', COUNT(*), COALESCE(SUM(duration_sec), 0), COUNT(duration_sec), MIN(duration_sec), MAX(created_at)
+FROM scores
+WHERE found_count > 0 AND (game_mode = 'mini_word_finder' OR game_mode IS NULL)
+  AND user_id IS NOT NULL
+GROUP BY user_id
+ON CONFLICT (user_id, mode) DO NOTHING;
@@ -85,6 +85,62 @@ class Score(db.Model):
     device = db.Column(db.String(64))
     ip_hash = db.Column(db.String(64))
 
+class ScoreSubmission(db.Model):
+    """Idempotency record for queued /api/score submissions (one row per submission key)"""
+    __tablename__ = "score_submissions"
+    submission_key = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+class UserScoreStats(db.Model):
+    """Per-user word finder rollup of scores, per mode plus mode '*' for all modes.
+
+    Maintained by the score ingest worker; services/score_stats.py rebuilds it from scores.
+    """
+    __tablename__ = "user_score_stats"
+    user_id = db.Column(db.Integer, primary_key=True)
+    mode = db.Column(db.String(16), primary_key=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    duration_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    duration_count = db.Column(db.Integer, nullable=False, default=0)  # games with a duration (AVG ignores NULLs)
+    best_time = db.Column(db.Integer)
+    last_played = db.Column(db.DateTime)
+
+    __table_args__ = (
+        Index("ix_user_score_stats_mode_games", "mode", "games"),
+        Index("ix_user_score_stats_mode_best_time", "mode", "best_time"),
+    )
+
+class ScoreHistogram(db.Model):
+    """Completed word finder games per leaderboard-score bucket; see services/score_distribution.py"""
+    __tablename__ = "score_histogram"
+    mode = db.Column(db.String(16), primary_key=True)       # '*' = all modes
+    season_id = db.Column(db.String(16), primary_key=True)  # e.g. 2025-W38, '*' = all time
+    bucket = db.Column(db.Integer, primary_key=True)        # leaderboard_score // 100
+    count = db.Column(db.BigInteger, nullable=False, default=0)
+
+class LeaderboardSeason(db.Model):
+    """A finished weekly season of the Redis leaderboard, snapshotted by services/season_archive.py"""
+    __tablename__ = "leaderboard_seasons"
+    game_code = db.Column(db.String(64), primary_key=True)
+    season_id = db.Column(db.String(16), primary_key=True)  # e.g. 2025-W38
+    players = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+class LeaderboardSeasonEntry(db.Model):
+    """Final standings of an archived season, one row per ranked player"""
+    __tablename__ = "leaderboard_season_entries"
+    game_code = db.Column(db.String(64), primary_key=True)
+    season_id = db.Column(db.String(16), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)  # 1-based, as ZREVRANK + 1
+    user_id = db.Column(db.String(64), nullable=False)
+    display_name = db.Column(db.String(32))
+    score = db.Column(db.BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_leaderboard_season_entries_user", "game_code", "season_id", "user_id"),
+    )
+
 class CreditTxn(db.Model):
     __tablename__ = "credit_txns"
     id = db.Column(db.Integer, primary_key=True)
@@ -200,6 +256,9 @@ class CommunityReport(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 # New community system models
+# Posts the community feed shows; partial index predicate for ix_posts_feed_visible*
+FEED_VISIBLE = "is_hidden = false AND is_deleted = false AND (moderation_status = 'approved' OR moderation_status IS NULL)"
+
 class Post(db.Model):
     __tablename__ = "posts"
     id = db.Column(db.Integer, primary_key=True)
@@ -210,8 +269,9 @@ class Post(db.Model):
     image_height = db.Column(db.Integer)
     category = db.Column(db.String(50), default='general')  # general, gratitude, motivation, achievement, help, celebration
     content_type = db.Column(db.String(50), default='general')  # general, tip, question, celebration, story, achievement
-    boost_score = db.Column(db.Integer, default=0, nullable=False)
+    boost_score = db.Column(db.Integer, default=0, nullable=False)  # as of the last boost write; see services/boost_decay.py
     last_boost_at = db.Column(db.DateTime)
+    boost_decay_anchor = db.Column(db.DateTime)  # when the boost runs out; orders the ranked feed
     # Boost War penalty system
     boost_cooldown_until = db.Column(db.DateTime, nullable=True)  # Can't be boosted until this time
     is_hidden = db.Column(db.Boolean, default=False, nullable=False)
@@ -221,6 +281,15 @@ class Post(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Keyset pages of the community feed; see migrations/add_posts_feed_index.sql
+    __table_args__ = (
+        Index("ix_posts_feed_visible", created_at.desc(), id.desc(), postgresql_where=text(FEED_VISIBLE)),
+        Index("ix_posts_feed_visible_category", category, created_at.desc(), id.desc(),
+              postgresql_where=text(FEED_VISIBLE)),
+        Index("ix_posts_boost_decay_anchor", boost_decay_anchor.desc(), id.desc(),
+              postgresql_where=text("boost_decay_anchor IS NOT NULL")),
+    )
+
 class PostReaction(db.Model):
     __tablename__ = "post_reactions"
     id = db.Column(db.Integer, primary_key=True)
@@ -232,6 +301,13 @@ class PostReaction(db.Model):
     # Unique constraint: one reaction per user per post
     __table_args__ = (db.UniqueConstraint('post_id', 'user_id', name='_post_user_reaction'),)
 
+class PostReactionCount(db.Model):
+    """Per-post, per-type reaction counters maintained by ReactionsRepo.insert_reaction"""
+    __tablename__ = "post_reaction_counts"
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    reaction_type = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
 class PostReport(db.Model):
     __tablename__ = "post_reports"
     id = db.Column(db.Integer, primary_key=True)
@@ -158,6 +158,41 @@ class GameUsageTracker:
             logger.error(f"Error recording usage for {feature}: {e}")
             return False  # Don't block feature usage on tracking failure
 
+    def record_usage_many(self, counts: Dict[int, int], feature: str) -> bool:
+        """Record usage for many users at once - counts maps user_id to increment"""
+        if not counts:
+            return True
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            today = self.get_est_date()
+            now = datetime.now()
+
+            cursor.executemany("""
+                UPDATE feature_usage
+                SET usage_count = usage_count + ?, last_used_at = ?
+                WHERE user_id = ? AND feature_name = ? AND usage_date = ?
+            """, [(n, now, uid, feature, today) for uid, n in counts.items()])
+            cursor.executemany("""
+                INSERT INTO feature_usage (user_id, feature_name, usage_date, usage_count, last_used_at)
+                SELECT ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM feature_usage
+                    WHERE user_id = ? AND feature_name = ? AND usage_date = ?
+                )
+            """, [(uid, feature, today, n, now, uid, feature, today) for uid, n in counts.items()])
+
+            conn.commit()
+            conn.close()
+
+            logger.info(f"Recorded usage: {sum(counts.values())} {feature} uses for {len(counts)} users")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error recording batched usage for {feature}: {e}")
+            return False
+
     def get_usage_stats(self, user_id: int, feature: str, days: int = 7) -> Dict[str, Any]:
         """Get usage statistics for a user over specified days"""
         try:
@@ -10,6 +10,8 @@ from models import (
     db, User, Post, PromotionWar, WarEvent, UserDebuff, UserDiscount,
     PostBoost, CreditTxn
 )
+from services.board_versions import board_versions
+from services.author_cards import author_cards
 from flask import current_app
 import logging
 
@@ -165,8 +167,8 @@ class PromotionWarService:
             return {'success': False, 'error': 'Failed to decline war'}
 
     @staticmethod
-    def record_promotion_during_war(user_id: int, post_id: int, points_earned: int, credits_spent: int) -> None:
-        """Record a promotion action during an active war"""
+    def record_promotion_during_war(user_id: int, post_id: int, points_earned: int, credits_spent: int) -> Optional[Dict[str, Any]]:
+        """Record a promotion action during an active war; returns the updated war scores, or None if not at war"""
         try:
             # Find active war for this user
             active_war = PromotionWar.query.filter(
@@ -181,7 +183,7 @@ class PromotionWarService:
             ).first()
 
             if not active_war:
-                return  # No active war, nothing to record
+                return None  # No active war, nothing to record
 
             # Record war event
             war_event = WarEvent(
@@ -201,13 +203,22 @@ class PromotionWarService:
             else:
                 active_war.challenged_score += points_earned
 
+            scores = {
+                "war_id": active_war.id,
+                "challenger_user_id": active_war.challenger_user_id,
+                "challenged_user_id": active_war.challenged_user_id,
+                "challenger_score": active_war.challenger_score,
+                "challenged_score": active_war.challenged_score
+            }
             db.session.commit()
 
             logger.info(f"Recorded promotion in war {active_war.id}: user {user_id} earned {points_earned} points")
+            return scores
 
         except Exception as e:
             logger.error(f"Error recording promotion during war: {e}")
             db.session.rollback()
+            return None
 
     @staticmethod
     def finalize_expired_wars() -> None:
@@ -226,6 +237,8 @@ class PromotionWarService:
 
             if expired_wars:
                 db.session.commit()
+                board_versions.bump(["war_wins"])
+                author_cards.invalidate(w.winner_user_id for w in expired_wars)
                 logger.info(f"Finalized {len(expired_wars)} expired promotion wars")
 
         except Exception as e:
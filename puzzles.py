@@ -1,6 +1,12 @@
 import random
 import os
-import psycopg2
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+
+from word_index import category_words
 
 MODE_CONFIG = {
     "easy": {"size": 10, "words": 5, "time": None},
@@ -83,89 +89,80 @@ CATEGORY_WORDS = {
     ]
 }
 
-def _fits(G, r, c, dr, dc, w):
-    n = len(G)
-    rr = r + dr * (len(w) - 1)
-    cc = c + dc * (len(w) - 1)
-    if not (0 <= rr < n and 0 <= cc < n):
-        return False
-    for i, ch in enumerate(w):
-        cell = G[r + dr * i][c + dc * i]
-        if cell and cell != ch:
-            return False
-    return True
+@lru_cache(maxsize=None)
+def _line_layout(n):
+    """Cell order for every grid line, in every direction, for an n x n grid.
+
+    Lines are laid out direction by direction (in DIRS order) and separated by
+    a sentinel slot, so one string search covers all 8 directions at once.
+    Returns (picker, cells): picker pulls the line characters out of the
+    row-major grid string, cells maps each offset back to (dir_index, r, c).
+    """
+    sentinel = n * n
+    flat_idx, cells = [], []
+    for k, (dr, dc) in enumerate(DIRS.values()):
+        for r in range(n):
+            for c in range(n):
+                if 0 <= r - dr < n and 0 <= c - dc < n:
+                    continue  # not the first cell of its line
+                rr, cc = r, c
+                while 0 <= rr < n and 0 <= cc < n:
+                    flat_idx.append(rr * n + cc)
+                    cells.append((k, rr, cc))
+                    rr += dr
+                    cc += dc
+                flat_idx.append(sentinel)
+                cells.append(None)
+    return itemgetter(*flat_idx), tuple(cells)
+
+def _line_index(rows):
+    """Index a grid once: all 8-directional lines joined into a single string."""
+    n = len(rows)
+    picker, cells = _line_layout(n)
+    flat = "".join("".join(r) for r in rows) + "\n"
+    return "".join(picker(flat)), cells
 
-def _place(G, r, c, dr, dc, w):
-    for i, ch in enumerate(w):
-        G[r + dr * i][c + dc * i] = ch
+_DIR_NAMES = tuple(DIRS)
+
+def _locate(text, cells, W):
+    """Answer-key entry for W in an indexed grid, or None.
+
+    When W occurs more than once the earliest direction in DIRS wins, then
+    the first start cell in row-major order.
+    """
+    best = None
+    i = text.find(W) if W else -1
+    while i != -1:
+        cell = cells[i]
+        if best is None or cell < best:
+            best = cell
+        i = text.find(W, i + 1)
+    if best is None:
+        return None
+    k, r, c = best
+    return {"start": [r, c], "dir": _DIR_NAMES[k], "len": len(W)}
 
 def _build_key(rows, words):
-    ans = {}
-    grid = [list(r) for r in rows]
-    n = len(grid)
+    """Locate every word in the grid and return {WORD: {"start","dir","len"}}.
 
+    The grid is indexed once and each word is a substring search over the
+    joined lines; repeated words resolve as in _locate.
+    """
+    if not rows:
+        return {}
+    text, cells = _line_index(rows)
+    ans = {}
     for W in [w.upper() for w in words]:
-        hit = None
-        for d, (dr, dc) in DIRS.items():
-            for r in range(n):
-                for c in range(n):
-                    ok = True
-                    for i, ch in enumerate(W):
-                        rr, cc = r + dr * i, c + dc * i
-                        if rr < 0 or cc < 0 or rr >= n or cc >= n or grid[rr][cc] != ch:
-                            ok = False
-                            break
-                    if ok:
-                        hit = {"start": [r, c], "dir": d, "len": len(W)}
-                        break
-                if hit:
-                    break
-            if hit:
-                break
-
-        if not hit:
-            # Try reverse
-            W2 = W[::-1]
-            for d, (dr, dc) in DIRS.items():
-                for r in range(n):
-                    for c in range(n):
-                        ok = True
-                        for i, ch in enumerate(W2):
-                            rr, cc = r + dr * i, c + dc * i
-                            if rr < 0 or cc < 0 or rr >= n or cc >= n or grid[rr][cc] != ch:
-                                ok = False
-                                break
-                        if ok:
-                            hit = {"start": [r, c], "dir": d, "len": len(W2)}
-                            break
-                    if hit:
-                        break
-                if hit:
-                    break
-
+        hit = _locate(text, cells, W)
         if hit:
             ans[W] = hit
     return ans
 
-def _choose_words_from_db(category, k, max_len):
-    import os, psycopg2
-    url=os.getenv("DATABASE_URL")
-    if not url: return []
-    q = """
-      SELECT w.text
-      FROM words w
-      JOIN word_categories wc ON wc.word_id = w.id
-      JOIN categories c ON c.id = wc.category_id
-      WHERE c.key = %s AND w.is_banned = FALSE AND w.length <= %s
-      ORDER BY random() LIMIT %s
-    """
-    try:
-        cx=psycopg2.connect(url); cur=cx.cursor()
-        cur.execute(q, (category, max_len, k))
-        rows=cur.fetchall(); cur.close(); cx.close()
-        return [r[0].upper() for r in rows]
-    except Exception:
-        return []
+def answer_path(hit):
+    """Cells covered by an answer-key entry, as [{"row", "col"}] from the start cell."""
+    dr, dc = DIRS[hit["dir"]]
+    r, c = hit["start"]
+    return [{"row": r + i * dr, "col": c + i * dc} for i in range(hit["len"])]
 
 def _topup_with_category_seeds(category, have, k, max_len):
     pool = [w for w in CATEGORY_SEEDS.get(category, []) if len(w) <= max_len and w not in have]
@@ -175,6 +172,93 @@ def _topup_with_category_seeds(category, have, k, max_len):
         out.append(w)
     return out
 
+EMPTY = "."              # marks an unfilled cell while words are being placed
+PLACEMENT_SAMPLE = 6     # legal placements scored for overlap before taking the rest in order
+PLACEMENT_BUDGET = 5000  # placements tried per puzzle before backtracking gives up
+
+@lru_cache(maxsize=1024)
+def _placement_pattern(w):
+    """Regex matching every line offset where w fits: each cell empty or already w's letter."""
+    return re.compile("(?=(" + "".join(f"[{re.escape(ch)}{EMPTY}]" for ch in w) + "))")
+
+def _legal_placements(text, w, rnd):
+    """Yield (offset, overlap) for every legal placement of w in the line text.
+
+    A placement whose every cell already holds w's letters would hide w
+    inside words already on the board, so it is not legal. Enumeration
+    starts at a random offset and wraps around, so the whole space is
+    covered lazily. The first PLACEMENT_SAMPLE hits are tried most-overlap
+    first, which keeps grids compact and leaves room for the remaining words.
+    """
+    pattern = _placement_pattern(w)
+    start = rnd.randrange(len(text))
+
+    def scan():
+        pos, wrapped = start, False
+        while True:
+            m = pattern.search(text, pos)
+            if m is None or (wrapped and m.start() >= start):
+                if wrapped or start == 0:
+                    return
+                pos, wrapped = 0, True
+                continue
+            overlap = len(w) - m.group(1).count(EMPTY)
+            if overlap < len(w):
+                yield m.start(), overlap
+            pos = m.start() + 1
+
+    hits = scan()
+    sample = [h for _, h in zip(range(PLACEMENT_SAMPLE), hits)]
+    sample.sort(key=lambda h: -h[1])
+    yield from sample
+    yield from hits
+
+def _place_words(n, words, rnd):
+    """Place words on an empty n x n board with bounded backtracking.
+
+    Longest words go first. Every legal placement of a word is a candidate, so
+    a word only fails when nothing fits given the words before it, and then the
+    search backs up. Returns (G, key): G is the flat row-major board with
+    EMPTY in unused cells, key is the answer key built from the placements.
+    If the budget runs out, the deepest partial placement found is returned.
+    """
+    picker, cells = _line_layout(n)
+    names = list(DIRS)
+    G = [EMPTY] * (n * n) + ["\n"]
+    order = sorted(words, key=len, reverse=True)
+    key = {}
+    best = (0, list(G), {})
+    budget = PLACEMENT_BUDGET
+
+    def solve(depth):
+        nonlocal best, budget
+        if depth > best[0]:
+            best = (depth, list(G), dict(key))
+        if depth == len(order):
+            return True
+        w = order[depth]
+        for i, _ in _legal_placements("".join(picker(G)), w, rnd):
+            if budget <= 0:
+                return False
+            budget -= 1
+            k, r, c = cells[i]
+            dr, dc = DIRS[names[k]]
+            idx = [(r + dr * j) * n + c + dc * j for j in range(len(w))]
+            prev = [G[x] for x in idx]
+            for x, ch in zip(idx, w):
+                G[x] = ch
+            key[w] = {"start": [r, c], "dir": names[k], "len": len(w)}
+            if solve(depth + 1):
+                return True
+            for x, ch in zip(idx, prev):
+                G[x] = ch
+            del key[w]
+        return False
+
+    if not solve(0):
+        _, G, key = best
+    return G, key
+
 def generate_puzzle_from_words(mode, words, seed=None):
     """Generate puzzle from specific word list"""
     cfg = MODE_CONFIG[mode]
@@ -186,52 +270,60 @@ def generate_puzzle_from_words(mode, words, seed=None):
     k = min(len(words), cfg["words"])
     words = words[:k]
 
-    G = [[""] * n for _ in range(n)]
-
-    for w in words:
-        placed = False
-        dirs = list(DIRS.values())
-        rnd.shuffle(dirs)
-
-        for _ in range(400):
-            r, c = rnd.randrange(n), rnd.randrange(n)
-            dr, dc = rnd.choice(dirs)
-            if _fits(G, r, c, dr, dc, w):
-                _place(G, r, c, dr, dc, w)
-                placed = True
-                break
-
-        if not placed:
-            # Try horizontal placement as fallback
-            for rr in range(n):
-                for cc in range(n - len(w) + 1):
-                    if _fits(G, rr, cc, 0, 1, w):
-                        _place(G, rr, cc, 0, 1, w)
-                        placed = True
-                        break
-                if placed:
-                    break
+    G, answers = _place_words(n, words, rnd)
+    words = [w for w in words if w in answers]
 
     # Fill empty cells with random letters
-    for r in range(n):
-        for c in range(n):
-            if not G[r][c]:
-                G[r][c] = rnd.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    for i in range(n * n):
+        if G[i] == EMPTY:
+            G[i] = rnd.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
-    rows = ["".join(r) for r in G]
+    rows = ["".join(G[r * n:(r + 1) * n]) for r in range(n)]
     return {
         "grid": rows,
         "words": words,
         "mode": mode,
         "time_limit": cfg["time"],
         "seed": seed,
-        "answers": _build_key(rows, words)
+        "answers": answers
     }
 
+BATCH_MIN_PARALLEL = 64  # smaller batches are generated in-process; pool startup costs more
+
+def _warm_worker(n):
+    """Pool initializer: build the per-size line layout once per worker process."""
+    _line_layout(n)
+
+def generate_puzzles_batch(mode, word_lists, seeds, workers=None, chunksize=None):
+    """Generate one puzzle per (word list, seed) pair, fanned out over a process pool.
+
+    Each puzzle is exactly generate_puzzle_from_words(mode, words, seed=seed),
+    so output is deterministic per seed and independent of which worker ran it.
+    Results come back in input order. The line layout for the board size is
+    built once per worker and, like the compiled placement pattern for each
+    word, shared by every puzzle that worker generates. Pass workers=1 to stay
+    in-process.
+    """
+    word_lists, seeds = list(word_lists), list(seeds)
+    if len(word_lists) != len(seeds):
+        raise ValueError("word_lists and seeds must be the same length")
+    n = MODE_CONFIG[mode]["size"]
+
+    if workers == 1 or len(seeds) < BATCH_MIN_PARALLEL:
+        return [generate_puzzle_from_words(mode, words, seed=seed)
+                for words, seed in zip(word_lists, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                             initargs=(n,)) as pool:
+        return list(pool.map(generate_puzzle_from_words, repeat(mode), word_lists, seeds,
+                             chunksize=chunksize))
+
 def generate_puzzle(mode, seed=None, category=None):
     cfg=MODE_CONFIG[mode]; n=cfg["size"]; k=cfg["words"]
     if category:
-        words = _choose_words_from_db(category, k, n)
+        words = category_words.sample(category, k, n, rnd=random.Random(seed))
         words = _topup_with_category_seeds(category, words, k, n)
         if len(words) < k and words:
             # if still short, repeat from seeds to fill (keeps theme strict)
@@ -4,8 +4,15 @@ from datetime import datetime, timedelta, date
 from flask import Blueprint, render_template, request, jsonify, abort, session, redirect, url_for, flash, send_from_directory, make_response
 from flask_login import login_required, current_user, login_user, logout_user
 from sqlalchemy import func, text
-from models import db, Score, PuzzleBank, User, Post, PostReaction, PostReport, Purchase, CreditTxn
-from puzzles import generate_puzzle, MODE_CONFIG
+from models import db, Score, User, Post, PostReport, Purchase, CreditTxn
+from puzzles import answer_path, MODE_CONFIG
+from word_paths import find_word_path, index_for
+from services.puzzle_pool import puzzle_pool
+from services.puzzle_catalog import puzzle_catalog
+from services.puzzle_cache import puzzle_cache
+from services.puzzle_instances import puzzle_instances
+from services.played_sets import played_sets
+from services.author_cards import author_cards
 from services.credits import spend_credits, InsufficientCredits, DoubleCharge
 from quota import get_quota, inc_quota
 from llm_hint import rephrase_hint_or_fallback
@@ -16,54 +23,46 @@ import stripe
 
 logger = logging.getLogger(__name__)
 
-def find_word_in_grid(grid, word):
-    """Find the position of a word in the puzzle grid"""
-    if not grid or not word:
-        return None
-
-    word = word.upper()
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
-
-    # All 8 directions: right, down, diagonal-down-right, diagonal-down-left,
-    # left, up, diagonal-up-left, diagonal-up-right
-    directions = [
-        (0, 1),   # right
-        (1, 0),   # down
-        (1, 1),   # diagonal-down-right
-        (1, -1),  # diagonal-down-left
-        (0, -1),  # left
-        (-1, 0),  # up
-        (-1, -1), # diagonal-up-left
-        (-1, 1)   # diagonal-up-right
-    ]
-
-    def check_word_at_position(start_row, start_col, dr, dc):
-        """Check if word exists starting at position in given direction"""
-        path = []
-        for i in range(len(word)):
-            r = start_row + i * dr
-            c = start_col + i * dc
-
-            if r < 0 or r >= rows or c < 0 or c >= cols:
-                return None
-
-            if grid[r][c].upper() != word[i]:
-                return None
-
-            path.append({"row": r, "col": c})
-
-        return path
-
-    # Search every position and direction
-    for row in range(rows):
-        for col in range(cols):
-            for dr, dc in directions:
-                path = check_word_at_position(row, col, dr, dc)
-                if path:
-                    return path
+def store_session_puzzle(puzzle_key, puzzle_data):
+    """Register the puzzle server-side and keep only its instance id in the session.
 
-    return None
+    Without Redis the id would only resolve in this worker, so the session
+    keeps the whole puzzle instead.
+    """
+    instance_id = puzzle_instances.register(puzzle_data)
+    session[puzzle_key] = instance_id or puzzle_data
+    session[f"{puzzle_key}_completed"] = False
+
+def load_session_puzzle(puzzle_key):
+    """The puzzle behind a session key, or None if absent or expired from the registry."""
+    value = session.get(puzzle_key)
+    if isinstance(value, dict):
+        return value  # full puzzle: registry unavailable, or a session issued before it existed
+    return puzzle_instances.get(value)
+
+def active_session_puzzle():
+    """(session key, puzzle) of the first puzzle in the session not yet completed, else (None, None)."""
+    for key in list(session):
+        if (key.startswith('puzzle_') and isinstance(session[key], (str, dict))
+                and not session.get(f"{key}_completed", False)):
+            puzzle_data = load_session_puzzle(key)
+            if puzzle_data:
+                return key, puzzle_data
+    return None, None
+
+def cached_word_path(puzzle_key, puzzle_data, word):
+    """Path of word in a procedural session puzzle, read from the puzzle cache's answer key.
+
+    puzzle_key is the session key (puzzle_{mode}_{daily}_{category}). Returns
+    None for template puzzles or on a cache miss; callers then search the grid.
+    """
+    if puzzle_data.get('puzzle_id') or puzzle_data.get('seed') is None:
+        return None
+    parts = puzzle_key.split('_', 3)
+    category = parts[3] if len(parts) == 4 and parts[3] != 'none' else None
+    cached = puzzle_cache.peek(puzzle_data.get('mode'), puzzle_data['seed'], category)
+    hit = cached and cached["answers"].get(str(word).upper())
+    return answer_path(hit) if hit else None
 
 # Simple in-memory rate limiting for password reset (single process only)
 _reset_rate_limit = {}
@@ -300,41 +299,32 @@ def api_word_finder_puzzle():
             print(f"[PUZZLE] Completed puzzle detected, generating new one for {puzzle_key}")
 
         # Check if we already have this puzzle in session
-        if puzzle_key in session:
-            puzzle_data = session[puzzle_key]
+        puzzle_data = load_session_puzzle(puzzle_key) if puzzle_key in session else None
+        if puzzle_data:
             puzzle_data["mode"] = mode
             puzzle_data["ok"] = True
             return jsonify(puzzle_data)
+        session.pop(puzzle_key, None)
 
         # Generate new puzzle using simplified logic
-        from puzzles import generate_puzzle
         from time import time
         from datetime import date
         import random
 
         # Try database templates first
         if daily:
-            pb = PuzzleBank.query.filter_by(active=True, mode=mode, daily_date=date.today()).first()
+            pb = puzzle_catalog.daily_template(mode, date.today())
             if pb:
                 puzzle_data = {
                     "grid": pb.grid, "words": pb.words, "mode": mode,
                     "time_limit": pb.time_limit, "seed": pb.seed, "puzzle_id": pb.id,
                     "ok": True
                 }
-                session[puzzle_key] = puzzle_data
-                session[f"{puzzle_key}_completed"] = False
+                store_session_puzzle(puzzle_key, puzzle_data)
                 return jsonify(puzzle_data)
 
         # Try random template
-        from sqlalchemy import func
-        query = PuzzleBank.query.filter(
-            PuzzleBank.active == True,
-            PuzzleBank.mode == mode
-        )
-        if category:
-            query = query.filter(PuzzleBank.category == category)
-
-        pb = query.order_by(func.random()).first()
+        pb = puzzle_catalog.random_template(mode, category, any_category=not category)
 
         if pb:
             puzzle_data = {
@@ -342,21 +332,23 @@ def api_word_finder_puzzle():
                 "time_limit": pb.time_limit, "seed": pb.seed, "puzzle_id": pb.id,
                 "ok": True
             }
-            session[puzzle_key] = puzzle_data
-            session[f"{puzzle_key}_completed"] = False
+            store_session_puzzle(puzzle_key, puzzle_data)
             return jsonify(puzzle_data)
 
-        # Fallback to procedural generation
-        if f"{puzzle_key}_seed" not in session:
-            session[f"{puzzle_key}_seed"] = int(time()) if not daily else int(date.today().strftime("%Y%m%d"))
+        # Fallback to procedural generation, served from the pre-generated pool when possible
+        P = None if daily else puzzle_pool.take(mode, category)
+        if P:
+            session[f"{puzzle_key}_seed"] = P["seed"]
+        else:
+            if f"{puzzle_key}_seed" not in session:
+                session[f"{puzzle_key}_seed"] = int(time()) if not daily else int(date.today().strftime("%Y%m%d"))
 
-        seed = session[f"{puzzle_key}_seed"]
-        P = generate_puzzle(mode, seed=seed, category=category)
+            seed = session[f"{puzzle_key}_seed"]
+            P = puzzle_cache.get(mode, seed=seed, category=category)
         P["puzzle_id"] = None
         P["mode"] = mode
         P["ok"] = True
-        session[puzzle_key] = P
-        session[f"{puzzle_key}_completed"] = False
+        store_session_puzzle(puzzle_key, P)
 
         return jsonify(P)
 
@@ -375,7 +367,9 @@ def api_puzzle():
 
     # Check if we already have this puzzle in session and it's not completed
     if puzzle_key in session and not session.get(f"{puzzle_key}_completed", False):
-        return jsonify(session[puzzle_key])
+        puzzle_data = load_session_puzzle(puzzle_key)
+        if puzzle_data:
+            return jsonify(puzzle_data)
 
     # Initialize usage tracker following SoulBridge AI pattern
     from modules.game.usage_tracker import GameUsageTracker
@@ -420,50 +414,44 @@ def api_puzzle():
 
     # 1) daily scheduled template?
     if daily:
-        pb = PuzzleBank.query.filter_by(active=True, mode=mode, daily_date=date.today()).first()
+        pb = puzzle_catalog.daily_template(mode, date.today())
         if pb:
             puzzle_data = {
                 "grid": pb.grid, "words": pb.words, "mode": mode,
                 "time_limit": pb.time_limit, "seed": pb.seed, "puzzle_id": pb.id
             }
-            session[puzzle_key] = puzzle_data
-            session[f"{puzzle_key}_completed"] = False
+            store_session_puzzle(puzzle_key, puzzle_data)
             return jsonify(puzzle_data)
 
-    # 2) random active template, filtered by category if provided
-    query = PuzzleBank.query.filter(
-        PuzzleBank.active.is_(True),
-        PuzzleBank.mode == mode,
-    )
-    if category:
-        query = query.filter(PuzzleBank.category == category)
-    else:
-        query = query.filter(PuzzleBank.category.is_(None))
-
-    pb = query.order_by(func.random()).first()
+    # 2) random active template the user hasn't played, filtered by category if provided
+    #    (uncategorized otherwise). A user who has played them all gets a procedural puzzle.
+    played = played_sets.get(user.id) if user else None
+    pb = puzzle_catalog.random_template(mode, category, played=played)
 
     if pb:
         puzzle_data = {
             "grid": pb.grid, "words": pb.words, "mode": mode,
             "time_limit": pb.time_limit, "seed": pb.seed, "puzzle_id": pb.id
         }
-        session[puzzle_key] = puzzle_data
-        session[f"{puzzle_key}_completed"] = False
+        store_session_puzzle(puzzle_key, puzzle_data)
 
         # Don't record usage here - only record when game is completed (in /api/score)
 
         return jsonify(puzzle_data)
 
-    # 3) fallback procedural - use consistent seed for session
-    if f"{puzzle_key}_seed" not in session:
+    # 3) fallback procedural - pre-generated pool first, else use consistent seed for session
+    P = None if daily else puzzle_pool.take(mode, category)
+    if P:
+        session[f"{puzzle_key}_seed"] = P["seed"]
+    elif f"{puzzle_key}_seed" not in session:
         session[f"{puzzle_key}_seed"] = int(time()) if not daily else int(date.today().strftime("%Y%m%d"))
 
     try:
-        seed = session[f"{puzzle_key}_seed"]
-        P = generate_puzzle(mode, seed=seed, category=category)
+        if not P:
+            seed = session[f"{puzzle_key}_seed"]
+            P = puzzle_cache.get(mode, seed=seed, category=category)
         P["puzzle_id"] = None
-        session[puzzle_key] = P
-        session[f"{puzzle_key}_completed"] = False
+        store_session_puzzle(puzzle_key, P)
 
         # Don't record usage here - only record when game is completed (in /api/score)
 
@@ -488,72 +476,68 @@ def api_score():
         return jsonify({"error": "Please log in"}), 401
     p = request.get_json(force=True)
 
-    # Create score with minimal, production-compatible fields
+    # Validate and price the submission here; the writes happen in the score ingest worker
     try:
         # Calculate points for leaderboard
         found_count = int(p.get("found_count", 0))
         total_words = int(p.get("total_words", 1))
         duration_sec = int(p.get("duration_sec", 0))
         hints_used = int(p.get("hints_used", 0))
-
-        # Cap duration at reasonable max (24 hours = 86400 seconds)
-        duration_sec = min(duration_sec, 86400)
-
-        # Points calculation: base score + completion bonus + time bonus - hint penalty
-        base_score = found_count * 100
-        completion_bonus = 500 if found_count == total_words else 0
-        time_bonus = max(0, 300 - duration_sec // 2)  # Faster is better
-        hint_penalty = hints_used * 50
-        points = max(0, base_score + completion_bonus + time_bonus - hint_penalty)
-
-        print(f"Score submission: found={found_count}/{total_words}, time={duration_sec}s, hints={hints_used}, points={points}")
-
-        # Use raw SQL to avoid ORM column mismatches between local/production
-        from sqlalchemy import text
-        result = db.session.execute(
-            text("""
-            INSERT INTO scores (user_id, mode, found_count, total_words, duration_sec, completed, seed, category, hints_used, puzzle_id, points, created_at)
-            VALUES (:user_id, :mode, :found_count, :total_words, :duration_sec, :completed, :seed, :category, :hints_used, :puzzle_id, :points, :created_at)
-            RETURNING id
-            """),
-            {
-                'user_id': session_user.id,
-                'mode': p.get("mode"),
-                'found_count': found_count,
-                'total_words': total_words,
-                'duration_sec': duration_sec,
-                'completed': bool(p.get("completed")),
-                'seed': p.get("seed"),
-                'category': p.get("category"),
-                'hints_used': hints_used,
-                'puzzle_id': p.get("puzzle_id"),
-                'points': points,
-                'created_at': datetime.utcnow()
-            }
-        )
-        score_id = result.fetchone()[0]
-        db.session.commit()
-
+        seed = int(p["seed"]) if p.get("seed") is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"ok": False, "error": "invalid_score"}), 400
+
+    # Cap duration at reasonable max (24 hours = 86400 seconds)
+    duration_sec = min(duration_sec, 86400)
+
+    # Procedural puzzles still in this worker's cache: word counts come from the puzzle itself
+    if not p.get("puzzle_id") and seed is not None:
+        cached = puzzle_cache.peek(p.get("mode"), seed, p.get("category"))
+        if cached:
+            total_words = len(cached["words"])
+            found_count = max(0, min(found_count, total_words))
+
+    # Only active templates are recorded as played
+    tpl = puzzle_catalog.get(p.get("puzzle_id")) if p.get("puzzle_id") else None
+
+    # Points calculation: base score + completion bonus + time bonus - hint penalty
+    base_score = found_count * 100
+    completion_bonus = 500 if found_count == total_words else 0
+    time_bonus = max(0, 300 - duration_sec // 2)  # Faster is better
+    hint_penalty = hints_used * 50
+    points = max(0, base_score + completion_bonus + time_bonus - hint_penalty)
+
+    print(f"Score submission: found={found_count}/{total_words}, time={duration_sec}s, hints={hints_used}, points={points}")
+
+    # Leaderboard score: found_count * 1000 + time bonus (max 300 bonus for speed)
+    leaderboard_score = found_count * 1000 + time_bonus
+
+    from services.score_ingest import score_ingest, submission_key
+    record = {
+        'key': submission_key(session_user.id, p, request.headers.get("Idempotency-Key") or p.get("submission_id")),
+        'user_id': session_user.id,
+        'display_name': session_user.display_name or session_user.username or f"Player{session_user.id}",
+        'username': session_user.username,
+        'mode': p.get("mode"),
+        'found_count': found_count,
+        'total_words': total_words,
+        'duration_sec': duration_sec,
+        'completed': bool(p.get("completed")),
+        'seed': seed,
+        'category': p.get("category"),
+        'hints_used': hints_used,
+        'puzzle_id': p.get("puzzle_id"),
+        'played_puzzle_id': tpl.id if tpl else None,
+        'points': points,
+        'leaderboard_score': leaderboard_score,
+        'created_at': datetime.utcnow().isoformat()
+    }
+    try:
+        result = score_ingest.submit(record)
     except Exception as e:
         db.session.rollback()
         print(f"Score creation error: {e}")
-        # Fallback to absolute minimal score record
-        try:
-            result = db.session.execute(
-                "INSERT INTO scores (user_id, mode, completed, created_at) VALUES (:user_id, :mode, :completed, :created_at) RETURNING id",
-                {
-                    'user_id': session_user.id,
-                    'mode': p.get("mode", "easy"),
-                    'completed': bool(p.get("completed")),
-                    'created_at': datetime.utcnow()
-                }
-            )
-            score_id = result.fetchone()[0]
-            db.session.commit()
-        except Exception as fallback_error:
-            db.session.rollback()
-            print(f"Fallback score creation also failed: {fallback_error}")
-            score_id = None
+        return jsonify({"ok": False, "error": "score_not_saved"}), 500
 
     # Mark puzzle as completed in session so a new one can be generated
     mode = p.get("mode")
@@ -562,75 +546,12 @@ def api_score():
     puzzle_key = f"puzzle_{mode}_{daily}_{category or 'none'}"
     session[f"{puzzle_key}_completed"] = True
 
-    # Record usage ONLY when game is completed (not just submitted)
-    if p.get("completed") and score_id:
-        try:
-            from modules.game.usage_tracker import GameUsageTracker
-            usage_tracker = GameUsageTracker()
-            usage_tracker.record_usage(session_user.id, 'word_finder')
-            print(f"[USAGE] Recorded completed game for user {session_user.id}")
-        except Exception as e:
-            print(f"[WARNING] Failed to record usage: {e}")
-
-    # record that user has seen this template (database-agnostic)
-    puzzle_id = p.get("puzzle_id")
-    if puzzle_id and score_id:
-        try:
-            from models import PuzzlePlays
-            # Check if record already exists
-            existing = db.session.query(PuzzlePlays).filter_by(
-                user_id=session_user.id,
-                puzzle_id=puzzle_id
-            ).first()
-
-            if not existing:
-                puzzle_play = PuzzlePlays(
-                    user_id=session_user.id,
-                    puzzle_id=puzzle_id,
-                    played_at=datetime.utcnow()
-                )
-                db.session.add(puzzle_play)
-                db.session.commit()
-        except Exception as e:
-            # Don't fail score submission if puzzle tracking fails
-            print(f"Warning: Could not record puzzle play: {e}")
-            db.session.rollback()
-
-    # Submit to Redis leaderboard (only for completed games)
-    redis_result = None
-    if p.get("completed") and score_id:
-        try:
-            from services.leaderboard import leaderboard_service
-
-            # Calculate score for leaderboard (higher is better)
-            # Use found_count as base score, with time bonus
-            found_count = int(p.get("found_count", 0))
-            duration_sec = int(p.get("duration_sec", 1))
-
-            # Score calculation: found_count * 1000 + time bonus (max 300 bonus for speed)
-            time_bonus = max(0, 300 - duration_sec // 2)  # Bonus decreases with time
-            leaderboard_score = found_count * 1000 + time_bonus
-
-            display_name = session_user.display_name or session_user.username or f"Player{session_user.id}"
-
-            redis_result = leaderboard_service.submit_score(
-                user_id=str(session_user.id),
-                display_name=display_name,
-                game_code="mini_word_finder",
-                score=leaderboard_score
-            )
-
-            # Register the game for seasonal rotation
-            leaderboard_service.register_game("mini_word_finder")
-
-        except Exception as e:
-            # Don't fail score submission if Redis fails
-            print(f"Warning: Could not submit to Redis leaderboard: {e}")
-
     return jsonify({
         "ok": True,
-        "score_id": score_id,
-        "redis_leaderboard": redis_result
+        "submission_id": record["key"],
+        "queued": result["queued"],
+        "duplicate": result["duplicate"],
+        "redis_leaderboard": result["redis_leaderboard"]
     })
 
 def _hint_state(): return session.get("hint_unlock") or {}
@@ -691,7 +612,6 @@ def api_hint_ask():
 
     if not session_user:
         return jsonify({"error": "Please log in"}), 401
-    from puzzles import generate_puzzle
     p = request.get_json(force=True)
     token = p.get("token") or ""
     mode = p.get("mode") or "easy"
@@ -710,8 +630,8 @@ def api_hint_ask():
 
     hit = None
     if puzzle_id:
-        pb = PuzzleBank.query.get(puzzle_id)
-        if not pb or not pb.active:
+        pb = puzzle_catalog.get(puzzle_id)
+        if not pb:
             st["consumed"] = True
             _set_hint_state(st)
             return jsonify({"ok": False, "error": "template_missing_refunded"}), 500
@@ -719,12 +639,11 @@ def api_hint_ask():
             return jsonify({"ok": False, "error": "not_in_puzzle"}), 400
         hit = (pb.answers or {}).get(term)
         if not hit:
-            # rebuild key on the fly if answers missing
-            from puzzles import _build_key
-            hit = _build_key(pb.grid, [term]).get(term)
+            # solve on the fly if answers missing
+            hit = index_for(pb.grid).answer(term)
     else:
         if mode not in ("easy", "medium", "hard"): abort(400, "bad mode")
-        P = generate_puzzle(mode, seed=seed, category=category)
+        P = puzzle_cache.get(mode, seed=seed, category=category)
         if term not in set(P["words"]):
             return jsonify({"ok": False, "error": "not_in_puzzle"}), 400
         hit = P["answers"].get(term)
@@ -811,38 +730,9 @@ def leaderboard():
             # Arcade game leaderboard
             return render_template("leaderboard_arcade.html", game_type=game_type)
         else:
-            # Original word search leaderboard - group by mode
-            leaders = {}
-            modes = ['easy', 'medium', 'hard']
-
-            for mode in modes:
-                # Get top scores for this mode
-                mode_scores = Score.query.filter_by(mode=mode).order_by(Score.points.desc()).limit(10).all()
-
-                # Format for template
-                leaders[mode] = []
-                for score in mode_scores:
-                    try:
-                        # Get username from User model
-                        user = User.query.get(score.user_id) if score.user_id else None
-                        username = user.username if user else 'Anonymous'
-
-                        # Calculate elapsed time from duration_sec or time_ms
-                        elapsed_str = None
-                        if score.duration_sec:
-                            elapsed_str = f"{score.duration_sec}s"
-                        elif score.time_ms:
-                            elapsed_str = f"{score.time_ms / 1000:.1f}s"
-
-                        leaders[mode].append({
-                            'email': username,
-                            'score': score.points or 0,
-                            'elapsed': elapsed_str,
-                            'created_at': score.created_at.strftime('%Y-%m-%d') if score.created_at else 'N/A'
-                        })
-                    except Exception as e:
-                        logger.error(f"Error processing score {score.id}: {e}")
-                        continue
+            # Original word search leaderboard - group by mode, from the materialized boards
+            from services.score_boards import score_boards
+            leaders = score_boards.boards()
 
             return render_template("leaderboard.html", leaders=leaders)
     except Exception as e:
@@ -869,39 +759,9 @@ def daily_leaderboard():
         # Generate list of recent dates (last 7 days)
         dates = [(date.today() - timedelta(days=i)).isoformat() for i in range(7)]
 
-        # Group daily scores by mode
-        leaders = {}
-        modes = ['easy', 'medium', 'hard']
-
-        for mode in modes:
-            mode_scores = Score.query.filter(
-                func.date(Score.created_at) == selected_day,
-                Score.mode == mode,
-                Score.points > 0
-            ).order_by(Score.points.desc()).limit(10).all()
-
-            leaders[mode] = []
-            for score in mode_scores:
-                try:
-                    user = User.query.get(score.user_id) if score.user_id else None
-                    username = user.username if user else 'Anonymous'
-
-                    elapsed_str = None
-                    if score.duration_sec:
-                        elapsed_str = f"{score.duration_sec}s"
-                    elif score.time_ms:
-                        elapsed_str = f"{score.time_ms / 1000:.1f}s"
-
-                    leaders[mode].append({
-                        'email': username,
-                        'score': score.points or 0,
-                        'elapsed': elapsed_str,
-                        'note': f"{score.found_count}/{score.total_words} words" if score.total_words else '',
-                        'created_at': score.created_at.strftime('%H:%M') if score.created_at else 'N/A'
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing daily score {score.id}: {e}")
-                    continue
+        # Group daily scores by mode, from the materialized boards
+        from services.score_boards import score_boards
+        leaders = score_boards.boards(selected_day)
 
         return render_template("daily_leaderboard.html", leaders=leaders, day=selected_day.isoformat(), dates=dates)
     except Exception as e:
@@ -994,59 +854,22 @@ def get_store_packs():
 def community():
     from community_service import CommunityService
 
-    page = max(1, int(request.args.get("page", 1)))
     per = max(5, min(20, int(request.args.get("per", 10))))
     category = request.args.get("category")  # Optional category filter
-
-    # Calculate offset for pagination
-    offset = (page - 1) * per
+    cursor = request.args.get("cursor")  # next_cursor of the previous page
 
     # Get community feed using enhanced service
-    posts = CommunityService.get_community_feed(
-        user_id=current_user.id if current_user and current_user.is_authenticated else None,
-        category=category,
-        limit=per,
-        offset=offset
-    )
-
-    print(f"DEBUG: Enhanced community page - found {len(posts)} posts on page {page}, category={category}")
-
-    # Get reaction counts and user reactions in bulk for template
-    ids = [p.id for p in posts]
-    r_counts = {pid: 0 for pid in ids}
-    user_reactions = {}
-
-    if ids:
-        # Get reaction counts
-        rows = db.session.execute(
-            text("SELECT post_id, COUNT(*) FROM post_reactions WHERE post_id = ANY(:ids) GROUP BY post_id"),
-            {"ids": ids}
-        ).all()
-        for pid, cnt in rows:
-            r_counts[int(pid)] = int(cnt)
-
-        # Get user's reactions if logged in
-        if current_user and current_user.is_authenticated:
-            try:
-                rows = PostReaction.query.filter(
-                    PostReaction.post_id.in_(ids),
-                    PostReaction.user_id == current_user.id
-                ).all()
-                user_reactions = {r.post_id: r.reaction_type for r in rows}
-            except Exception as e:
-                # Transaction may be aborted, need to rollback
-                db.session.rollback()
-
-                # Handle missing id column in post_reactions table
-                if "does not exist" in str(e) or "aborted" in str(e):
-                    user_reactions = {}  # No user reactions available
-                    logger.warning(f"Failed to get user reactions: {e}")
-                else:
-                    user_reactions = {}
-                    logger.error(f"Unexpected error getting user reactions: {e}")
+    try:
+        posts, next_cursor = CommunityService.get_community_feed(
+            user_id=current_user.id if current_user and current_user.is_authenticated else None,
+            category=category,
+            limit=per,
+            cursor=cursor
+        )
+    except ValueError:
+        return redirect(url_for("core.community", category=category))
 
-    # Check if there are more posts for pagination
-    has_more = len(posts) == per
+    print(f"DEBUG: Enhanced community page - found {len(posts)} posts, cursor={cursor}, category={category}")
 
     # Get user's community summary for display
     user_summary = None
@@ -1056,13 +879,11 @@ def community():
     return render_template(
         "community.html",
         posts=posts,
-        has_more=has_more,
-        page=page,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
         category=category,
         categories=CommunityService.CATEGORIES,
         content_types=CommunityService.CONTENT_TYPES,
-        r_counts=r_counts,
-        user_reactions=user_reactions,
         user_summary=user_summary
     )
 
@@ -1166,7 +987,7 @@ def community_react(post_id):
         # Success case - get updated reaction count
         try:
             total_reactions = db.session.execute(
-                text("SELECT COUNT(*) FROM post_reactions WHERE post_id=:pid"), {"pid": post_id}
+                text("SELECT COALESCE(SUM(count), 0) FROM post_reaction_counts WHERE post_id=:pid"), {"pid": post_id}
             ).scalar()
         except Exception as e:
             # If counting fails, log but don't fail the request
@@ -1434,6 +1255,7 @@ def profile_avatar():
             current_user.profile_image_url = url
             current_user.profile_image_updated_at = datetime.utcnow()
             db.session.commit()
+            author_cards.invalidate([current_user.id])
     except InsufficientCredits:
         return jsonify({"ok": False, "error": "insufficient"}), 402
     except Exception:
@@ -1496,6 +1318,7 @@ def api_dev_clear_broken_image():
             pass
 
         db.session.commit()
+        author_cards.invalidate([session_user.id])
         return jsonify({
             "success": True,
             "message": "Broken profile image cleared and cooldown reset",
@@ -1943,6 +1766,7 @@ def api_profile_change_name():
         session_user.display_name = new_name
         session_user.display_name_updated_at = datetime.utcnow()
         db.session.commit()
+        author_cards.invalidate([session_user.id])
 
         return jsonify({"success": True, "new_name": new_name})
 
@@ -2546,15 +2370,14 @@ def reveal_word():
         word_path = []
 
         # Get puzzle data from session
-        puzzle_data = None
-        for key in session:
-            if key.startswith('puzzle_') and not session.get(f"{key}_completed", False):
-                puzzle_data = session[key]
-                break
+        key, puzzle_data = active_session_puzzle()
+
+        if puzzle_data:
+            word_path = cached_word_path(key, puzzle_data, word_id)
 
-        if puzzle_data and puzzle_data.get('grid'):
+        if not word_path and puzzle_data and puzzle_data.get('grid'):
             # Find the actual word position in the grid
-            word_path = find_word_in_grid(puzzle_data['grid'], word_id)
+            word_path = find_word_path(puzzle_data['grid'], word_id)
             if not word_path:
                 # If word not found, return error
                 return jsonify({"error": f"Word '{word_id}' not found in current puzzle"}), 400
@@ -0,0 +1,105 @@
+"""
+Author cards for the community feeds
+The name, avatar and war badge shown next to a post, cached in Redis per user
+(author:card:{user_id}) so a feed page decorates its posts with one MGET.
+Misses are loaded for the whole page in one users and one user_badges query.
+Profile and badge writers call author_cards.invalidate() after committing.
+"""
+import os, json
+from typing import Dict, Iterable, Any, Optional
+import redis
+
+from services.war_badges_catalog import level_theme
+
+AUTHOR_CARD_TTL_SEC = int(os.getenv("AUTHOR_CARD_TTL_SEC", "3600"))  # bounds staleness if an invalidation is missed
+BADGE_CODE = "war_champion_lvl"
+
+def build_card(user_id: int, user, badge=None) -> Dict[str, Any]:
+    """Card for user (None if the account is gone) with its war champion UserBadge, if any"""
+    if not user:
+        return {"id": user_id, "name": "Unknown", "avatar": None, "war_badge": None}
+    war_badge = None
+    if badge:
+        theme = level_theme(badge.level)
+        if theme:
+            war_badge = {
+                "level": badge.level,
+                "wins": user.war_wins or 0,
+                "name": theme["name"],
+                "icon": theme["icon"],
+                "theme": theme["theme"]
+            }
+    return {
+        "id": user.id,
+        "name": user.display_name or user.username,
+        "avatar": user.profile_image_data or user.profile_image_url,
+        "war_badge": war_badge
+    }
+
+class AuthorCards:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, author cards load from the database")
+
+    def key_card(self, user_id: int) -> str:
+        return f"author:card:{user_id}"
+
+    def load(self, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Cards straight from the database: one users and one user_badges query"""
+        from models import User, UserBadge
+        ids = list(set(user_ids))
+        if not ids:
+            return {}
+        users = {u.id: u for u in User.query.filter(User.id.in_(ids)).all()}
+        badges = {b.user_id: b for b in UserBadge.query.filter(
+            UserBadge.user_id.in_(ids), UserBadge.code == BADGE_CODE).all()}
+        return {uid: build_card(uid, users.get(uid), badges.get(uid)) for uid in ids}
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """{user_id: card}, from the cache where possible"""
+        ids = list(set(user_ids))
+        if not ids:
+            return {}
+        if not self.redis_available:
+            return self.load(ids)
+        try:
+            cached = self.redis.mget([self.key_card(uid) for uid in ids])
+        except Exception as e:
+            print(f"Warning: author card read failed: {e}")
+            return self.load(ids)
+
+        cards = {uid: json.loads(raw) for uid, raw in zip(ids, cached) if raw}
+        missing = [uid for uid in ids if uid not in cards]
+        if missing:
+            loaded = self.load(missing)
+            cards.update(loaded)
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for uid, card in loaded.items():
+                    pipe.set(self.key_card(uid), json.dumps(card), ex=AUTHOR_CARD_TTL_SEC)
+                pipe.execute()
+            except Exception as e:
+                print(f"Warning: author card write failed: {e}")
+        return cards
+
+    def invalidate(self, user_ids: Iterable[Optional[int]]):
+        """Drop cached cards after a profile or badge change has committed. Never raises."""
+        keys = [self.key_card(uid) for uid in set(user_ids) if uid]
+        if not keys or not self.redis_available:
+            return
+        try:
+            self.redis.delete(*keys)
+        except Exception as e:
+            print(f"Warning: author card invalidation failed: {e}")
+
+# Global instance
+author_cards = AuthorCards()
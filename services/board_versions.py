@@ -0,0 +1,80 @@
+"""
+Per-board data versions for HTTP conditional caching
+Every write that can change a public leaderboard bumps that board's counter
+(ver:{board}) and its last-modified time (ver:{board}:t) after its commit.
+utils.http_cache turns the versions into ETag/Last-Modified, so a revalidation
+is one MGET instead of the leaderboard query.
+Without Redis the counters are per worker, with a boot nonce in the tag so
+another worker's counters never produce a matching ETag.
+"""
+import os, time, uuid, threading
+from typing import Dict, List, Iterable, Tuple
+import redis
+
+VERSION_TTL_SEC = 30 * 24 * 3600  # idle boards (old seasons) drop their counters eventually
+
+class BoardVersions:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, leaderboard ETags are per worker")
+        self.boot = uuid.uuid4().hex[:8]
+        self.started = int(time.time())
+        self._local: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def key_version(self, board: str) -> str:
+        """e.g. ver:word_finder:easy, ver:war_wins, ver:lb:mini_word_finder:2025-W38"""
+        return f"ver:{board}"
+
+    def key_mtime(self, board: str) -> str:
+        return f"ver:{board}:t"
+
+    def bump(self, boards: Iterable[str]):
+        """Mark boards as changed. Call after the write has committed. Never raises."""
+        boards = sorted(set(boards))
+        if not boards:
+            return
+        now = int(time.time())
+        if self.redis_available:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for board in boards:
+                    pipe.incr(self.key_version(board))
+                    pipe.set(self.key_mtime(board), now)
+                    pipe.expire(self.key_version(board), VERSION_TTL_SEC)
+                    pipe.expire(self.key_mtime(board), VERSION_TTL_SEC)
+                pipe.execute()
+                return
+            except Exception as e:
+                print(f"Warning: board version bump failed, bumping locally: {e}")
+        with self._lock:
+            for board in boards:
+                version, _ = self._local.get(board, (0, 0))
+                self._local[board] = (version + 1, now)
+
+    def get(self, boards: List[str]) -> Tuple[str, int]:
+        """(version tag, last-modified unix time) covering boards, in one round trip"""
+        if self.redis_available:
+            try:
+                keys = [k for b in boards for k in (self.key_version(b), self.key_mtime(b))]
+                values = self.redis.mget(keys)
+                versions = [v or "0" for v in values[0::2]]
+                mtimes = [int(t) for t in values[1::2] if t]
+                return "r." + ".".join(versions), max(mtimes, default=self.started)
+            except Exception as e:
+                print(f"Warning: board version read failed: {e}")
+        with self._lock:
+            entries = [self._local.get(b, (0, self.started)) for b in boards]
+        return f"l{self.boot}." + ".".join(str(v) for v, _ in entries), max(t for _, t in entries)
+
+# Global instance
+board_versions = BoardVersions()
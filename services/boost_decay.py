@@ -0,0 +1,67 @@
+"""
+Boost decay without periodic writes
+A post's boost loses 1 point every DECAY_STEP_MIN minutes. Instead of a job
+rewriting every boosted post, each write stores posts.boost_decay_anchor, the
+moment the boost runs out (write time + points * step). The effective boost at
+any time is the whole steps left until then, and ordering by the anchor is
+ordering by effective boost, so the ranked feed is an index scan on one column.
+boost_score keeps the points as of the last write for older readers.
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Optional, List
+from sqlalchemy import or_
+
+from models import Post
+
+DECAY_STEP_MIN = 18  # Decay 1 point every 18 minutes
+DECAY_STEP = timedelta(minutes=DECAY_STEP_MIN)
+
+def decay_anchor(points: int, now: datetime) -> Optional[datetime]:
+    """When a boost of points set at now runs out; None for no boost"""
+    return now + points * DECAY_STEP if points > 0 else None
+
+def effective_boost(post, now: Optional[datetime] = None) -> int:
+    """Boost points post has left at now"""
+    anchor = post.boost_decay_anchor
+    now = now or datetime.utcnow()
+    if anchor is None or anchor <= now:
+        return 0
+    return math.ceil((anchor - now) / DECAY_STEP)
+
+def set_boost(post, points: int, now: Optional[datetime] = None) -> int:
+    """Set post's boost to points as of now (floored at 0); returns the new boost"""
+    now = now or datetime.utcnow()
+    points = max(points, 0)
+    post.boost_score = points
+    post.boost_decay_anchor = decay_anchor(points, now)
+    return points
+
+def add_boost(post, delta: int, now: Optional[datetime] = None) -> int:
+    """Add delta (may be negative) to post's decayed boost; returns the new boost"""
+    now = now or datetime.utcnow()
+    return set_boost(post, effective_boost(post, now) + delta, now)
+
+def ranked_posts(query, limit: int, now: Optional[datetime] = None) -> List[Post]:
+    """
+    Posts of query by effective boost, highest first, then the unboosted ones
+    by last boost and age. Two index scans; no per-row decay arithmetic.
+    """
+    now = now or datetime.utcnow()
+    posts = (query
+             .filter(Post.boost_decay_anchor > now)
+             .order_by(Post.boost_decay_anchor.desc(), Post.id.desc())
+             .limit(limit).all())
+    if len(posts) < limit:
+        posts += (query
+                  .filter(or_(Post.boost_decay_anchor.is_(None), Post.boost_decay_anchor <= now))
+                  .order_by(Post.last_boost_at.desc().nullslast(), Post.created_at.desc())
+                  .limit(limit - len(posts)).all())
+    return posts
+
+def get_decay_info():
+    """Get information about the decay system"""
+    return {
+        "decay_step_minutes": DECAY_STEP_MIN,
+        "description": f"Posts lose 1 boost point every {DECAY_STEP_MIN} minutes of inactivity"
+    }
@@ -6,19 +6,84 @@ import os, time, hmac, hashlib, json, math, datetime
 from typing import Optional, Dict, List, Any
 import redis
 
+from services.leaderboard_local import LocalLeaderboards, bucket_edges
+from services.live_events import live_events
+from services.board_versions import board_versions
+
+REDIS_RETRY_SEC = int(os.getenv("LEADERBOARD_REDIS_RETRY_SEC", "5"))  # probe interval while Redis is down
+REDIS_DOWN = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
+# Keep-best season ZADD, all-time best, display name, meta and game registration in one atomic call.
+# KEYS: season zset, season names hash, all-time best hash, meta hash, games set
+# ARGV: user_id, display_name, score, now, game_code
+# Returns {season rank (0-based, -1 if absent), season best, all-time best}
+SUBMIT_SCORE_LUA = """
+local uid, score = ARGV[1], tonumber(ARGV[3])
+redis.call('HSET', KEYS[2], uid, ARGV[2])
+local season = redis.call('ZSCORE', KEYS[1], uid)
+if (not season) or score > tonumber(season) then
+  redis.call('ZADD', KEYS[1], ARGV[3], uid)
+  season = ARGV[3]
+end
+local best = redis.call('HGET', KEYS[3], uid)
+if (not best) or score > tonumber(best) then
+  redis.call('HSET', KEYS[3], uid, ARGV[3])
+  best = ARGV[3]
+end
+redis.call('HSETNX', KEYS[4], 'created_at', ARGV[4])
+redis.call('HSET', KEYS[4], 'updated_at', ARGV[4])
+redis.call('SADD', KEYS[5], ARGV[5])
+local rank = redis.call('ZREVRANK', KEYS[1], uid)
+return {rank or -1, season, best}
+"""
+
+# One leaderboard page with names for just the ids on it.
+# KEYS: season zset, season names hash
+# ARGV: start, stop            -> ranks start..stop (0-based)
+#       window, window, user_id -> ranks around the user
+# Returns {start, uid, score, name, uid, score, name, ...}, or {-1} if the user is not ranked
+PAGE_LUA = """
+local start, stop = tonumber(ARGV[1]), tonumber(ARGV[2])
+if ARGV[3] then
+  local rank = redis.call('ZREVRANK', KEYS[1], ARGV[3])
+  if not rank then return {-1} end
+  start, stop = math.max(0, rank - start), rank + stop
+end
+local out = {start}
+local rows = redis.call('ZREVRANGE', KEYS[1], start, stop, 'WITHSCORES')
+if #rows == 0 then return out end
+local ids = {}
+for i = 1, #rows, 2 do ids[#ids + 1] = rows[i] end
+local names = redis.call('HMGET', KEYS[2], unpack(ids))
+for i = 1, #ids do
+  out[#out + 1] = ids[i]
+  out[#out + 1] = rows[2 * i]
+  out[#out + 1] = names[i]
+end
+return out
+"""
+
 class LeaderboardService:
     def __init__(self):
         # Use existing Redis configuration
         redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        self.redis = None
         try:
             self.redis = redis.from_url(redis_url, decode_responses=True)
             # Test connection
             self.redis.ping()
             self.redis_available = True
         except:
-            self.redis = None
+            # Keep the client so _redis_down() can notice when Redis comes back
             self.redis_available = False
             print("Warning: Redis not available, leaderboard will use fallback mode")
+        # Per-process boards that answer while Redis is down
+        self.local = LocalLeaderboards()
+        self._next_probe = 0.0
+        # Registered once; redis-py calls it with EVALSHA and reloads it on NOSCRIPT
+        self._submit_script = self.redis.register_script(SUBMIT_SCORE_LUA) if self.redis else None
+        self._page_script = self.redis.register_script(PAGE_LUA) if self.redis else None
+        self.scripting_available = self.redis_available
         self.secret = os.getenv("LEADERBOARD_SECRET", "soulbridge-ai-secret-change-me")
         self.allow_dev_unsigned = os.getenv("ALLOW_DEV_UNSIGNED", "true").lower() == "true"
 
@@ -46,6 +111,50 @@ class LeaderboardService:
         """HASH key for metadata"""
         return f"meta:{game_code}"
 
+    def key_games(self) -> str:
+        """SET of game codes with seasons to archive (services/season_archive.py)"""
+        return "games"
+
+    def _past_season(self, season_id: Optional[str]) -> bool:
+        """Season ids sort chronologically (YYYY-Www), so anything before the current week has ended"""
+        return bool(season_id) and season_id < self.iso_week_season()
+
+    def _redis_down(self) -> bool:
+        """True while Redis is unreachable; probes it every REDIS_RETRY_SEC and replays the local boards once it answers"""
+        if self.redis_available:
+            return False
+        if self.redis is None or time.time() < self._next_probe:
+            return True
+        self._next_probe = time.time() + REDIS_RETRY_SEC
+        try:
+            self.redis.ping()
+        except Exception:
+            return True
+        self.redis_available = True
+        self.scripting_available = True
+        self._resync()
+        return not self.redis_available
+
+    def _mark_down(self, err: Exception):
+        print(f"Warning: Redis unavailable, leaderboard using local boards: {err}")
+        self.redis_available = False
+        self._next_probe = time.time() + REDIS_RETRY_SEC
+
+    def _resync(self):
+        """Replay scores taken by the local boards into Redis (keep-best, so replays are harmless)"""
+        boards = self.local.drain()
+        for i, (game_code, season_id, entries) in enumerate(boards):
+            try:
+                self._submit_many(game_code, season_id, {uid: sc for uid, _, sc in entries},
+                                  {uid: name for uid, name, _ in entries})
+            except REDIS_DOWN as e:
+                self._mark_down(e)
+                for game_code, season_id, entries in boards[i:]:
+                    self.local.submit(game_code, season_id, entries)
+                return
+        if boards:
+            print(f"Leaderboard: Redis is back, replayed {len(boards)} local boards")
+
     def verify_signature(self, user_id: str, game_code: str, score: int, ts: int, signature: str) -> bool:
         """Verify HMAC signature"""
         msg = f"{user_id}|{game_code}|{score}|{ts}".encode()
@@ -71,15 +180,6 @@ class LeaderboardService:
         Submit a score to the leaderboard
         Returns: {"ok": bool, "season_id": str, "rank": int, "best_season": int, "best_all_time": int}
         """
-        if not self.redis_available:
-            return {
-                "ok": True,
-                "season_id": self.iso_week_season(),
-                "rank": 1,
-                "best_season": score,
-                "best_all_time": score,
-                "fallback": True
-            }
         # Validation
         user_id = str(user_id).strip()
         display_name = str(display_name).strip()[:32] or "Player"
@@ -100,8 +200,68 @@ class LeaderboardService:
             if not self.verify_signature(user_id, game_code, score, ts, sig):
                 return {"ok": False, "error": "bad_signature"}
 
-        # Keys
         season_id = self.iso_week_season()
+        result = None
+        if not self._redis_down():
+            try:
+                if self.scripting_available:
+                    try:
+                        result = self._submit_scripted(user_id, display_name, game_code, score, season_id, now)
+                    except redis.exceptions.ResponseError as e:
+                        if not self._scripting_unsupported(e):
+                            raise
+                        print(f"Warning: leaderboard script unavailable, using pipeline path: {e}")
+                        self.scripting_available = False
+                if result is None:
+                    result = self._submit_pipelined(user_id, display_name, game_code, score, season_id, now)
+            except REDIS_DOWN as e:
+                self._mark_down(e)
+        if result is None:
+            result = self.local.submit(game_code, season_id, [(user_id, display_name, score)])[user_id]
+        self._announce(game_code, season_id, {user_id: display_name}, {user_id: result})
+        return result
+
+    def _announce(self, game_code: str, season_id: str, names: Dict[str, str], results: Dict[str, Dict[str, Any]]):
+        """Bump the season's board version and push the submitters' new standings to live streams"""
+        board_versions.bump([f"lb:{game_code}:{season_id}"])
+        live_events.publish(f"leaderboard:{game_code}", "rank", {
+            "game_code": game_code,
+            "season_id": season_id,
+            "entries": [{"user_id": uid, "display_name": names[uid], "rank": r.get("rank"),
+                         "score": r.get("best_season")} for uid, r in results.items() if r.get("ok")]
+        })
+
+    @staticmethod
+    def _scripting_unsupported(err: Exception) -> bool:
+        """Redis builds without scripting, or with EVAL/EVALSHA denied by ACL"""
+        msg = str(err).lower()
+        return "unknown command" in msg or "noperm" in msg
+
+    def _script_keys(self, game_code: str, season_id: str) -> List[str]:
+        return [self.key_lb(game_code, season_id), self.key_user(game_code, season_id),
+                self.key_best(game_code), self.key_meta(game_code), self.key_games()]
+
+    @staticmethod
+    def _script_result(season_id: str, reply) -> Dict[str, Any]:
+        rank, best_season, best_all = reply
+        return {
+            "ok": True,
+            "season_id": season_id,
+            "rank": (int(rank) + 1) if int(rank) >= 0 else None,
+            "best_season": int(float(best_season)) if best_season is not None else None,
+            "best_all_time": int(float(best_all)) if best_all is not None else None
+        }
+
+    def _submit_scripted(self, user_id: str, display_name: str, game_code: str, score: int,
+                         season_id: str, now: int) -> Dict[str, Any]:
+        """One round-trip: the whole read-compare-write runs atomically on the server"""
+        reply = self._submit_script(keys=self._script_keys(game_code, season_id),
+                                    args=[user_id, display_name, score, now, game_code])
+        return self._script_result(season_id, reply)
+
+    def _submit_pipelined(self, user_id: str, display_name: str, game_code: str, score: int,
+                          season_id: str, now: int) -> Dict[str, Any]:
+        """Fallback for servers without scripting (several round-trips, not atomic)"""
         zkey = self.key_lb(game_code, season_id)
         ukey = self.key_user(game_code, season_id)
         bkey = self.key_best(game_code)
@@ -124,6 +284,7 @@ class LeaderboardService:
         # Metadata
         pipe.hsetnx(self.key_meta(game_code), "created_at", now)
         pipe.hset(self.key_meta(game_code), "updated_at", now)
+        pipe.sadd(self.key_games(), game_code)
 
         pipe.execute()
 
@@ -140,93 +301,285 @@ class LeaderboardService:
             "best_all_time": int(best_all) if best_all is not None else None
         }
 
-    def get_top_scores(self, game_code: str, n: int = 10, season_id: Optional[str] = None) -> Dict[str, Any]:
-        """Get top N scores for a game"""
-        if not self.redis_available:
-            return {
+    def submit_scores(self, game_code: str, entries: List[tuple]) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit many server-computed scores in one pipeline
+        (three without scripting)
+        entries: [(user_id, display_name, score)]; a user may appear more than once.
+        Returns: {user_id: submit_score-style result}
+        """
+        season_id = self.iso_week_season()
+        best: Dict[str, int] = {}
+        names: Dict[str, str] = {}
+        for user_id, display_name, score in entries:
+            user_id = str(user_id).strip()
+            best[user_id] = max(int(score), best.get(user_id, int(score)))
+            names[user_id] = str(display_name).strip()[:32] or "Player"
+
+        if not best:
+            return {}
+        results = None
+        if not self._redis_down():
+            try:
+                results = self._submit_many(game_code, season_id, best, names)
+            except REDIS_DOWN as e:
+                self._mark_down(e)
+        if results is None:
+            results = self.local.submit(game_code, season_id, [(uid, names[uid], sc) for uid, sc in best.items()])
+        self._announce(game_code, season_id, names, results)
+        return results
+
+    def _submit_many(self, game_code: str, season_id: str, best: Dict[str, int],
+                     names: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Keep-best submit of {user_id: score} to one season, pipelined"""
+        now = int(time.time())
+        if self.scripting_available:
+            try:
+                keys = self._script_keys(game_code, season_id)
+                pipe = self.redis.pipeline(transaction=False)
+                for uid, sc in best.items():
+                    self._submit_script(keys=keys, args=[uid, names[uid], sc, now, game_code], client=pipe)
+                replies = pipe.execute()
+                return {uid: self._script_result(season_id, reply) for uid, reply in zip(best, replies)}
+            except redis.exceptions.ResponseError as e:
+                if not self._scripting_unsupported(e):
+                    raise
+                print(f"Warning: leaderboard script unavailable, using pipeline path: {e}")
+                self.scripting_available = False
+
+        zkey = self.key_lb(game_code, season_id)
+        ukey = self.key_user(game_code, season_id)
+        bkey = self.key_best(game_code)
+        uids = list(best)
+
+        pipe = self.redis.pipeline(transaction=False)
+        for uid in uids:
+            pipe.zscore(zkey, uid)
+            pipe.hget(bkey, uid)
+        current = pipe.execute()
+
+        pipe = self.redis.pipeline()
+        pipe.hset(ukey, mapping=names)
+        for i, uid in enumerate(uids):
+            season, all_time = current[2 * i], current[2 * i + 1]
+            if season is None or best[uid] > int(season):
+                pipe.zadd(zkey, {uid: best[uid]})
+            if all_time is None or best[uid] > int(all_time):
+                pipe.hset(bkey, uid, best[uid])
+        pipe.hsetnx(self.key_meta(game_code), "created_at", now)
+        pipe.hset(self.key_meta(game_code), "updated_at", now)
+        pipe.sadd(self.key_games(), game_code)
+        pipe.execute()
+
+        pipe = self.redis.pipeline(transaction=False)
+        for uid in uids:
+            pipe.zrevrank(zkey, uid)
+            pipe.zscore(zkey, uid)
+            pipe.hget(bkey, uid)
+        after = pipe.execute()
+
+        out = {}
+        for i, uid in enumerate(uids):
+            rank, best_season, best_all = after[3 * i:3 * i + 3]
+            out[uid] = {
                 "ok": True,
-                "season_id": self.iso_week_season(),
-                "count": 0,
-                "rows": [],
-                "fallback": True
+                "season_id": season_id,
+                "rank": (rank + 1) if rank is not None else None,
+                "best_season": int(best_season) if best_season is not None else None,
+                "best_all_time": int(best_all) if best_all is not None else None
             }
+        return out
+
+    @staticmethod
+    def _page_rows(reply, me: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Decode a PAGE_LUA reply into ranked rows; None if the user was not on the board"""
+        start = int(reply[0])
+        if start < 0:
+            return None
+        out = []
+        for i in range(1, len(reply), 3):
+            uid, sc, name = reply[i], reply[i + 1], reply[i + 2]
+            row = {
+                "rank": start + 1 + (i - 1) // 3,
+                "user_id": uid,
+                "display_name": name or "Player",
+                "score": int(float(sc))
+            }
+            if me is not None:
+                row["me"] = (uid == me)
+            out.append(row)
+        return out
+
+    def _page_pipelined(self, zkey: str, ukey: str, start: int, stop: int):
+        """Fallback without scripting: range, then HMGET for just the ids on the page"""
+        rows = self.redis.zrevrange(zkey, start, stop, withscores=True)
+        names = self.redis.hmget(ukey, [uid for uid, _ in rows]) if rows else []
+        reply = [start]
+        for (uid, sc), name in zip(rows, names):
+            reply += [uid, sc, name]
+        return reply
+
+    def _page(self, zkey: str, ukey: str, start: int, stop: int, around: Optional[str] = None):
+        """PAGE_LUA reply for a rank range, or for +/-window around a user"""
+        args = [start, stop] + ([around] if around is not None else [])
+        if self.scripting_available:
+            try:
+                return self._page_script(keys=[zkey, ukey], args=args)
+            except redis.exceptions.ResponseError as e:
+                if not self._scripting_unsupported(e):
+                    raise
+                print(f"Warning: leaderboard script unavailable, using pipeline path: {e}")
+                self.scripting_available = False
+        if around is None:
+            return self._page_pipelined(zkey, ukey, start, stop)
+        rank = self.redis.zrevrank(zkey, around)
+        if rank is None:
+            return [-1]
+        return self._page_pipelined(zkey, ukey, max(0, rank - start), rank + stop)
 
+    def get_top_scores(self, game_code: str, n: int = 10, season_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get top N scores for a game; finished seasons are read from the archive"""
         n = self.clamp_int(n, 1, 200, 10)
+        if self._past_season(season_id):
+            from services.season_archive import season_archive
+            archived = season_archive.top(game_code, season_id, n)
+            if archived is not None:
+                return archived
+
         season_id = season_id or self.iso_week_season()
+        if self._redis_down():
+            return self.local.top(game_code, season_id, n)
 
         zkey = self.key_lb(game_code, season_id)
         ukey = self.key_user(game_code, season_id)
 
-        rows = self.redis.zrevrange(zkey, 0, n - 1, withscores=True)
-        names = self.redis.hgetall(ukey)
-
-        data = []
-        for idx, (uid, sc) in enumerate(rows, start=1):
-            data.append({
-                "rank": idx,
-                "user_id": uid,
-                "display_name": names.get(uid, "Player"),
-                "score": int(sc)
-            })
+        try:
+            data = self._page_rows(self._page(zkey, ukey, 0, n - 1))
+        except REDIS_DOWN as e:
+            self._mark_down(e)
+            return self.local.top(game_code, season_id, n)
 
         return {"ok": True, "season_id": season_id, "count": len(data), "rows": data}
 
+    def get_top_scores_many(self, boards: List[tuple], n: int = 10) -> Dict[str, Any]:
+        """
+        Top N for several boards in one round-trip
+        boards: [(game_code, season_id or None)]
+        Returns: {"ok": True, "boards": [{"game_code", "season_id", "count", "rows"}]}
+        Finished seasons come from the archive; the rest share one Redis round-trip.
+        """
+        n = self.clamp_int(n, 1, 200, 10)
+        boards = [(game_code, season_id or self.iso_week_season()) for game_code, season_id in boards]
+        pages: Dict[tuple, List[Dict[str, Any]]] = {}
+        if any(self._past_season(sid) for _, sid in boards):
+            from services.season_archive import season_archive
+            for game_code, season_id in boards:
+                if self._past_season(season_id):
+                    archived = season_archive.top(game_code, season_id, n)
+                    if archived is not None:
+                        pages[(game_code, season_id)] = archived["rows"]
+        live = [b for b in boards if b not in pages]
+        fallback = self._redis_down()
+        if not fallback:
+            try:
+                pages.update(self._top_pages(live, n))
+            except REDIS_DOWN as e:
+                self._mark_down(e)
+                fallback = True
+        if fallback:
+            for game_code, season_id in live:
+                pages[(game_code, season_id)] = self.local.top(game_code, season_id, n)["rows"]
+
+        out = []
+        for game_code, season_id in boards:
+            rows = pages[(game_code, season_id)]
+            out.append({"game_code": game_code, "season_id": season_id, "count": len(rows), "rows": rows})
+        result = {"ok": True, "boards": out}
+        if fallback:
+            result["fallback"] = True
+        return result
+
+    def _top_pages(self, boards: List[tuple], n: int) -> Dict[tuple, List[Dict[str, Any]]]:
+        """Top N rows of each (game_code, season_id) board from Redis in one round-trip"""
+        replies = None
+        if self.scripting_available:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for game_code, season_id in boards:
+                    self._page_script(keys=[self.key_lb(game_code, season_id), self.key_user(game_code, season_id)],
+                                      args=[0, n - 1], client=pipe)
+                replies = pipe.execute()
+            except redis.exceptions.ResponseError as e:
+                if not self._scripting_unsupported(e):
+                    raise
+                print(f"Warning: leaderboard script unavailable, using pipeline path: {e}")
+                self.scripting_available = False
+        if replies is None:
+            # Two pipelined round-trips: every range, then names for every page
+            pipe = self.redis.pipeline(transaction=False)
+            for game_code, season_id in boards:
+                pipe.zrevrange(self.key_lb(game_code, season_id), 0, n - 1, withscores=True)
+            ranges = pipe.execute()
+            pipe = self.redis.pipeline(transaction=False)
+            for (game_code, season_id), rows in zip(boards, ranges):
+                if rows:
+                    pipe.hmget(self.key_user(game_code, season_id), [uid for uid, _ in rows])
+            names = iter(pipe.execute())
+            replies = []
+            for rows in ranges:
+                reply = [0]
+                for (uid, sc), name in zip(rows, next(names) if rows else []):
+                    reply += [uid, sc, name]
+                replies.append(reply)
+
+        return {board: self._page_rows(reply) for board, reply in zip(boards, replies)}
+
     def get_around_user(self, game_code: str, user_id: str, window: int = 3,
                        season_id: Optional[str] = None) -> Dict[str, Any]:
         """Get scores around a specific user"""
-        if not self.redis_available:
-            return {
-                "ok": True,
-                "season_id": self.iso_week_season(),
-                "present": False,
-                "rows": [],
-                "fallback": True
-            }
+        window = self.clamp_int(window, 1, 10, 3)
+        if self._past_season(season_id):
+            from services.season_archive import season_archive
+            archived = season_archive.around(game_code, season_id, user_id, window)
+            if archived is not None:
+                return archived
 
         season_id = season_id or self.iso_week_season()
-        window = self.clamp_int(window, 1, 10, 3)
+        if self._redis_down():
+            return self.local.around(game_code, season_id, user_id, window)
 
         zkey = self.key_lb(game_code, season_id)
         ukey = self.key_user(game_code, season_id)
 
-        rank = self.redis.zrevrank(zkey, user_id)
-        if rank is None:
+        try:
+            out = self._page_rows(self._page(zkey, ukey, window, window, around=user_id), me=user_id)
+        except REDIS_DOWN as e:
+            self._mark_down(e)
+            return self.local.around(game_code, season_id, user_id, window)
+        if out is None:
             return {"ok": True, "season_id": season_id, "present": False, "rows": []}
 
-        start = max(0, rank - window)
-        end = rank + window
-
-        rows = self.redis.zrevrange(zkey, start, end, withscores=True)
-        names = self.redis.hgetall(ukey)
-
-        out = []
-        for idx, (uid, sc) in enumerate(rows, start=start+1):
-            out.append({
-                "rank": idx,
-                "user_id": uid,
-                "display_name": names.get(uid, "Player"),
-                "score": int(sc),
-                "me": (uid == user_id)
-            })
-
         return {"ok": True, "season_id": season_id, "present": True, "rows": out}
 
     def get_user_rank(self, game_code: str, user_id: str, season_id: Optional[str] = None) -> Dict[str, Any]:
         """Get rank and score for a specific user"""
-        if not self.redis_available:
-            return {
-                "ok": True,
-                "season_id": self.iso_week_season(),
-                "rank": None,
-                "score": None,
-                "fallback": True
-            }
+        if self._past_season(season_id):
+            from services.season_archive import season_archive
+            archived = season_archive.rank(game_code, season_id, user_id)
+            if archived is not None:
+                return archived
 
         season_id = season_id or self.iso_week_season()
+        if self._redis_down():
+            return self.local.rank(game_code, season_id, user_id)
 
         zkey = self.key_lb(game_code, season_id)
-        rank = self.redis.zrevrank(zkey, user_id)
-        score = self.redis.zscore(zkey, user_id)
+        try:
+            rank = self.redis.zrevrank(zkey, user_id)
+            score = self.redis.zscore(zkey, user_id)
+        except REDIS_DOWN as e:
+            self._mark_down(e)
+            return self.local.rank(game_code, season_id, user_id)
 
         return {
             "ok": True,
@@ -235,17 +588,108 @@ class LeaderboardService:
             "score": int(score) if score is not None else None
         }
 
+    def projected_rank(self, game_code: str, user_id: str, score: int) -> Dict[str, Any]:
+        """
+        Standing the user will have once score is recorded, for submissions queued for a later write
+        Returns the submit_score shape plus "provisional": True; ties may land one place off.
+        """
+        season_id = self.iso_week_season()
+        user_id = str(user_id)
+        if self._redis_down():
+            return {"ok": False, "error": "leaderboard_unavailable"}
+
+        zkey = self.key_lb(game_code, season_id)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zscore(zkey, user_id)
+            pipe.hget(self.key_best(game_code), user_id)
+            season, best = pipe.execute()
+            season = max(score, int(float(season))) if season is not None else score
+            best = max(score, int(float(best))) if best is not None else score
+            ahead = self.redis.zcount(zkey, f"({season}", "+inf")
+        except REDIS_DOWN as e:
+            self._mark_down(e)
+            return {"ok": False, "error": "leaderboard_unavailable"}
+
+        return {
+            "ok": True,
+            "season_id": season_id,
+            "rank": ahead + 1,
+            "best_season": season,
+            "best_all_time": best,
+            "provisional": True
+        }
+
+    def get_distribution(self, game_code: str, season_id: Optional[str] = None, user_id: Optional[str] = None,
+                         score: Optional[int] = None, buckets: int = 10) -> Dict[str, Any]:
+        """
+        Percentile standing and score histogram for one season board
+        Every figure is a ZCOUNT, so the cost is O(buckets * log n) however many players there are.
+        score defaults to the user's season best when user_id is given.
+        Returns: {"ok", "season_id", "players", "score", "percentile", "top_percent", "histogram": [{"min", "max", "count"}]}
+        """
+        buckets = self.clamp_int(buckets, 1, 50, 10)
+        season_id = season_id or self.iso_week_season()
+        counts = None
+        if not self._redis_down():
+            try:
+                counts = self._distribution_counts(self.key_lb(game_code, season_id), user_id, score, buckets)
+            except REDIS_DOWN as e:
+                self._mark_down(e)
+        result = {}
+        if counts is None:
+            counts = self.local.distribution_counts(game_code, season_id, user_id, score, buckets)
+            result["fallback"] = True
+
+        total, score, hist, below = counts
+        result.update({
+            "ok": True,
+            "season_id": season_id,
+            "players": total,
+            "score": score,
+            # Share of players strictly below the score, and share at or above it
+            "percentile": round(100.0 * below / total, 1) if total and below is not None else None,
+            "top_percent": round(100.0 * (total - below) / total, 1) if total and below is not None else None,
+            "histogram": [{"min": a, "max": b, "count": c} for a, b, c in hist]
+        })
+        return result
+
+    def _distribution_counts(self, zkey: str, user_id: Optional[str], score: Optional[int], buckets: int) -> tuple:
+        """(total, score, [(lo, hi, count)], below) in two pipelined round-trips"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zcard(zkey)
+        pipe.zrange(zkey, 0, 0, withscores=True)
+        pipe.zrevrange(zkey, 0, 0, withscores=True)
+        if score is None and user_id is not None:
+            pipe.zscore(zkey, user_id)
+        reply = pipe.execute()
+        total, low, high = reply[:3]
+        if score is None and user_id is not None and reply[3] is not None:
+            score = int(reply[3])
+        if not total:
+            return 0, score, [], None
+
+        edges = bucket_edges(int(low[0][1]), int(high[0][1]), buckets)
+        pipe = self.redis.pipeline(transaction=False)
+        for a, b in edges:
+            pipe.zcount(zkey, a, b)
+        if score is not None:
+            pipe.zcount(zkey, "-inf", f"({score}")
+        reply = pipe.execute()
+        hist = [(a, b, c) for (a, b), c in zip(edges, reply)]
+        return total, score, hist, reply[-1] if score is not None else None
+
     def get_user_best(self, game_code: str, user_id: str) -> Dict[str, Any]:
         """Get user's all-time best score"""
-        if not self.redis_available:
-            return {
-                "ok": True,
-                "best_all_time": None,
-                "fallback": True
-            }
+        if self._redis_down():
+            return self.local.user_best(game_code, user_id)
 
         bkey = self.key_best(game_code)
-        best = self.redis.hget(bkey, user_id)
+        try:
+            best = self.redis.hget(bkey, user_id)
+        except REDIS_DOWN as e:
+            self._mark_down(e)
+            return self.local.user_best(game_code, user_id)
 
         return {
             "ok": True,
@@ -254,7 +698,7 @@ class LeaderboardService:
 
     def register_game(self, game_code: str):
         """Register a game for seasonal rotation"""
-        self.redis.sadd("games", game_code)
+        self.redis.sadd(self.key_games(), game_code)
 
 # Global instance
 leaderboard_service = LeaderboardService()
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+In-process leaderboard used while Redis is unreachable
+One LocalBoard per (game, season): a sorted list of (score, user_id) kept in
+the same order as the Redis ZSET, plus score and name dicts, so rank and top-N
+are bisects and slices. Boards are seeded from the database where the game has
+a source table (the word finder's scores), take live submissions during the
+outage, and are replayed into Redis by LeaderboardService once it recovers.
+"""
+import os, time, math, threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Any
+from sqlalchemy import text
+
+LOCAL_RESEED_SEC = int(os.getenv("LEADERBOARD_LOCAL_RESEED_SEC", "60"))  # pick up other workers' scores
+
+# Best completed word finder score per user in one week, as /api/score computes leaderboard_score
+WORD_FINDER_SEED_SQL = """
+  SELECT s.user_id, COALESCE(u.display_name, u.username),
+         MAX(s.found_count * 1000 + CASE WHEN s.duration_sec < 600 THEN 300 - s.duration_sec / 2 ELSE 0 END)
+  FROM scores s
+  LEFT JOIN users u ON u.id = s.user_id
+  WHERE s.completed AND s.user_id IS NOT NULL AND s.created_at >= :start AND s.created_at < :end
+  GROUP BY s.user_id, u.display_name, u.username
+"""
+
+def _season_range(season_id: str):
+    year, week = season_id.split("-W")
+    start = date.fromisocalendar(int(year), int(week), 1)
+    return datetime.combine(start, datetime.min.time()), datetime.combine(start + timedelta(days=7), datetime.min.time())
+
+def seed_word_finder(season_id: str) -> List[tuple]:
+    from models import db
+    start, end = _season_range(season_id)
+    rows = db.session.execute(text(WORD_FINDER_SEED_SQL), {"start": start, "end": end}).fetchall()
+    return [(str(uid), name or f"Player{uid}", int(score)) for uid, name, score in rows]
+
+SEEDERS = {"mini_word_finder": seed_word_finder}
+
+def bucket_edges(lo: int, hi: int, n: int) -> List[tuple]:
+    """n equal-width inclusive integer ranges [(a, b)] covering lo..hi"""
+    width = max(1, math.ceil((hi - lo + 1) / n))
+    return [(a, a + width - 1) for a in range(lo, hi + 1, width)]
+
+class LocalBoard:
+    """One season's standings, ordered like a Redis ZSET (score, then member)"""
+
+    __slots__ = ("scores", "names", "order", "seeded_at")
+
+    def __init__(self):
+        self.scores: Dict[str, int] = {}
+        self.names: Dict[str, str] = {}
+        self.order: List[tuple] = []  # ascending (score, user_id); ZREVRANGE reads it backwards
+        self.seeded_at = 0.0
+
+    def submit(self, user_id: str, display_name: str, score: int):
+        """Keep-best, like SUBMIT_SCORE_LUA"""
+        self.names[user_id] = display_name
+        current = self.scores.get(user_id)
+        if current is not None:
+            if score <= current:
+                return
+            del self.order[bisect_left(self.order, (current, user_id))]
+        self.scores[user_id] = score
+        insort(self.order, (score, user_id))
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """0-based rank, highest score first"""
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        return len(self.order) - 1 - bisect_left(self.order, (score, user_id))
+
+    def count(self, lo: float, hi: float) -> int:
+        """Players with lo <= score <= hi, like ZCOUNT"""
+        return bisect_right(self.order, (hi, "\uffff")) - bisect_left(self.order, (lo, ""))
+
+    def page(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Rows for ranks start..stop (0-based, inclusive)"""
+        out = []
+        for rank in range(max(0, start), min(stop, len(self.order) - 1) + 1):
+            score, uid = self.order[len(self.order) - 1 - rank]
+            out.append({"rank": rank + 1, "user_id": uid, "display_name": self.names.get(uid) or "Player",
+                        "score": score})
+        return out
+
+class LocalLeaderboards:
+    def __init__(self):
+        self.boards: Dict[tuple, LocalBoard] = {}
+        self.best: Dict[str, Dict[str, int]] = {}  # game -> user -> best score seen locally
+        self.lock = threading.Lock()
+
+    def _board(self, game_code: str, season_id: str) -> LocalBoard:
+        """Board for (game, season), (re)seeded from the database at most every LOCAL_RESEED_SEC"""
+        board = self.boards.setdefault((game_code, season_id), LocalBoard())
+        seeder = SEEDERS.get(game_code)
+        if seeder and time.time() - board.seeded_at > LOCAL_RESEED_SEC:
+            board.seeded_at = time.time()
+            try:
+                for uid, name, score in seeder(season_id):
+                    board.submit(uid, name, score)
+            except Exception as e:
+                print(f"Warning: could not seed local leaderboard {game_code} {season_id}: {e}")
+        return board
+
+    def submit(self, game_code: str, season_id: str, entries: List[tuple]) -> Dict[str, Dict[str, Any]]:
+        """entries: [(user_id, display_name, score)] -> {user_id: submit_score-style result}"""
+        with self.lock:
+            board = self._board(game_code, season_id)
+            best = self.best.setdefault(game_code, {})
+            for uid, name, score in entries:
+                board.submit(uid, name, score)
+                best[uid] = max(score, best.get(uid, score))
+            out = {}
+            for uid, _, _ in entries:
+                rank = board.rank(uid)
+                out[uid] = {
+                    "ok": True,
+                    "season_id": season_id,
+                    "rank": rank + 1,
+                    "best_season": board.scores[uid],
+                    "best_all_time": max(best[uid], board.scores[uid]),
+                    "fallback": True
+                }
+            return out
+
+    def top(self, game_code: str, season_id: str, n: int) -> Dict[str, Any]:
+        with self.lock:
+            rows = self._board(game_code, season_id).page(0, n - 1)
+        return {"ok": True, "season_id": season_id, "count": len(rows), "rows": rows, "fallback": True}
+
+    def around(self, game_code: str, season_id: str, user_id: str, window: int) -> Dict[str, Any]:
+        with self.lock:
+            board = self._board(game_code, season_id)
+            rank = board.rank(user_id)
+            rows = board.page(rank - window, rank + window) if rank is not None else []
+        if rank is None:
+            return {"ok": True, "season_id": season_id, "present": False, "rows": [], "fallback": True}
+        for row in rows:
+            row["me"] = (row["user_id"] == user_id)
+        return {"ok": True, "season_id": season_id, "present": True, "rows": rows, "fallback": True}
+
+    def rank(self, game_code: str, season_id: str, user_id: str) -> Dict[str, Any]:
+        with self.lock:
+            board = self._board(game_code, season_id)
+            rank = board.rank(user_id)
+            score = board.scores.get(user_id)
+        return {"ok": True, "season_id": season_id, "rank": (rank + 1) if rank is not None else None,
+                "score": score, "fallback": True}
+
+    def distribution_counts(self, game_code: str, season_id: str, user_id: Optional[str],
+                            score: Optional[int], buckets: int) -> tuple:
+        """(total, score, [(lo, hi, count)], below), as LeaderboardService computes them from ZCOUNT"""
+        with self.lock:
+            board = self._board(game_code, season_id)
+            if score is None and user_id is not None:
+                score = board.scores.get(user_id)
+            if not board.order:
+                return 0, score, [], None
+            edges = bucket_edges(board.order[0][0], board.order[-1][0], buckets)
+            hist = [(a, b, board.count(a, b)) for a, b in edges]
+            below = board.count(-math.inf, score - 1) if score is not None else None
+            return len(board.order), score, hist, below
+
+    def user_best(self, game_code: str, user_id: str) -> Dict[str, Any]:
+        with self.lock:
+            best = self.best.get(game_code, {}).get(user_id)
+        return {"ok": True, "best_all_time": best, "fallback": True}
+
+    def drain(self) -> List[tuple]:
+        """Take every board for replaying into Redis: [(game_code, season_id, [(user_id, display_name, score)])]"""
+        with self.lock:
+            boards, self.boards, self.best = self.boards, {}, {}
+        return [(game, season, [(uid, board.names.get(uid) or "Player", sc) for uid, sc in board.scores.items()])
+                for (game, season), board in boards.items()]
@@ -0,0 +1,149 @@
+"""
+Live leaderboard and war updates for Server-Sent Events
+Publishers call live_events.publish() once their transaction has committed.
+Each gunicorn worker runs a single Redis pub/sub listener thread that fans
+messages out to the SSE streams connected to that worker, so one publish
+reaches every worker and no stream holds its own Redis connection.
+Without Redis, events only reach streams on the publishing worker.
+"""
+import os, json, queue, threading, time
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+import redis
+
+LIVE_MAX_STREAMS = int(os.getenv("LIVE_MAX_STREAMS", "12"))         # open streams per worker (each holds a thread)
+LIVE_STREAM_MAX_SEC = int(os.getenv("LIVE_STREAM_MAX_SEC", "300"))  # streams end after this; EventSource reconnects
+LIVE_KEEPALIVE_SEC = 15
+SUBSCRIBER_QUEUE = 100                                              # frames buffered per stream before dropping
+
+class Subscription:
+    """One SSE stream's inbox"""
+
+    def __init__(self, hub: "LiveEvents", channels: Iterable[str]):
+        self.hub = hub
+        self.channels = set(channels)
+        self.queue: "queue.Queue[str]" = queue.Queue(maxsize=SUBSCRIBER_QUEUE)
+        self.closed = False
+
+    def push(self, frame: str):
+        try:
+            self.queue.put_nowait(frame)
+        except queue.Full:
+            pass  # slow client; its next full fetch catches it up
+
+    def get(self, timeout: float) -> Optional[str]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.hub._remove(self)
+
+class LiveEvents:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, live updates will only reach this worker")
+        self._subs: Dict[str, set] = {}
+        self._streams = 0
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def key_channel(self, channel: str) -> str:
+        """Pub/sub channel, e.g. live:leaderboard:mini_word_finder or live:war:12"""
+        return f"live:{channel}"
+
+    def publish(self, channel: str, event: str, data: Dict[str, Any]):
+        """Send one event to every stream subscribed to channel. Never raises."""
+        msg = json.dumps({"event": event, "data": data}, default=str)
+        if self.redis_available:
+            try:
+                self.redis.publish(self.key_channel(channel), msg)
+                return
+            except Exception as e:
+                print(f"Warning: live event publish failed, delivering locally: {e}")
+        self._dispatch(channel, msg)
+
+    def subscribe(self, channels: List[str]) -> Optional[Subscription]:
+        """Inbox for channels, or None if this worker already serves LIVE_MAX_STREAMS streams"""
+        with self._lock:
+            if self._streams >= LIVE_MAX_STREAMS:
+                return None
+            sub = Subscription(self, channels)
+            for channel in sub.channels:
+                self._subs.setdefault(channel, set()).add(sub)
+            self._streams += 1
+        self._ensure_listener()
+        return sub
+
+    def _remove(self, sub: Subscription):
+        with self._lock:
+            for channel in sub.channels:
+                subs = self._subs.get(channel)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[channel]
+            self._streams -= 1
+
+    def _dispatch(self, channel: str, msg: str):
+        with self._lock:
+            subs = list(self._subs.get(channel, ()))
+        if not subs:
+            return
+        # Format the SSE frame once for every stream on this worker
+        m = json.loads(msg)
+        frame = f"event: {m['event']}\ndata: {json.dumps(dict(m['data'], channel=channel))}\n\n"
+        for sub in subs:
+            sub.push(frame)
+
+    def _ensure_listener(self):
+        if not self.redis_available:
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, daemon=True, name="LiveEventsListener")
+            self._listener.start()
+
+    def _listen(self):
+        prefix = self.key_channel("")
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{prefix}*")
+                for m in pubsub.listen():
+                    if m["type"] == "pmessage":
+                        self._dispatch(m["channel"][len(prefix):], m["data"])
+            except Exception as e:
+                print(f"Warning: live events listener reconnecting: {e}")
+                time.sleep(1)
+
+    def stream(self, sub: Subscription) -> Iterator[str]:
+        """SSE frames for one subscription until LIVE_STREAM_MAX_SEC, with keep-alive comments"""
+        deadline = time.monotonic() + LIVE_STREAM_MAX_SEC
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                frame = sub.get(LIVE_KEEPALIVE_SEC)
+                yield frame if frame is not None else ": keepalive\n\n"
+        finally:
+            sub.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"ok": True, "backend": "redis" if self.redis_available else "local",
+                    "streams": self._streams, "max_streams": LIVE_MAX_STREAMS, "channels": len(self._subs)}
+
+# Global instance
+live_events = LiveEvents()
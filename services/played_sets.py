@@ -0,0 +1,99 @@
+"""
+Per-user played-template sets
+Compact bitmaps (bit N set = template N played) rebuilt from puzzle_plays, so
+template selection can skip puzzles a user has already played without a
+NOT EXISTS query. Stored as Redis bitmaps when available. Without Redis each
+lookup is rebuilt from puzzle_plays, which every worker writes, so no worker
+can serve a set that misses another worker's plays.
+"""
+import os
+from typing import Optional
+import redis
+from sqlalchemy import text
+
+from models import db
+
+PLAYED_TTL_SEC = int(os.getenv("PLAYED_SET_TTL_SEC", str(7 * 24 * 3600)))
+
+BUILT_BIT = 0  # puzzle_bank ids start at 1, so bit 0 marks "rebuilt from puzzle_plays"
+
+class PlayedSet:
+    """Read-only view over a bitmap in Redis SETBIT order (bit 0 = MSB of byte 0)."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __contains__(self, puzzle_id: int) -> bool:
+        i = int(puzzle_id)
+        byte = i >> 3
+        return byte < len(self.data) and bool(self.data[byte] & (0x80 >> (i & 7)))
+
+    @property
+    def built(self) -> bool:
+        return BUILT_BIT in self
+
+def _set_bit(buf: bytearray, i: int):
+    byte = i >> 3
+    if byte >= len(buf):
+        buf.extend(b"\0" * (byte + 1 - len(buf)))
+    buf[byte] |= 0x80 >> (i & 7)
+
+class PlayedSets:
+    def __init__(self):
+        # Use existing Redis configuration (raw bytes: bitmaps are not text)
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=False)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, played sets will be read from the database")
+
+    def key_played(self, user_id: int) -> str:
+        """Bitmap of puzzle_bank ids the user has played"""
+        return f"played:{user_id}"
+
+    def _rebuild(self, user_id: int) -> bytearray:
+        rows = db.session.execute(
+            text("SELECT puzzle_id FROM puzzle_plays WHERE user_id = :uid"), {"uid": user_id}
+        ).fetchall()
+        buf = bytearray()
+        _set_bit(buf, BUILT_BIT)
+        for (pid,) in rows:
+            _set_bit(buf, pid)
+        return buf
+
+    def get(self, user_id: int) -> Optional[PlayedSet]:
+        """The user's played set, rebuilt from puzzle_plays on first use. None if unavailable."""
+        try:
+            if self.redis_available:
+                played = PlayedSet(self.redis.get(self.key_played(user_id)) or b"")
+                if not played.built:
+                    buf = self._rebuild(user_id)
+                    self.redis.set(self.key_played(user_id), bytes(buf), ex=PLAYED_TTL_SEC)
+                    played = PlayedSet(bytes(buf))
+                return played
+            return PlayedSet(bytes(self._rebuild(user_id)))
+        except Exception as e:
+            print(f"Warning: could not load played set for user {user_id}: {e}")
+            return None
+
+    def mark(self, user_id: int, puzzle_id: int):
+        """Record a play. An unbuilt bitmap stays unbuilt and is rebuilt from the DB on next get."""
+        if not self.redis_available:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setbit(self.key_played(user_id), int(puzzle_id), 1)
+            pipe.expire(self.key_played(user_id), PLAYED_TTL_SEC)
+            pipe.execute()
+        except Exception as e:
+            print(f"Warning: could not mark puzzle {puzzle_id} played for user {user_id}: {e}")
+
+# Global instance
+played_sets = PlayedSets()
@@ -0,0 +1,104 @@
+"""
+Memoized seed -> procedural puzzle cache
+Procedural puzzles are a pure function of (mode, seed, category) and the word
+source they were drawn from, so hints, reveals and score checks can look one
+up here instead of regenerating it. Entries hold the compact grid, words and
+answer key in a per-worker LRU with a TTL; the key includes the category word
+index version so a word list reload never serves a stale answer key.
+"""
+import os, time, threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from puzzles import MODE_CONFIG, generate_puzzle
+from word_index import category_words
+
+PUZZLE_CACHE_SIZE = int(os.getenv("PUZZLE_CACHE_SIZE", "4096"))       # puzzles kept per worker
+PUZZLE_CACHE_TTL_SEC = int(os.getenv("PUZZLE_CACHE_TTL_SEC", "21600"))  # a procedural game rarely outlives this
+
+class PuzzleCache:
+    def __init__(self, size: int = PUZZLE_CACHE_SIZE, ttl: int = PUZZLE_CACHE_TTL_SEC):
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires_at, grid, words, answers)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, mode: str, seed, category: Optional[str]) -> tuple:
+        # Generic puzzles come from the static WORD_BANK; only category puzzles
+        # depend on the DB-backed word index
+        if category:
+            category_words.refresh()
+            return (mode, seed, category, category_words.version)
+        return (mode, seed, None, None)
+
+    @staticmethod
+    def _expand(mode: str, seed, entry: tuple) -> Dict[str, Any]:
+        # Callers decorate the returned dict (puzzle_id, ok, ...), so hand out a fresh one
+        _, grid, words, answers = entry
+        return {
+            "grid": list(grid),
+            "words": list(words),
+            "mode": mode,
+            "time_limit": MODE_CONFIG[mode]["time"],
+            "seed": seed,
+            "answers": dict(answers)
+        }
+
+    def put(self, mode: str, seed, category: Optional[str], P: Dict[str, Any]):
+        """Remember a puzzle generated elsewhere (e.g. popped from the pre-generated pool)."""
+        if seed is None or mode not in MODE_CONFIG:
+            return
+        entry = (time.monotonic() + self.ttl, tuple(P["grid"]), tuple(P["words"]), P.get("answers") or {})
+        key = self._key(mode, seed, category)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def peek(self, mode: str, seed, category: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached puzzle, or None on a miss. Never generates."""
+        if seed is None or mode not in MODE_CONFIG:
+            return None
+        key = self._key(mode, seed, category)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._expand(mode, seed, entry)
+
+    def get(self, mode: str, seed=None, category: Optional[str] = None) -> Dict[str, Any]:
+        """generate_puzzle(mode, seed, category), generated at most once per key per worker.
+
+        An unseeded puzzle is random by definition and is never cached.
+        """
+        if seed is None:
+            return generate_puzzle(mode, seed=seed, category=category)
+        P = self.peek(mode, seed, category)
+        if P is None:
+            P = generate_puzzle(mode, seed=seed, category=category)
+            self.put(mode, seed, category, P)
+        return P
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "ok": True,
+            "size": len(self._entries),
+            "capacity": self.size,
+            "ttl_sec": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+# Global instance (one per worker process)
+puzzle_cache = PuzzleCache()
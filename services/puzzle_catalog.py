@@ -0,0 +1,184 @@
+"""
+In-memory PuzzleBank template catalog
+Holds active template ids bucketed by mode, (mode, category) and (mode, daily_date)
+so picking a random template is an index pick instead of ORDER BY random().
+Decoded templates (grid, words, answers) are kept in a small LRU.
+Each worker process has its own catalog, refreshed when a cheap version check
+(row count + a checksum over the bucketing columns) changes, so deactivating or
+re-dating a template is picked up too.
+"""
+import os, time, random, threading
+from collections import OrderedDict, namedtuple
+from datetime import date
+from itertools import chain, islice
+from typing import Optional, Dict, List, Any
+from sqlalchemy import text
+
+from models import db, PuzzleBank
+
+CATALOG_CHECK_SEC = int(os.getenv("PUZZLE_CATALOG_CHECK_SEC", "30"))     # how often to run the version check
+CATALOG_CACHE_SIZE = int(os.getenv("PUZZLE_CATALOG_CACHE_SIZE", "2048"))  # decoded templates kept per worker
+UNSEEN_PROBES = 8  # random picks tried before scanning the bucket for an unseen template
+
+VERSION_SQL = """
+  SELECT COUNT(*),
+         COALESCE(SUM(hashtext(id || ':' || active::text || ':' || mode || ':' ||
+                               COALESCE(category, '') || ':' || COALESCE(daily_date::text, ''))::bigint), 0)
+  FROM puzzle_bank
+"""
+
+Template = namedtuple("Template", "id mode category grid words time_limit seed answers")
+
+class PuzzleCatalog:
+    def __init__(self, check_interval: int = CATALOG_CHECK_SEC, cache_size: int = CATALOG_CACHE_SIZE):
+        self.check_interval = check_interval
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+
+        self._active = set()
+        self._by_mode: Dict[str, List[int]] = {}
+        self._by_category: Dict[tuple, List[int]] = {}   # (mode, category or None) -> ids
+        self._daily: Dict[tuple, int] = {}               # (mode, daily_date) -> lowest id
+
+        self._cache: "OrderedDict[int, Template]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _ensure_fresh(self):
+        """Run the version check at most every check_interval seconds; reload on change."""
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return
+            row = db.session.execute(text(VERSION_SQL)).one()
+            version = (row[0], row[1])
+            if version != self._version:
+                self._reload()
+                self._version = version
+            self._checked_at = now
+
+    def _reload(self):
+        rows = db.session.query(
+            PuzzleBank.id, PuzzleBank.mode, PuzzleBank.category, PuzzleBank.daily_date
+        ).filter(PuzzleBank.active.is_(True)).all()
+
+        by_mode, by_category, daily = {}, {}, {}
+        for pid, mode, category, daily_date in rows:
+            by_mode.setdefault(mode, []).append(pid)
+            by_category.setdefault((mode, category), []).append(pid)
+            if daily_date is not None:
+                key = (mode, daily_date)
+                daily[key] = min(pid, daily.get(key, pid))
+
+        # Swap in whole structures so concurrent readers never see a half-built index
+        self._active = {r[0] for r in rows}
+        self._by_mode, self._by_category, self._daily = by_mode, by_category, daily
+        self.reloads += 1
+
+    def invalidate(self):
+        """Force the next lookup to run the version check (e.g. after templates are edited)."""
+        self._checked_at = 0.0
+
+    def get(self, puzzle_id: int) -> Optional[Template]:
+        """Decoded active template by id, or None if it is missing or inactive."""
+        self._ensure_fresh()
+        try:
+            puzzle_id = int(puzzle_id)
+        except (TypeError, ValueError):
+            return None
+        if puzzle_id not in self._active:
+            return None
+
+        with self._lock:
+            tpl = self._cache.get(puzzle_id)
+            if tpl is not None:
+                self._cache.move_to_end(puzzle_id)
+                self.hits += 1
+                return tpl
+
+        pb = db.session.get(PuzzleBank, puzzle_id)
+        if pb is None or not pb.active:
+            self.invalidate()
+            return None
+        tpl = Template(pb.id, pb.mode, pb.category, pb.grid, pb.words,
+                       pb.time_limit, pb.seed, pb.answers)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[puzzle_id] = tpl
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tpl
+
+    def _pick(self, ids: List[int]) -> Optional[Template]:
+        # A stale id (deactivated since the last check) just costs one retry
+        for _ in range(2):
+            if not ids:
+                return None
+            tpl = self.get(random.choice(ids))
+            if tpl is not None:
+                return tpl
+        return None
+
+    def _pick_unseen(self, ids: List[int], played) -> Optional[Template]:
+        # Random probes are O(1) while most of the bucket is unseen; the rotated
+        # scan only runs once a user has played through most of it.
+        for _ in range(min(UNSEEN_PROBES, len(ids))):
+            pid = random.choice(ids)
+            if pid not in played:
+                tpl = self.get(pid)
+                if tpl is not None:
+                    return tpl
+        if not ids:
+            return None
+        start = random.randrange(len(ids))
+        for pid in chain(islice(ids, start, None), islice(ids, start)):
+            if pid not in played:
+                tpl = self.get(pid)
+                if tpl is not None:
+                    return tpl
+        return None
+
+    def random_template(self, mode: str, category: Optional[str] = None,
+                        any_category: bool = False, played=None) -> Optional[Template]:
+        """Uniform random active template for mode.
+
+        With any_category the category is ignored; otherwise category=None
+        selects uncategorized templates only. If played (a set-like of
+        template ids) is given, only templates not in it are returned, and
+        None means the user has exhausted the bucket.
+        """
+        self._ensure_fresh()
+        if any_category:
+            ids = self._by_mode.get(mode, [])
+        else:
+            ids = self._by_category.get((mode, category), [])
+        if played is not None:
+            return self._pick_unseen(ids, played)
+        return self._pick(ids)
+
+    def daily_template(self, mode: str, day: Optional[date] = None) -> Optional[Template]:
+        """The scheduled template for mode on day (today by default)."""
+        self._ensure_fresh()
+        pid = self._daily.get((mode, day or date.today()))
+        return self.get(pid) if pid is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ok": True,
+            "version": list(self._version) if self._version else None,
+            "templates": len(self._active),
+            "buckets": len(self._by_category),
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+# Global instance (one per worker process)
+puzzle_catalog = PuzzleCatalog()
@@ -0,0 +1,72 @@
+"""
+Server-side puzzle instance registry
+Served puzzles (grid, words, answer key) are stored here under a short
+content-hash id so the Flask session only carries ids instead of whole grids.
+Identical puzzles hash to the same id, so re-serving a template or a cached
+procedural puzzle never stores a second copy.
+Needs Redis: an id held only by one worker would be unknown to the others, so
+without Redis register() returns None and the caller keeps the full puzzle in
+the session as before.
+"""
+import os, json, hashlib
+from typing import Optional, Dict, Any
+import redis
+
+INSTANCE_TTL_SEC = int(os.getenv("PUZZLE_INSTANCE_TTL_SEC", str(24 * 3600)))   # well past the 1h session lifetime
+
+class PuzzleInstances:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, puzzles will be kept in the session")
+
+    def key_instance(self, instance_id: str) -> str:
+        """STRING key holding one JSON-encoded puzzle"""
+        return f"puzzle:inst:{instance_id}"
+
+    @staticmethod
+    def encode(puzzle: Dict[str, Any]) -> str:
+        return json.dumps(puzzle, sort_keys=True, separators=(",", ":"))
+
+    @staticmethod
+    def instance_id(raw: str) -> str:
+        """Short id derived from the puzzle content (16 hex chars)"""
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    def register(self, puzzle: Dict[str, Any]) -> Optional[str]:
+        """Store a puzzle and return its id, or None if it could not be stored for every worker.
+
+        Re-registering the same content refreshes its TTL.
+        """
+        if not self.redis_available:
+            return None
+        raw = self.encode(puzzle)
+        iid = self.instance_id(raw)
+        try:
+            self.redis.set(self.key_instance(iid), raw, ex=INSTANCE_TTL_SEC)
+            return iid
+        except Exception as e:
+            print(f"Warning: could not store puzzle instance in Redis, keeping it in the session: {e}")
+            return None
+
+    def get(self, instance_id) -> Optional[Dict[str, Any]]:
+        """The stored puzzle, or None if the id is unknown or expired."""
+        if not isinstance(instance_id, str) or not self.redis_available:
+            return None
+        try:
+            raw = self.redis.get(self.key_instance(instance_id))
+        except Exception as e:
+            print(f"Warning: could not load puzzle instance {instance_id}: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+# Global instance
+puzzle_instances = PuzzleInstances()
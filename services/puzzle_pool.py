@@ -0,0 +1,220 @@
+"""
+Pre-generated procedural puzzle pool
+Keeps ready-made puzzles (grid, words and answer key) per (mode, category) so
+the procedural fallback in /api/puzzle is a pop instead of a generate.
+Backed by Redis when available, otherwise by an in-process deque per pool.
+Only categories the generator knows (the word index or CATEGORY_SEEDS) get a
+pool, so arbitrary category names from clients cannot take up the slots.
+"""
+import os, time, json, random, threading
+from collections import deque, defaultdict
+from typing import Optional, Dict, List, Any
+import redis
+
+from puzzles import CATEGORY_SEEDS, MODE_CONFIG, generate_puzzle
+from services.puzzle_cache import puzzle_cache
+from services import redis_lock
+from word_index import category_words
+
+POOL_TARGET = int(os.getenv("PUZZLE_POOL_TARGET", "40"))         # refill up to this depth
+POOL_LOW_WATER = int(os.getenv("PUZZLE_POOL_LOW_WATER", "10"))   # refill when depth drops below
+POOL_MAX_POOLS = int(os.getenv("PUZZLE_POOL_MAX_POOLS", "64"))   # cap on (mode, category) pools kept warm
+REFILL_LOCK_SEC = 120
+
+_seed_rng = random.SystemRandom()
+
+def is_known_category(category: Optional[str]) -> bool:
+    """True for no category or one the generator has words for"""
+    return not category or category in CATEGORY_SEEDS or category in category_words.categories()
+
+class PuzzlePool:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, puzzle pool will use in-process mode")
+
+        # In-process fallback state (per worker)
+        self._lock = threading.Lock()
+        self._local: Dict[str, deque] = defaultdict(deque)
+        self._local_pools = set()
+        self._local_stats: Dict[str, int] = defaultdict(int)
+
+    def pool_name(self, mode: str, category: Optional[str] = None) -> str:
+        return f"{mode}:{category or 'none'}"
+
+    def key_pool(self, name: str) -> str:
+        """LIST key holding JSON-encoded puzzles for one (mode, category)"""
+        return f"pool:{name}"
+
+    def key_pools(self) -> str:
+        """SET of pool names that have been requested and should be kept warm"""
+        return "pool:names"
+
+    def key_stats(self) -> str:
+        """HASH of counters: '{pool}:hits', '{pool}:misses', '{pool}:refills', ..."""
+        return "pool:stats"
+
+    def key_lock(self, name: str) -> str:
+        return f"pool:lock:{name}"
+
+    def take(self, mode: str, category: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Pop a ready puzzle, or None if the pool is empty (caller generates instead)."""
+        if mode not in MODE_CONFIG or not is_known_category(category):
+            return None
+        name = self.pool_name(mode, category)
+
+        if not self.redis_available:
+            with self._lock:
+                if len(self._local_pools) < POOL_MAX_POOLS:
+                    self._local_pools.add(name)
+                P = self._local[name].popleft() if self._local[name] else None
+                self._local_stats[f"{name}:{'hits' if P else 'misses'}"] += 1
+            if P:
+                puzzle_cache.put(mode, P.get("seed"), category, P)
+            return P
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.lpop(self.key_pool(name))
+            pipe.scard(self.key_pools())
+            raw, pools = pipe.execute()
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hincrby(self.key_stats(), f"{name}:{'hits' if raw else 'misses'}", 1)
+            if not raw and pools < POOL_MAX_POOLS:
+                pipe.sadd(self.key_pools(), name)
+            pipe.execute()
+            if not raw:
+                return None
+            # Possibly generated by another worker; remember it here for hints and reveals
+            P = json.loads(raw)
+            puzzle_cache.put(mode, P.get("seed"), category, P)
+            return P
+        except Exception as e:
+            print(f"Warning: puzzle pool take failed: {e}")
+            return None
+
+    def pool_names(self) -> List[str]:
+        """Pools to keep warm: every requested pool plus the generic pool for each mode."""
+        names = {self.pool_name(m) for m in MODE_CONFIG}
+        if self.redis_available:
+            requested = self.redis.smembers(self.key_pools())
+        else:
+            with self._lock:
+                requested = set(self._local_pools)
+
+        stale = set()
+        for name in requested:
+            mode, category = name.split(":", 1)
+            if mode in MODE_CONFIG and is_known_category(None if category == "none" else category):
+                names.add(name)
+            else:
+                stale.add(name)
+        # Registered before category checks, or the category has since been removed
+        if stale and self.redis_available:
+            self.redis.srem(self.key_pools(), *stale)
+        elif stale:
+            with self._lock:
+                self._local_pools -= stale
+        return sorted(names)
+
+    def depth(self, name: str) -> int:
+        if not self.redis_available:
+            with self._lock:
+                return len(self._local[name])
+        return self.redis.llen(self.key_pool(name))
+
+    def refill(self, name: str) -> int:
+        """Top a pool back up to POOL_TARGET if it is below POOL_LOW_WATER. Returns puzzles added."""
+        depth = self.depth(name)
+        if depth >= POOL_LOW_WATER:
+            return 0
+
+        # Only one worker refills a shared pool at a time
+        token = None
+        if self.redis_available:
+            token = redis_lock.acquire(self.redis, self.key_lock(name), REFILL_LOCK_SEC)
+            if not token:
+                return 0
+
+        try:
+            mode, category = name.split(":", 1)
+            category = None if category == "none" else category
+            started = time.perf_counter()
+            batch = [generate_puzzle(mode, seed=_seed_rng.randint(1, 2_000_000_000), category=category)
+                     for _ in range(POOL_TARGET - depth)]
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+
+            if self.redis_available:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.rpush(self.key_pool(name), *[json.dumps(P) for P in batch])
+                pipe.hincrby(self.key_stats(), f"{name}:refills", 1)
+                pipe.hincrby(self.key_stats(), f"{name}:generated", len(batch))
+                pipe.hset(self.key_stats(), f"{name}:last_refill_ms", elapsed_ms)
+                pipe.hset(self.key_stats(), f"{name}:last_refill_at", int(time.time()))
+                pipe.execute()
+            else:
+                with self._lock:
+                    self._local[name].extend(batch)
+                    self._local_stats[f"{name}:refills"] += 1
+                    self._local_stats[f"{name}:generated"] += len(batch)
+                    self._local_stats[f"{name}:last_refill_ms"] = elapsed_ms
+                    self._local_stats[f"{name}:last_refill_at"] = int(time.time())
+            return len(batch)
+        finally:
+            if token:
+                redis_lock.release(self.redis, self.key_lock(name), token)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-pool depth, hit rate and refill timings"""
+        if self.redis_available:
+            raw = self.redis.hgetall(self.key_stats())
+        else:
+            with self._lock:
+                raw = dict(self._local_stats)
+
+        pools = {}
+        for name in self.pool_names():
+            hits = int(raw.get(f"{name}:hits", 0))
+            misses = int(raw.get(f"{name}:misses", 0))
+            pools[name] = {
+                "depth": self.depth(name),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+                "refills": int(raw.get(f"{name}:refills", 0)),
+                "generated": int(raw.get(f"{name}:generated", 0)),
+                "last_refill_ms": int(raw[f"{name}:last_refill_ms"]) if f"{name}:last_refill_ms" in raw else None,
+                "last_refill_at": int(raw[f"{name}:last_refill_at"]) if f"{name}:last_refill_at" in raw else None,
+            }
+
+        return {
+            "ok": True,
+            "backend": "redis" if self.redis_available else "memory",
+            "target": POOL_TARGET,
+            "low_water": POOL_LOW_WATER,
+            "pools": pools
+        }
+
+# Global instance
+puzzle_pool = PuzzlePool()
+
+def refill_pools():
+    """Scheduler entry point: refill every pool that has dropped below the low-water mark"""
+    added = 0
+    for name in puzzle_pool.pool_names():
+        try:
+            added += puzzle_pool.refill(name)
+        except Exception as e:
+            print(f"Puzzle pool refill failed for {name}: {e}")
+    if added:
+        print(f"Puzzle pool: generated {added} puzzles")
+    return added
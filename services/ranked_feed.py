@@ -0,0 +1,161 @@
+"""
+Boost-ranked community feed in Redis
+feed:boosted holds posts whose boost has not run out, scored by
+boost_decay_anchor (services/boost_decay.py), which never changes between
+writes; ranges above "now" are therefore the posts by effective boost.
+feed:recent holds the newest RECENT_KEEP posts by last boost, then age, to
+fill the page once boosts run out. Both are updated after the writes that
+move a post (boosting, war actions and outcomes, new and deleted posts), and
+rebuilt from the database when feed:built is missing (cold start, flush).
+One worker rebuilds under a short lock; the others read the database meanwhile.
+"""
+import os, time
+from datetime import datetime
+from typing import Optional, List, Iterable
+import redis
+
+from services import redis_lock
+
+RECENT_KEEP = 1000
+NEVER_BOOSTED = 10 ** 10  # pushes never-boosted posts below every boosted one, like NULLS LAST
+REBUILD_LOCK_SEC = 30
+
+class RankedFeed:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, ranked feed reads from the database")
+
+    def key_boosted(self) -> str:
+        return "feed:boosted"
+
+    def key_recent(self) -> str:
+        return "feed:recent"
+
+    def key_built(self) -> str:
+        """Set by rebuild(); without it the sets may hold only posts updated since a flush"""
+        return "feed:built"
+
+    def key_rebuild_lock(self) -> str:
+        return "feed:rebuild:lock"
+
+    @staticmethod
+    def _epoch(dt: datetime) -> float:
+        # Post timestamps are naive UTC
+        return (dt - datetime(1970, 1, 1)).total_seconds()
+
+    def _recent_score(self, post) -> float:
+        if post.last_boost_at:
+            return self._epoch(post.last_boost_at)
+        return self._epoch(post.created_at) - NEVER_BOOSTED
+
+    def _add(self, pipe, post, now: float):
+        anchor = post.boost_decay_anchor
+        if anchor is not None and self._epoch(anchor) > now:
+            pipe.zadd(self.key_boosted(), {post.id: self._epoch(anchor)})
+        else:
+            pipe.zrem(self.key_boosted(), post.id)
+        pipe.zadd(self.key_recent(), {post.id: self._recent_score(post)})
+
+    def update(self, posts: Iterable):
+        """Re-rank posts after their boost or visibility changed and committed. Never raises."""
+        if not self.redis_available:
+            return
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for post in posts:
+                if post.is_hidden or post.is_deleted:
+                    pipe.zrem(self.key_boosted(), post.id)
+                    pipe.zrem(self.key_recent(), post.id)
+                else:
+                    self._add(pipe, post, now)
+            pipe.zremrangebyscore(self.key_boosted(), "-inf", now)
+            pipe.zremrangebyrank(self.key_recent(), 0, -RECENT_KEEP - 1)
+            pipe.execute()
+        except Exception as e:
+            print(f"Warning: ranked feed update failed: {e}")
+
+    def remove(self, post_ids: Iterable[int]):
+        """Drop deleted posts. Never raises."""
+        ids = list(post_ids)
+        if not ids or not self.redis_available:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrem(self.key_boosted(), *ids)
+            pipe.zrem(self.key_recent(), *ids)
+            pipe.execute()
+        except Exception as e:
+            print(f"Warning: ranked feed remove failed: {e}")
+
+    def rebuild(self) -> int:
+        """Reload both sets from the database. Returns posts in feed:recent."""
+        from models import Post
+        now = datetime.utcnow()
+        visible = Post.query.filter_by(is_hidden=False)
+        boosted = visible.filter(Post.boost_decay_anchor > now).all()
+        recent = (visible
+                  .order_by(Post.last_boost_at.desc().nullslast(), Post.created_at.desc())
+                  .limit(RECENT_KEEP).all())
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self.key_boosted(), self.key_recent())
+        if boosted:
+            pipe.zadd(self.key_boosted(), {p.id: self._epoch(p.boost_decay_anchor) for p in boosted})
+        if recent:
+            pipe.zadd(self.key_recent(), {p.id: self._recent_score(p) for p in recent})
+        pipe.set(self.key_built(), int(time.time()))
+        pipe.execute()
+        return len(recent)
+
+    def _read(self, n: int):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.exists(self.key_built())
+        pipe.zrevrangebyscore(self.key_boosted(), "+inf", f"({time.time()}", start=0, num=n)
+        # Boosted posts are in feed:recent too, so read enough to fill around them
+        pipe.zrevrange(self.key_recent(), 0, 2 * n - 1)
+        return pipe.execute()
+
+    def ids(self, n: int) -> Optional[List[int]]:
+        """Top n post ids by effective boost, then last boost and age.
+
+        None if Redis is unavailable or another worker is rebuilding the sets;
+        the caller reads the database instead.
+        """
+        if not self.redis_available:
+            return None
+        try:
+            built, boosted, recent = self._read(n)
+            if not built:
+                token = redis_lock.acquire(self.redis, self.key_rebuild_lock(), REBUILD_LOCK_SEC)
+                if not token:
+                    return None
+                try:
+                    if not self.redis.exists(self.key_built()):  # another worker may have just finished
+                        self.rebuild()
+                finally:
+                    redis_lock.release(self.redis, self.key_rebuild_lock(), token)
+                _, boosted, recent = self._read(n)
+        except Exception as e:
+            print(f"Warning: ranked feed read failed: {e}")
+            return None
+
+        out = [int(pid) for pid in boosted]
+        seen = set(out)
+        for pid in recent:
+            if len(out) >= n:
+                break
+            if int(pid) not in seen:
+                out.append(int(pid))
+        return out
+
+# Global instance
+ranked_feed = RankedFeed()
@@ -0,0 +1,28 @@
+"""
+Short-lived cross-worker locks in Redis
+acquire() takes the key with SET NX EX and a random token. release() deletes
+the key only while it still holds that token, so a holder that outlived its
+TTL cannot drop a lock another worker has since taken.
+"""
+import uuid
+from typing import Optional
+
+RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def acquire(r, key: str, ttl_sec: int) -> Optional[str]:
+    """Token for the lock on key, or None if another worker holds it"""
+    token = uuid.uuid4().hex
+    return token if r.set(key, token, nx=True, ex=ttl_sec) else None
+
+def release(r, key: str, token: str) -> bool:
+    """Drop the lock if token still owns it. Never raises."""
+    try:
+        return bool(r.eval(RELEASE_LUA, 1, key, token))
+    except Exception as e:
+        print(f"Warning: releasing lock {key} failed: {e}")
+        return False
@@ -0,0 +1,157 @@
+"""
+Materialized top-N word search boards
+Keeps the best scores per mode, all-time and per day, as small Redis sorted
+sets with the username and display fields stored in the member itself, so
+/leaderboard and /daily_leaderboard render from one pipelined read instead of
+ORDER BY points over the whole scores table plus a user lookup per row.
+Boards are updated as scores are ingested and rebuilt from the database the
+first time they are read (or after a daily board expires).
+Without Redis the pages fall back to one joined top-N query per board.
+"""
+import os, json
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Any
+import redis
+from sqlalchemy import text
+
+from models import db
+
+MODES = ("easy", "medium", "hard")
+BOARD_SIZE = 10                                                   # rows shown per board
+DAILY_BOARD_DAYS = 8                                              # the page offers the last 7 days
+DAILY_BOARD_TTL_SEC = DAILY_BOARD_DAYS * 24 * 3600
+
+TOP_SQL = """
+  SELECT s.id, s.user_id, u.username, s.points, s.duration_sec, s.time_ms,
+         s.found_count, s.total_words, s.created_at
+  FROM scores s
+  LEFT JOIN users u ON u.id = s.user_id
+  WHERE s.mode = :mode {where}
+  ORDER BY s.points DESC
+  LIMIT :n
+"""
+
+def _entry(ref, user_id, username, points, duration_sec, time_ms, found_count, total_words, created_at) -> str:
+    """Sorted-set member: everything the leaderboard templates show for one score.
+
+    ref (score id, or submission key for freshly ingested scores) keeps
+    otherwise identical scores from collapsing into one member.
+    """
+    elapsed = None
+    if duration_sec:
+        elapsed = f"{duration_sec}s"
+    elif time_ms:
+        elapsed = f"{time_ms / 1000:.1f}s"
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return json.dumps({
+        "id": ref,
+        "uid": user_id,
+        "u": username or "Anonymous",
+        "e": elapsed,
+        "n": f"{found_count}/{total_words} words" if total_words else "",
+        "t": created_at.isoformat() if created_at else None,
+    }, separators=(",", ":"))
+
+class ScoreBoards:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, score boards will query the database")
+
+    def key_board(self, mode: str, day: Optional[date] = None) -> str:
+        """ZSET of the best scores for a mode: all-time, or on one (UTC) day"""
+        return f"topn:{mode}:{day.isoformat() if day else 'all'}"
+
+    def key_built(self, mode: str, day: Optional[date] = None) -> str:
+        """Marker set once a board has been seeded from the database"""
+        return f"{self.key_board(mode, day)}:built"
+
+    def _query(self, mode: str, day: Optional[date], n: int = BOARD_SIZE) -> List[tuple]:
+        if day:
+            # Half-open timestamp range keeps the scores (mode, created_at) index usable
+            where = "AND s.points > 0 AND s.created_at >= :start AND s.created_at < :end"
+            params = {"mode": mode, "n": n, "start": datetime.combine(day, datetime.min.time()),
+                      "end": datetime.combine(day + timedelta(days=1), datetime.min.time())}
+        else:
+            where, params = "", {"mode": mode, "n": n}
+        return db.session.execute(text(TOP_SQL.format(where=where)), params).fetchall()
+
+    def _rebuild(self, mode: str, day: Optional[date]) -> List[tuple]:
+        rows = self._query(mode, day)
+        key = self.key_board(mode, day)
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        if rows:
+            pipe.zadd(key, {_entry(*r): r[3] or 0 for r in rows})
+        pipe.set(self.key_built(mode, day), 1)
+        if day:
+            pipe.expire(key, DAILY_BOARD_TTL_SEC)
+            pipe.expire(self.key_built(mode, day), DAILY_BOARD_TTL_SEC)
+        pipe.execute()
+        return [(_entry(*r), r[3] or 0) for r in rows]
+
+    def record(self, scores: List[Dict[str, Any]]):
+        """Fold newly inserted scores (score ingest records) into their boards."""
+        if not self.redis_available or not scores:
+            return
+        touched = set()
+        pipe = self.redis.pipeline(transaction=False)
+        for s in scores:
+            if s.get("mode") not in MODES:
+                continue
+            created_at = datetime.fromisoformat(s["created_at"])
+            member = _entry(s["key"], s["user_id"], s.get("username") or s.get("display_name"), s["points"],
+                            s["duration_sec"], None, s["found_count"], s["total_words"], created_at)
+            pipe.zadd(self.key_board(s["mode"]), {member: s["points"]})
+            touched.add((s["mode"], None))
+            if s["points"] > 0:
+                pipe.zadd(self.key_board(s["mode"], created_at.date()), {member: s["points"]})
+                touched.add((s["mode"], created_at.date()))
+        for mode, day in touched:
+            pipe.zremrangebyrank(self.key_board(mode, day), 0, -(BOARD_SIZE + 1))
+            if day:
+                pipe.expire(self.key_board(mode, day), DAILY_BOARD_TTL_SEC)
+        pipe.execute()
+
+    def boards(self, day: Optional[date] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """{mode: [{"email", "score", "elapsed", "note", "created_at"}]} for the all-time or daily page"""
+        # Only the days the page links to are materialized; older days are queried directly
+        if self.redis_available and (day is None or abs((date.today() - day).days) <= DAILY_BOARD_DAYS):
+            pipe = self.redis.pipeline(transaction=False)
+            for mode in MODES:
+                pipe.zrevrange(self.key_board(mode, day), 0, BOARD_SIZE - 1, withscores=True)
+                pipe.exists(self.key_built(mode, day))
+            replies = pipe.execute()
+            raw = {}
+            for i, mode in enumerate(MODES):
+                rows, built = replies[2 * i], replies[2 * i + 1]
+                raw[mode] = rows if built else self._rebuild(mode, day)
+        else:
+            raw = {mode: [(_entry(*r), r[3] or 0) for r in self._query(mode, day)] for mode in MODES}
+
+        fmt = "%H:%M" if day else "%Y-%m-%d"
+        leaders = {}
+        for mode, rows in raw.items():
+            leaders[mode] = []
+            for member, points in rows:
+                e = json.loads(member)
+                leaders[mode].append({
+                    'email': e["u"],
+                    'score': int(points),
+                    'elapsed': e["e"],
+                    'note': e["n"],
+                    'created_at': datetime.fromisoformat(e["t"]).strftime(fmt) if e["t"] else 'N/A'
+                })
+        return leaders
+
+# Global instance
+score_boards = ScoreBoards()
@@ -0,0 +1,96 @@
+"""
+Word finder score distribution
+A bucketed histogram of leaderboard scores per (mode, season), with '*' rows
+for all modes and for all time, so percentile and histogram queries read at
+most a few hundred bucket rows however many games have been played.
+apply_scores() runs inside the score ingest transaction; rebuild() recomputes
+the table from scores for the stats.histogram CLI command.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Dict, List, Any
+from sqlalchemy import text
+
+from models import db
+from services.leaderboard import leaderboard_service
+from services.leaderboard_local import bucket_edges
+
+HIST_BUCKET = 100  # leaderboard points per stored bucket
+ALL = "*"
+
+UPSERT_SQL = """
+  INSERT INTO score_histogram (mode, season_id, bucket, count)
+  VALUES (:mode, :season_id, :bucket, :count)
+  ON CONFLICT (mode, season_id, bucket) DO UPDATE SET count = score_histogram.count + EXCLUDED.count
+"""
+
+def leaderboard_score(found_count: int, duration_sec: Optional[int]) -> int:
+    """As /api/score computes it: found_count * 1000 + time bonus (max 300)"""
+    return found_count * 1000 + max(0, 300 - (duration_sec or 0) // 2)
+
+def _count(counts: Counter, mode: Optional[str], played: datetime, score: int):
+    season = leaderboard_service.iso_week_season(played)
+    for m in {mode or ALL, ALL}:
+        for s in (season, ALL):
+            counts[(m, s, score // HIST_BUCKET)] += 1
+
+def _upsert(counts: Counter):
+    if counts:
+        db.session.execute(text(UPSERT_SQL), [
+            {"mode": m, "season_id": s, "bucket": b, "count": n} for (m, s, b), n in counts.items()
+        ])
+
+def apply_scores(records: List[Dict[str, Any]]):
+    """Count completed score ingest records. Call inside the transaction that inserts them."""
+    counts = Counter()
+    for r in records:
+        if r["completed"]:
+            _count(counts, r.get("mode"), datetime.fromisoformat(r["created_at"]), r["leaderboard_score"])
+    _upsert(counts)
+
+def rebuild() -> int:
+    """Replace the histogram with a fresh count over completed scores. Returns scores counted."""
+    counts, n = Counter(), 0
+    rows = db.session.execute(
+        text("SELECT mode, found_count, duration_sec, created_at FROM scores WHERE completed"),
+        execution_options={"stream_results": True}
+    )
+    for mode, found_count, duration_sec, created_at in rows:
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        _count(counts, mode, created_at, leaderboard_score(found_count or 0, duration_sec))
+        n += 1
+    db.session.execute(text("DELETE FROM score_histogram"))
+    _upsert(counts)
+    db.session.commit()
+    return n
+
+def distribution(mode: str = ALL, season_id: str = ALL, score: Optional[int] = None,
+                 buckets: int = 10) -> Dict[str, Any]:
+    """
+    Percentile of score among every completed game in (mode, season), plus a histogram
+    Figures inside a stored bucket are interpolated, so they are exact to HIST_BUCKET points.
+    Returns: {"games", "percentile", "top_percent", "bucket_width", "histogram": [{"min", "max", "count"}]}
+    """
+    rows = db.session.execute(
+        text("SELECT bucket, count FROM score_histogram WHERE mode = :m AND season_id = :s ORDER BY bucket"),
+        {"m": mode, "s": season_id}
+    ).fetchall()
+    counts = {int(b): int(c) for b, c in rows}
+    total = sum(counts.values())
+    out = {"games": total, "percentile": None, "top_percent": None, "bucket_width": HIST_BUCKET, "histogram": []}
+    if not total:
+        return out
+
+    # Merge stored buckets into at most `buckets` display buckets of whole stored buckets
+    for a, b in bucket_edges(min(counts), max(counts), buckets):
+        out["histogram"].append({"min": a * HIST_BUCKET, "max": (b + 1) * HIST_BUCKET - 1,
+                                 "count": sum(counts.get(i, 0) for i in range(a, b + 1))})
+
+    if score is not None:
+        mine, offset = divmod(score, HIST_BUCKET)
+        inside = counts.get(mine, 0)
+        below = sum(c for b, c in counts.items() if b < mine) + inside * offset / HIST_BUCKET
+        out["percentile"] = round(100.0 * below / total, 1)
+        out["top_percent"] = round(100.0 * (total - below) / total, 1)
+    return out
@@ -0,0 +1,282 @@
+"""
+Write-behind score ingestion for /api/score
+The request validates a submission and pushes it onto a Redis list; a
+background worker drains the list in batches and writes scores, puzzle plays,
+usage counts and leaderboard updates with one transaction and a few pipelines
+per batch, keeping the user_score_stats rollup and score_histogram current
+in the same transaction. Every submission carries an idempotency key, checked in Redis at
+enqueue time and enforced in the database by score_submissions. play.js sends
+a per-game key; without one, identical results only count as duplicates
+within INGEST_DEDUPE_WINDOW_SEC, so a later game with the same result is kept.
+Without Redis the same batch path runs synchronously inside the request.
+A drainer claims a batch by moving it atomically onto a processing list and
+removes it from there once written, so a batch is never lost or trimmed
+unprocessed; a batch left behind by a drainer that died or overran its lock
+is written again, which score_submissions turns into a no-op.
+"""
+import os, json, time, hashlib
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Dict, List, Any
+import redis
+from sqlalchemy import text
+
+from models import db
+from services import redis_lock
+
+INGEST_BATCH = int(os.getenv("SCORE_INGEST_BATCH", "200"))             # submissions written per transaction
+INGEST_IDEM_TTL_SEC = int(os.getenv("SCORE_INGEST_IDEM_TTL_SEC", "86400"))
+INGEST_DEDUPE_WINDOW_SEC = int(os.getenv("SCORE_INGEST_DEDUPE_WINDOW_SEC", "120"))  # keyless resubmits
+INGEST_LOCK_SEC = 60
+LEADERBOARD_GAME = "mini_word_finder"
+
+# Move up to ARGV[1] submissions from the queue (KEYS[1]) to the processing list (KEYS[2])
+CLAIM_LUA = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+  redis.call('LTRIM', KEYS[1], #items, -1)
+  redis.call('RPUSH', KEYS[2], unpack(items))
+end
+return items
+"""
+
+# Drop written submissions (ARGV) from the processing list (KEYS[1])
+ACK_LUA = """
+for _, item in ipairs(ARGV) do
+  redis.call('LREM', KEYS[1], 1, item)
+end
+return #ARGV
+"""
+
+SCORE_COLUMNS = ("user_id", "mode", "found_count", "total_words", "duration_sec", "completed",
+                 "seed", "category", "hints_used", "puzzle_id", "points", "created_at")
+
+def _values_sql(n: int, cols) -> str:
+    """'(:c_0, :d_0), (:c_1, :d_1), ...' placeholders for a multi-row VALUES list"""
+    return ", ".join("(" + ", ".join(f":{c}_{i}" for c in cols) + ")" for i in range(n))
+
+def _values_params(rows: List[Dict[str, Any]], cols) -> Dict[str, Any]:
+    return {f"{c}_{i}": row[c] for i, row in enumerate(rows) for c in cols}
+
+def submission_key(user_id: int, payload: Dict[str, Any], client_key: Optional[str] = None,
+                   now: Optional[float] = None) -> str:
+    """Idempotency key: the client's key if it sent one, else a hash of the submission
+    and the INGEST_DEDUPE_WINDOW_SEC window it arrived in"""
+    if client_key:
+        raw = f"{user_id}|client|{client_key}"
+    else:
+        fields = ("mode", "daily", "category", "seed", "puzzle_id", "found_count",
+                  "total_words", "duration_sec", "hints_used", "completed")
+        window = int((now if now is not None else time.time()) // INGEST_DEDUPE_WINDOW_SEC)
+        raw = f"{user_id}|{window}|" + json.dumps([payload.get(f) for f in fields], default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:40]
+
+class ScoreIngest:
+    def __init__(self):
+        # Use existing Redis configuration
+        redis_url = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+        try:
+            self.redis = redis.from_url(redis_url, decode_responses=True)
+            # Test connection
+            self.redis.ping()
+            self.redis_available = True
+        except Exception:
+            self.redis = None
+            self.redis_available = False
+            print("Warning: Redis not available, scores will be written synchronously")
+
+        self._claim_script = self.redis.register_script(CLAIM_LUA) if self.redis else None
+        self._ack_script = self.redis.register_script(ACK_LUA) if self.redis else None
+
+    def key_queue(self) -> str:
+        """LIST of JSON-encoded submissions waiting to be written"""
+        return "scores:queue"
+
+    def key_processing(self) -> str:
+        """LIST of submissions claimed by a drainer and not yet written"""
+        return "scores:processing"
+
+    def key_dead(self) -> str:
+        """LIST of submissions that failed on their own after a batch failure"""
+        return "scores:dead"
+
+    def key_idem(self, key: str) -> str:
+        return f"scores:idem:{key}"
+
+    def key_lock(self) -> str:
+        return "scores:lock"
+
+    def submit(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one validated submission (record must include 'key').
+
+        Returns {"ok", "queued", "duplicate", "redis_leaderboard"}. For a
+        queued completed game the leaderboard result is the provisional rank
+        the score will give once written.
+        """
+        if self.redis_available:
+            try:
+                if not self.redis.set(self.key_idem(record["key"]), 1, nx=True, ex=INGEST_IDEM_TTL_SEC):
+                    return {"ok": True, "queued": False, "duplicate": True, "redis_leaderboard": None}
+                self.redis.rpush(self.key_queue(), json.dumps(record))
+                return {"ok": True, "queued": True, "duplicate": False,
+                        "redis_leaderboard": self._projected_rank(record)}
+            except Exception as e:
+                print(f"Warning: score queue unavailable, writing synchronously: {e}")
+
+        results = self.write_batch([record])
+        return {"ok": True, "queued": False, "duplicate": record["key"] not in results,
+                "redis_leaderboard": results.get(record["key"])}
+
+    @staticmethod
+    def _projected_rank(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not record["completed"]:
+            return None
+        try:
+            from services.leaderboard import leaderboard_service
+            return leaderboard_service.projected_rank(LEADERBOARD_GAME, record["user_id"],
+                                                      record["leaderboard_score"])
+        except Exception as e:
+            print(f"Warning: Could not read projected leaderboard rank: {e}")
+            return None
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write a batch in one transaction, then apply side effects.
+
+        Submissions already recorded in score_submissions are skipped.
+        Returns {submission key: leaderboard result or None} for the
+        submissions written by this call.
+        """
+        # Deduplicate within the batch, then against the database
+        records = list({r["key"]: r for r in records}.values())
+        now = datetime.utcnow()
+        subs = [{"submission_key": r["key"], "user_id": r["user_id"], "created_at": now} for r in records]
+        cols = ("submission_key", "user_id", "created_at")
+        fresh = {row[0] for row in db.session.execute(
+            text(f"INSERT INTO score_submissions ({', '.join(cols)}) VALUES {_values_sql(len(subs), cols)} "
+                 f"ON CONFLICT (submission_key) DO NOTHING RETURNING submission_key"),
+            _values_params(subs, cols)
+        ).fetchall()}
+        records = [r for r in records if r["key"] in fresh]
+        if not records:
+            db.session.commit()
+            return {}
+
+        scores = [dict(r, created_at=datetime.fromisoformat(r["created_at"])) for r in records]
+        db.session.execute(
+            text(f"INSERT INTO scores ({', '.join(SCORE_COLUMNS)}) VALUES {_values_sql(len(scores), SCORE_COLUMNS)}"),
+            _values_params(scores, SCORE_COLUMNS)
+        )
+
+        # Only submissions for an active template count as played; records queued
+        # before played_puzzle_id existed carried the checked id in puzzle_id
+        plays = {(r["user_id"], r.get("played_puzzle_id", r.get("puzzle_id"))) for r in records}
+        plays = {(u, p) for u, p in plays if p}
+        if plays:
+            play_rows = [{"user_id": u, "puzzle_id": p, "played_at": now} for u, p in plays]
+            pcols = ("user_id", "puzzle_id", "played_at")
+            db.session.execute(
+                text(f"INSERT INTO puzzle_plays ({', '.join(pcols)}) VALUES {_values_sql(len(play_rows), pcols)} "
+                     f"ON CONFLICT (user_id, puzzle_id) DO NOTHING"),
+                _values_params(play_rows, pcols)
+            )
+        from services import score_stats, score_distribution
+        score_stats.apply_scores(records)
+        score_distribution.apply_scores(records)
+        db.session.commit()
+
+        # Side effects outside the transaction; none of them may fail the batch
+        completed = [r for r in records if r["completed"]]
+        counted = [r for r in records if (r.get("found_count") or 0) > 0]
+        if counted:
+            from services.board_versions import board_versions
+            board_versions.bump(["word_finder:*"] + [f"word_finder:{r['mode']}" for r in counted if r.get("mode")])
+        try:
+            from services.score_boards import score_boards
+            score_boards.record(records)
+        except Exception as e:
+            print(f"Warning: Could not update score boards: {e}")
+        if plays:
+            from services.played_sets import played_sets
+            for user_id, puzzle_id in plays:
+                played_sets.mark(user_id, puzzle_id)
+        if completed:
+            try:
+                from modules.game.usage_tracker import GameUsageTracker
+                GameUsageTracker().record_usage_many(Counter(r["user_id"] for r in completed), 'word_finder')
+            except Exception as e:
+                print(f"[WARNING] Failed to record usage: {e}")
+
+        results: Dict[str, Any] = {r["key"]: None for r in records}
+        if completed:
+            try:
+                from services.leaderboard import leaderboard_service
+                lb = leaderboard_service.submit_scores(
+                    LEADERBOARD_GAME,
+                    [(r["user_id"], r["display_name"], r["leaderboard_score"]) for r in completed]
+                )
+                for r in completed:
+                    results[r["key"]] = lb.get(str(r["user_id"]))
+            except Exception as e:
+                # Don't fail score ingestion if Redis fails
+                print(f"Warning: Could not submit to Redis leaderboard: {e}")
+        return results
+
+    def drain(self, max_batches: int = 10) -> int:
+        """Write queued submissions in batches. Returns the number of submissions processed."""
+        if not self.redis_available:
+            return 0
+        # One drainer at a time; the processing list keeps batches safe if the lock expires mid-batch
+        token = redis_lock.acquire(self.redis, self.key_lock(), INGEST_LOCK_SEC)
+        if not token:
+            return 0
+        done = 0
+        try:
+            for _ in range(max_batches):
+                # Finish a batch left claimed by a drainer that died first, else claim a new one
+                raw = (self.redis.lrange(self.key_processing(), 0, INGEST_BATCH - 1)
+                       or self._claim_script(keys=[self.key_queue(), self.key_processing()], args=[INGEST_BATCH]))
+                if not raw:
+                    break
+                records = [json.loads(r) for r in raw]
+                try:
+                    self.write_batch(records)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Score ingest batch of {len(records)} failed, retrying one by one: {e}")
+                    self._write_each(records)
+                # Anything that failed on its own is now in the dead list; drop the batch
+                self._ack_script(keys=[self.key_processing()], args=raw)
+                done += len(raw)
+        finally:
+            redis_lock.release(self.redis, self.key_lock(), token)
+        return done
+
+    def _write_each(self, records: List[Dict[str, Any]]):
+        for record in records:
+            try:
+                self.write_batch([record])
+            except Exception as e:
+                db.session.rollback()
+                print(f"Score ingest: parking submission {record.get('key')}: {e}")
+                self.redis.rpush(self.key_dead(), json.dumps(record))
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.redis_available:
+            return {"ok": True, "backend": "sync", "queued": 0, "processing": 0, "dead": 0}
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.llen(self.key_queue())
+        pipe.llen(self.key_processing())
+        pipe.llen(self.key_dead())
+        queued, processing, dead = pipe.execute()
+        return {"ok": True, "backend": "redis", "queued": queued, "processing": processing, "dead": dead}
+
+# Global instance
+score_ingest = ScoreIngest()
+
+def drain_scores():
+    """Scheduler entry point: write queued score submissions"""
+    started = time.perf_counter()
+    n = score_ingest.drain()
+    if n:
+        print(f"Score ingest: wrote {n} submissions in {int((time.perf_counter() - started) * 1000)}ms")
+    return n
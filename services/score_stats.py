@@ -0,0 +1,106 @@
+"""
+user_score_stats rollup
+Per (user, mode) aggregates of word finder scores, plus a mode '*' row per
+user across all modes, so the public word finder leaderboards are indexed
+top-K reads instead of a GROUP BY over every score.
+apply_scores() runs inside the score ingest transaction; check()/rebuild()
+recompute the rollup from scores for the stats.check CLI command.
+"""
+from datetime import datetime
+from typing import Dict, List, Any
+from sqlalchemy import text
+
+from models import db
+
+ALL_MODES = "*"
+
+# Scores counted by the word finder leaderboards
+COUNTED = "s.found_count > 0 AND (s.game_mode = 'mini_word_finder' OR s.game_mode IS NULL) AND s.user_id IS NOT NULL"
+
+UPSERT_SQL = """
+  INSERT INTO user_score_stats (user_id, mode, games, duration_sum, duration_count, best_time, last_played)
+  VALUES (:user_id, :mode, :games, :duration_sum, :duration_count, :best_time, :last_played)
+  ON CONFLICT (user_id, mode) DO UPDATE SET
+    games = user_score_stats.games + EXCLUDED.games,
+    duration_sum = user_score_stats.duration_sum + EXCLUDED.duration_sum,
+    duration_count = user_score_stats.duration_count + EXCLUDED.duration_count,
+    best_time = CASE
+      WHEN EXCLUDED.best_time IS NOT NULL
+           AND (user_score_stats.best_time IS NULL OR EXCLUDED.best_time < user_score_stats.best_time)
+      THEN EXCLUDED.best_time ELSE user_score_stats.best_time END,
+    last_played = CASE
+      WHEN user_score_stats.last_played IS NULL OR EXCLUDED.last_played > user_score_stats.last_played
+      THEN EXCLUDED.last_played ELSE user_score_stats.last_played END
+"""
+
+AGGREGATE_SQL = f"""
+  SELECT s.user_id, s.mode, COUNT(*), COALESCE(SUM(s.duration_sec), 0), COUNT(s.duration_sec),
+         MIN(s.duration_sec), MAX(s.created_at)
+  FROM scores s
+  WHERE {COUNTED} AND s.mode IS NOT NULL
+  GROUP BY s.user_id, s.mode
+  UNION ALL
+  SELECT s.user_id, '{ALL_MODES}', COUNT(*), COALESCE(SUM(s.duration_sec), 0), COUNT(s.duration_sec),
+         MIN(s.duration_sec), MAX(s.created_at)
+  FROM scores s
+  WHERE {COUNTED}
+  GROUP BY s.user_id
+"""
+
+STATS_COLUMNS = ("user_id", "mode", "games", "duration_sum", "duration_count", "best_time", "last_played")
+
+def apply_scores(records: List[Dict[str, Any]]):
+    """Fold score ingest records into the rollup. Call inside the transaction that inserts them."""
+    deltas: Dict[tuple, Dict[str, Any]] = {}
+    for r in records:
+        if not r.get("found_count") or r["found_count"] <= 0:
+            continue
+        played = datetime.fromisoformat(r["created_at"])
+        duration = r.get("duration_sec")
+        for mode in ([r["mode"]] if r.get("mode") else []) + [ALL_MODES]:
+            d = deltas.setdefault((r["user_id"], mode), {
+                "user_id": r["user_id"], "mode": mode, "games": 0, "duration_sum": 0,
+                "duration_count": 0, "best_time": None, "last_played": played
+            })
+            d["games"] += 1
+            if duration is not None:
+                d["duration_sum"] += duration
+                d["duration_count"] += 1
+                d["best_time"] = duration if d["best_time"] is None else min(d["best_time"], duration)
+            d["last_played"] = max(d["last_played"], played)
+    if deltas:
+        db.session.execute(text(UPSERT_SQL), list(deltas.values()))
+
+def _normalize(row) -> tuple:
+    # SQLite hands back timestamps from aggregates as strings
+    row = tuple(row)
+    played = row[6]
+    if isinstance(played, str):
+        played = datetime.fromisoformat(played)
+    return row[:6] + (played.replace(microsecond=0) if played else None,)
+
+def check() -> Dict[str, Any]:
+    """Compare the rollup with a fresh aggregate over scores (read-only)."""
+    expected = {(r[0], r[1]): _normalize(r) for r in db.session.execute(text(AGGREGATE_SQL))}
+    actual = {(r[0], r[1]): _normalize(r) for r in db.session.execute(
+        text(f"SELECT {', '.join(STATS_COLUMNS)} FROM user_score_stats"))}
+    missing = [k for k in expected if k not in actual]
+    extra = [k for k in actual if k not in expected]
+    different = [k for k in expected if k in actual and expected[k] != actual[k]]
+    return {
+        "ok": not (missing or extra or different),
+        "rows": len(expected),
+        "missing": len(missing),
+        "extra": len(extra),
+        "different": len(different),
+        "sample": [list(k) for k in (missing + extra + different)[:10]]
+    }
+
+def rebuild() -> int:
+    """Replace the rollup with a fresh aggregate over scores. Returns rows written."""
+    db.session.execute(text("DELETE FROM user_score_stats"))
+    result = db.session.execute(text(
+        f"INSERT INTO user_score_stats ({', '.join(STATS_COLUMNS)}) {AGGREGATE_SQL}"
+    ))
+    db.session.commit()
+    return result.rowcount
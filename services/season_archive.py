@@ -0,0 +1,184 @@
+"""
+Season archive for the Redis leaderboard
+Weekly seasons (lb:{game}:{season} + user:{game}:{season}) are only written
+while they are current. Once a season has ended, the rollover job snapshots
+its final standings into leaderboard_season_entries, then puts a TTL on the
+Redis keys so old seasons stop accumulating on the hot instance. Reads for
+archived seasons are served from the snapshot tables.
+Games to roll over come from the `games` set the leaderboard service keeps.
+"""
+import os, time
+from datetime import datetime
+from typing import Optional, Dict, List, Any
+from sqlalchemy import text
+
+from models import db
+from services.leaderboard import leaderboard_service
+from services import redis_lock
+
+SEASON_KEY_TTL_SEC = int(os.getenv("LEADERBOARD_SEASON_TTL_SEC", str(7 * 24 * 3600)))  # grace after archiving
+ARCHIVE_CHUNK = 1000                                                                   # standings read/written per step
+ARCHIVE_LOCK_SEC = 600
+
+class SeasonArchive:
+    def __init__(self, leaderboard):
+        self.lb = leaderboard
+        self._archived = set()  # (game_code, season_id) known to be archived; snapshots never change
+
+    def key_lock(self) -> str:
+        return "lb:archive:lock"
+
+    def is_archived(self, game_code: str, season_id: str) -> bool:
+        if (game_code, season_id) in self._archived:
+            return True
+        found = db.session.execute(
+            text("SELECT 1 FROM leaderboard_seasons WHERE game_code = :g AND season_id = :s"),
+            {"g": game_code, "s": season_id}
+        ).first() is not None
+        if found:
+            self._archived.add((game_code, season_id))
+        return found
+
+    def ended_seasons(self, game_code: str) -> List[str]:
+        """Seasons of game_code still in Redis that are older than the current week"""
+        current = self.lb.iso_week_season()
+        seasons = set()
+        for key in self.lb.redis.scan_iter(match=self.lb.key_lb(game_code, "*"), count=500):
+            season_id = key.rsplit(":", 1)[1]
+            if season_id < current:
+                seasons.add(season_id)
+        return sorted(seasons)
+
+    def archive_season(self, game_code: str, season_id: str) -> Optional[int]:
+        """Snapshot one ended season and expire its Redis keys.
+
+        Returns the number of players archived, or None if the season was
+        already archived (its keys still get their TTL, in case an earlier
+        run stopped between the commit and the EXPIRE).
+        """
+        r = self.lb.redis
+        zkey = self.lb.key_lb(game_code, season_id)
+        ukey = self.lb.key_user(game_code, season_id)
+        players = None
+        if not self.is_archived(game_code, season_id):
+            players = 0
+            while True:
+                page = r.zrevrange(zkey, players, players + ARCHIVE_CHUNK - 1, withscores=True)
+                if not page:
+                    break
+                names = r.hmget(ukey, [uid for uid, _ in page])
+                db.session.execute(
+                    text("INSERT INTO leaderboard_season_entries "
+                         "(game_code, season_id, rank, user_id, display_name, score) "
+                         "VALUES (:g, :s, :rank, :uid, :name, :score)"),
+                    [{"g": game_code, "s": season_id, "rank": players + i + 1, "uid": uid,
+                      "name": name, "score": int(sc)} for i, ((uid, sc), name) in enumerate(zip(page, names))]
+                )
+                players += len(page)
+            db.session.execute(
+                text("INSERT INTO leaderboard_seasons (game_code, season_id, players, archived_at) "
+                     "VALUES (:g, :s, :players, :now)"),
+                {"g": game_code, "s": season_id, "players": players, "now": datetime.utcnow()}
+            )
+            db.session.commit()
+            self._archived.add((game_code, season_id))
+
+        # Only keys without a TTL yet, so reruns don't keep pushing the expiry out
+        pipe = r.pipeline(transaction=False)
+        for key in (zkey, ukey):
+            pipe.ttl(key)
+        ttls = pipe.execute()
+        pipe = r.pipeline(transaction=False)
+        for key, ttl in zip((zkey, ukey), ttls):
+            if ttl == -1:
+                pipe.expire(key, SEASON_KEY_TTL_SEC)
+        pipe.execute()
+        return players
+
+    def archive_ended(self) -> int:
+        """Archive every ended season of every registered game. Returns seasons archived."""
+        if not self.lb.redis_available:
+            return 0
+        # One archiver at a time, so two workers can't snapshot the same season twice
+        token = redis_lock.acquire(self.lb.redis, self.key_lock(), ARCHIVE_LOCK_SEC)
+        if not token:
+            return 0
+        done = 0
+        try:
+            for game_code in sorted(self.lb.redis.smembers(self.lb.key_games())):
+                for season_id in self.ended_seasons(game_code):
+                    try:
+                        if self.archive_season(game_code, season_id) is not None:
+                            done += 1
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Season archive: {game_code} {season_id} failed: {e}")
+        finally:
+            redis_lock.release(self.lb.redis, self.key_lock(), token)
+        return done
+
+    @staticmethod
+    def _rows(result, me: Optional[str] = None) -> List[Dict[str, Any]]:
+        out = []
+        for rank, uid, name, score in result:
+            row = {"rank": rank, "user_id": uid, "display_name": name or "Player", "score": int(score)}
+            if me is not None:
+                row["me"] = (uid == me)
+            out.append(row)
+        return out
+
+    def top(self, game_code: str, season_id: str, n: int) -> Optional[Dict[str, Any]]:
+        """get_top_scores-style result for an archived season, or None if it is not archived"""
+        if not self.is_archived(game_code, season_id):
+            return None
+        rows = self._rows(db.session.execute(
+            text("SELECT rank, user_id, display_name, score FROM leaderboard_season_entries "
+                 "WHERE game_code = :g AND season_id = :s AND rank <= :n ORDER BY rank"),
+            {"g": game_code, "s": season_id, "n": n}
+        ))
+        return {"ok": True, "season_id": season_id, "count": len(rows), "rows": rows, "archived": True}
+
+    def _rank(self, game_code: str, season_id: str, user_id: str):
+        return db.session.execute(
+            text("SELECT rank, score FROM leaderboard_season_entries "
+                 "WHERE game_code = :g AND season_id = :s AND user_id = :uid"),
+            {"g": game_code, "s": season_id, "uid": str(user_id)}
+        ).first()
+
+    def around(self, game_code: str, season_id: str, user_id: str, window: int) -> Optional[Dict[str, Any]]:
+        """get_around_user-style result for an archived season, or None if it is not archived"""
+        if not self.is_archived(game_code, season_id):
+            return None
+        me = self._rank(game_code, season_id, user_id)
+        if me is None:
+            return {"ok": True, "season_id": season_id, "present": False, "rows": [], "archived": True}
+        rows = self._rows(db.session.execute(
+            text("SELECT rank, user_id, display_name, score FROM leaderboard_season_entries "
+                 "WHERE game_code = :g AND season_id = :s AND rank BETWEEN :lo AND :hi ORDER BY rank"),
+            {"g": game_code, "s": season_id, "lo": me[0] - window, "hi": me[0] + window}
+        ), me=str(user_id))
+        return {"ok": True, "season_id": season_id, "present": True, "rows": rows, "archived": True}
+
+    def rank(self, game_code: str, season_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """get_user_rank-style result for an archived season, or None if it is not archived"""
+        if not self.is_archived(game_code, season_id):
+            return None
+        me = self._rank(game_code, season_id, user_id)
+        return {
+            "ok": True,
+            "season_id": season_id,
+            "rank": me[0] if me else None,
+            "score": int(me[1]) if me else None,
+            "archived": True
+        }
+
+# Global instance
+season_archive = SeasonArchive(leaderboard_service)
+
+def archive_seasons():
+    """Scheduler entry point: snapshot ended leaderboard seasons and expire their Redis keys"""
+    started = time.perf_counter()
+    n = season_archive.archive_ended()
+    if n:
+        print(f"Season archive: archived {n} seasons in {int((time.perf_counter() - started) * 1000)}ms")
+    return n
@@ -2,6 +2,8 @@
 War Badges Service - Manage leveled war champion badges
 """
 from models import db, User, UserBadge
+from services.board_versions import board_versions
+from services.author_cards import author_cards
 
 BADGE_CODE = "war_champion_lvl"
 LEVELS = [1, 3, 10, 25, 50]  # wins needed for Lv1..Lv5
@@ -43,6 +45,8 @@ def record_war_win(user_id: int):
                 ub.level = new_level
 
     db.session.commit()
+    board_versions.bump(["war_wins"])
+    author_cards.invalidate([user_id])
 
 def get_user_badge(user_id: int) -> dict | None:
     """
@@ -15,4 +15,7 @@ echo "=== RUNNING PRODUCTION MIGRATIONS ===" >&2
 python run_production_migration.py || echo "Migration failed but continuing..."
 
 echo "=== STARTING GUNICORN ===" >&2
-exec gunicorn wsgi:app -b 0.0.0.0:$PORT --workers 2 --threads 4 --timeout 120 --access-logfile - --error-logfile -
\ No newline at end of file
+# Live SSE streams each hold a thread (LIVE_MAX_STREAMS per worker); keep 4 for regular requests
+: "${LIVE_MAX_STREAMS:=12}"
+export LIVE_MAX_STREAMS
+exec gunicorn wsgi:app -b 0.0.0.0:$PORT --workers 2 --threads $((LIVE_MAX_STREAMS + 4)) --timeout 120 --access-logfile - --error-logfile -
\ No newline at end of file
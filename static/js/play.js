@@ -158,6 +158,12 @@ const CATEGORY = meta.dataset.category || '';
 let PUZZLE=null, FOUND=new Set(), DOWN=false, path=[], FOUND_CELLS=new Set();
 let HINTS_USED = 0; // Track number of hints used in current game
 
+// One id per game, sent with the score so retries are deduplicated but a replay with the same result is not
+function newSubmissionId() {
+  if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 // Set up puzzle ID for credits system
 window.CURRENT_PUZZLE_ID = meta.dataset.puzzleId || Math.floor(Math.random() * 1000000);
 const walletEl = document.getElementById('wallet');
@@ -211,6 +217,7 @@ async function saveGameState() {
     puzzle: {
       puzzle_id: PUZZLE?.puzzle_id ?? window.CURRENT_PUZZLE_ID ?? 'unknown',
       seed: PUZZLE?.seed ?? null,
+      submission_id: PUZZLE?.submission_id ?? null,
       // Store the full puzzle data for reconstruction
       grid: PUZZLE.grid,
       words: PUZZLE.words,
@@ -277,6 +284,7 @@ function restoreGameState(gameState) {
   }
 
   PUZZLE = gameState.puzzle;
+  PUZZLE.submission_id = PUZZLE.submission_id || newSubmissionId();
   FOUND = new Set(gameState.found || []);
   FOUND_CELLS = new Set(gameState.found_cells || []);
   T0 = gameState.started_at;
@@ -758,6 +766,7 @@ async function loadPuzzle(){
   if (CATEGORY) q.set('category', CATEGORY);
   const res = await fetch(`/api/puzzle?${q}`, { credentials:'include' });
   PUZZLE = await res.json();
+  PUZZLE.submission_id = newSubmissionId();
 
   // If this is the same puzzle we completed before, offer to continue to next game
   if (completedPuzzleId && PUZZLE.puzzle_id === completedPuzzleId) {
@@ -846,7 +855,8 @@ async function finish(completed){
     total_words: PUZZLE.words.length, found_count: FOUND.size,
     duration_sec: elapsedTime, completed: Boolean(completed),
     seed: PUZZLE.seed, category: CATEGORY || null,
-    hints_used: HINTS_USED, puzzle_id: PUZZLE.puzzle_id || null
+    hints_used: HINTS_USED, puzzle_id: PUZZLE.puzzle_id || null,
+    submission_id: PUZZLE.submission_id
   };
   let scoreResult = null;
   try{
@@ -854,7 +864,8 @@ async function finish(completed){
       method:'POST',
       headers:{
         'Content-Type':'application/json',
-        'X-CSRF-Token': document.querySelector('meta[name="csrf-token"]')?.getAttribute('content')
+        'X-CSRF-Token': document.querySelector('meta[name="csrf-token"]')?.getAttribute('content'),
+        'Idempotency-Key': PUZZLE.submission_id
       },
       credentials:'include',
       body: JSON.stringify(body)
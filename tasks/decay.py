@@ -1,59 +0,0 @@
-"""
-Boost Decay Task - Gradually reduce boost scores over time
-"""
-from models import db
-from sqlalchemy import text
-
-DECAY_STEP_MIN = 18  # Decay 1 point every 18 minutes
-
-def decay_boosts_step():
-    """
-    Decay boost scores by 1 point for posts that haven't been boosted recently
-
-    This runs periodically to create natural decay in the boost system.
-    Posts lose 1 boost point every DECAY_STEP_MIN minutes of inactivity.
-    """
-    try:
-        # Use SQLAlchemy for database-agnostic datetime operations
-        from datetime import datetime, timedelta
-        cutoff_time = datetime.utcnow() - timedelta(minutes=DECAY_STEP_MIN)
-
-        # Update posts that are due for decay (database-agnostic)
-        sql = """
-        UPDATE posts
-        SET boost_score = CASE
-            WHEN boost_score > 0 THEN boost_score - 1
-            ELSE 0
-        END,
-        last_boost_at = :now_time
-        WHERE boost_score > 0
-          AND (last_boost_at IS NULL OR last_boost_at <= :cutoff_time)
-        """
-
-        result = db.session.execute(text(sql), {
-            'now_time': datetime.utcnow(),
-            'cutoff_time': cutoff_time
-        })
-        rows_updated = result.rowcount
-        db.session.commit()
-
-        if rows_updated > 0:
-            print(f"Decayed {rows_updated} posts by 1 boost point")
-
-        return rows_updated
-
-    except Exception as e:
-        print(f"Error in boost decay: {e}")
-        db.session.rollback()
-        return 0
-
-def get_decay_info():
-    """Get information about the decay system"""
-    return {
-        "decay_step_minutes": DECAY_STEP_MIN,
-        "description": f"Posts lose 1 boost point every {DECAY_STEP_MIN} minutes of inactivity"
-    }
-
-def run_decay_task():
-    """Main entry point for the decay task - called by scheduler"""
-    return decay_boosts_step()
\ No newline at end of file
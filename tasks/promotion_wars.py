@@ -4,6 +4,8 @@ from datetime import datetime, timezone, timedelta
 import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from services.board_versions import board_versions
+from services.author_cards import author_cards
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -23,6 +25,7 @@ def finalize_due_wars():
             FOR UPDATE SKIP LOCKED
         """, (now,))
         wars = cur.fetchall()
+        winners = []
 
         for war in wars:
             war_id = war["id"]
@@ -91,8 +94,12 @@ def finalize_due_wars():
                 cur.execute("""
                     UPDATE users SET war_wins = COALESCE(war_wins, 0) + 1 WHERE id = %s
                 """, (winner_id,))
+                winners.append(winner_id)
 
         conn.commit()
+    if wars:
+        board_versions.bump(["war_wins"])
+        author_cards.invalidate(winners)
     return {"finalized": len(wars)}
 
 @celery.task(name="tasks.promotion_wars.notify_expiring_effects")
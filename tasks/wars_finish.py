@@ -4,6 +4,8 @@ Wars Finish Task - Close expired wars and award winners with penalty system
 from datetime import datetime, timedelta
 from models import db, BoostWar, Post, User, BoostWarAction
 from services.war_badges import record_war_win
+from services.boost_decay import add_boost, set_boost
+from services.ranked_feed import ranked_feed
 from promotion_war_service import PromotionWarService
 import logging
 
@@ -34,6 +36,7 @@ def close_expired_wars_and_award():
                 .all())
 
         wars_closed = 0
+        rescored_posts = []  # re-ranked in the Redis feed once committed
 
         for war in wars:
             logger.info(f"Processing expired war {war.id}")
@@ -76,7 +79,8 @@ def close_expired_wars_and_award():
                     challenged_post = Post.query.get(war.challenged_post_id)
                     if challenged_post:
                         net_boost = challenger_net_score - challenged_net_score
-                        challenged_post.boost_score = (challenged_post.boost_score or 0) + net_boost
+                        add_boost(challenged_post, net_boost)
+                        rescored_posts.append(challenged_post)
                         logger.info(f"War {war.id}: Added {net_boost} boost to post {war.challenged_post_id}")
 
                 # Penalty: Challenger gets 24hr challenge penalty
@@ -93,7 +97,8 @@ def close_expired_wars_and_award():
                 if war.challenger_post_id:
                     challenger_post = Post.query.get(war.challenger_post_id)
                     if challenger_post:
-                        challenger_post.boost_score = 0
+                        set_boost(challenger_post, 0)
+                        rescored_posts.append(challenger_post)
                         challenger_post.boost_cooldown_until = penalty_until
                         logger.info(f"War {war.id}: Reset post {war.challenger_post_id} boost to 0 with 24hr cooldown")
 
@@ -122,6 +127,7 @@ def close_expired_wars_and_award():
 
         if wars_closed > 0:
             db.session.commit()
+            ranked_feed.update(rescored_posts)
             print(f"Closed {wars_closed} expired wars")
 
         return wars_closed
@@ -0,0 +1,41 @@
+"""
+Shared fixtures for the unit tests under tests/: an app on an in-memory database,
+a seeded user, and Redis-backed services built without connecting to Redis.
+"""
+
+import pytest
+from flask import Flask
+
+from models import db, User
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+@pytest.fixture
+def user(app):
+    u = User(id=1, email="u1@example.com", password_hash="x", username="user1")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+@pytest.fixture
+def service():
+    """Factory for a service that skips its Redis connect: Redis is off, or a fresh
+    fakeredis when fake_redis=True (the test is skipped if fakeredis is missing)."""
+    def make(cls, fake_redis=False, decode_responses=True):
+        svc = cls.__new__(cls)
+        svc.redis, svc.redis_available = None, False
+        if fake_redis:
+            fakeredis = pytest.importorskip("fakeredis")
+            svc.redis, svc.redis_available = fakeredis.FakeRedis(decode_responses=decode_responses), True
+        return svc
+    return make
@@ -0,0 +1,49 @@
+"""
+Unit tests for closed-form boost decay and the boost-ranked feed order.
+
+Run with: python -m pytest tests/test_boost_decay.py
+"""
+
+from datetime import datetime, timedelta
+
+from models import db, Post
+from services.boost_decay import DECAY_STEP, add_boost, set_boost, effective_boost, ranked_posts
+
+T0 = datetime(2026, 10, 17, 12, 0)
+
+
+class TestBoostDecay:
+    def test_loses_one_point_per_step(self):
+        post = Post()
+        set_boost(post, 3, T0)
+        assert effective_boost(post, T0) == 3
+        assert effective_boost(post, T0 + DECAY_STEP - timedelta(seconds=1)) == 3
+        assert effective_boost(post, T0 + DECAY_STEP) == 2
+        assert effective_boost(post, T0 + 3 * DECAY_STEP) == 0
+        assert effective_boost(post, T0 + 10 * DECAY_STEP) == 0
+
+    def test_add_boost_banks_the_decayed_value(self):
+        post = Post()
+        set_boost(post, 10, T0)
+        assert add_boost(post, 5, T0 + 4 * DECAY_STEP) == 11
+        assert post.boost_score == 11
+        assert add_boost(post, -50, T0 + 4 * DECAY_STEP) == 0
+        assert post.boost_decay_anchor is None
+
+    def test_ranked_posts_follow_effective_boost(self, user):
+        # 1: 10 points boosted 5 steps ago (5 left); 2: 6 points now; 3: ran out; 4: never boosted
+        posts = {pid: Post(id=pid, user_id=1, body="", created_at=T0 - timedelta(days=1, minutes=pid))
+                 for pid in (1, 2, 3, 4)}
+        set_boost(posts[1], 10, T0 - 5 * DECAY_STEP)
+        set_boost(posts[2], 6, T0)
+        set_boost(posts[3], 2, T0 - 3 * DECAY_STEP)
+        posts[3].last_boost_at = T0 - 3 * DECAY_STEP
+        db.session.add_all(posts.values())
+        db.session.commit()
+
+        ranked = ranked_posts(Post.query, 10, now=T0)
+        assert [p.id for p in ranked] == [2, 1, 3, 4]
+        assert [effective_boost(p, T0) for p in ranked] == [6, 5, 0, 0]
+        assert [p.id for p in ranked_posts(Post.query, 1, now=T0)] == [2]
+        # Without any write, post 2 stays ahead: it runs out later
+        assert [p.id for p in ranked_posts(Post.query, 2, now=T0 + 4 * DECAY_STEP)] == [2, 1]
@@ -0,0 +1,96 @@
+"""
+Unit tests for community feed assembly: one query per kind of data, however many posts.
+
+Run with: python -m pytest tests/test_community_feed.py
+"""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+
+from models import db, User, Post, UserBadge
+from app.features.reactions.repo import ReactionsRepo
+from community_service import CommunityService
+from services.author_cards import AuthorCards
+
+
+@pytest.fixture
+def seeded(app):
+    for uid in (1, 2, 3):
+        db.session.add(User(id=uid, email=f"u{uid}@example.com", password_hash="x", username=f"user{uid}"))
+    db.session.flush()
+    for pid in range(1, 11):
+        # Two posts per timestamp, so pages also rely on the id tie-break
+        db.session.add(Post(id=pid, user_id=pid % 3 + 1, body=f"post {pid}",
+                            created_at=datetime(2026, 10, 17, 12, pid // 2)))
+    db.session.flush()
+    repo = ReactionsRepo(db.session)
+    for post_id, user_id, reaction_type in [(1, 1, "love"), (1, 2, "fire"), (1, 3, "love"), (2, 1, "star")]:
+        repo.insert_reaction(post_id, user_id, reaction_type)
+    db.session.add(UserBadge(user_id=2, code="war_champion_lvl", level=1))
+    db.session.commit()
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(db.engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, "before_cursor_execute", self)
+
+
+class TestCommunityFeed:
+    def test_feed_page_is_four_queries(self, seeded):
+        db.session.expire_all()
+        with _QueryCounter() as q:
+            feed, next_cursor = CommunityService.get_community_feed(user_id=1, limit=10)
+        # posts, authors, reaction counts, viewer reactions
+        assert q.count == 4
+        assert len(feed) == 10 and next_cursor is None
+
+        by_id = {fp.id: fp for fp in feed}
+        assert by_id[1].reaction_counts == {"love": 2, "fire": 1}
+        assert by_id[1].reaction_total == 3
+        assert by_id[1].user_reaction == "love"
+        assert by_id[2].user_reaction == "star"
+        assert by_id[3].reaction_total == 0 and by_id[3].user_reaction is None
+        assert by_id[1].user.username == "user2"
+
+    def test_cursor_pages_cover_feed_once(self, seeded):
+        seen, cursor = [], None
+        while True:
+            feed, cursor = CommunityService.get_community_feed(limit=3, cursor=cursor)
+            seen += [fp.id for fp in feed]
+            if cursor is None:
+                break
+        assert seen == list(range(10, 0, -1))
+
+    def test_hidden_posts_and_bad_cursor(self, seeded):
+        db.session.get(Post, 10).is_hidden = True
+        db.session.commit()
+        feed, _ = CommunityService.get_community_feed(limit=3)
+        assert [fp.id for fp in feed] == [9, 8, 7]
+        with pytest.raises(ValueError):
+            CommunityService.get_community_feed(cursor="not-a-cursor")
+
+    def test_to_dict_with_author_cards(self, seeded, service):
+        cards_svc = service(AuthorCards)
+        posts = Post.query.order_by(Post.id).all()
+        with _QueryCounter() as q:
+            cards = cards_svc.get_many(p.user_id for p in posts)
+            feed = CommunityService.assemble_feed(posts, author_cards=cards)
+        # users and badges for the cards, then reaction counts; no authors query
+        assert q.count == 3
+        first = feed[0].to_dict()
+        assert first["author"]["name"] == "user2"
+        assert first["author"]["war_badge"]["level"] == 1
+        assert first["reaction_total"] == 3 and first["user_reaction"] is None
+        assert feed[1].to_dict()["author"]["war_badge"] is None
+        assert cards_svc.get_many([99]) == {99: {"id": 99, "name": "Unknown", "avatar": None, "war_badge": None}}
@@ -0,0 +1,66 @@
+"""
+Unit tests for ETag/304 handling of public leaderboard endpoints, on the single-worker (no Redis) path.
+
+Run with: python -m pytest tests/test_http_cache.py
+"""
+
+import pytest
+from flask import Flask, jsonify
+
+import utils.http_cache as http_cache
+from utils.http_cache import conditional
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    bv = http_cache.board_versions
+    monkeypatch.setattr(bv, "redis", None)
+    monkeypatch.setattr(bv, "redis_available", False)
+    monkeypatch.setattr(bv, "_local", {})
+    return bv
+
+
+@pytest.fixture
+def client(versions):
+    app = Flask(__name__)
+    calls = []
+
+    @app.route("/board/<mode>")
+    @conditional(lambda mode: [f"word_finder:{mode}"])
+    def board(mode):
+        calls.append(mode)
+        return jsonify({"mode": mode})
+
+    c = app.test_client()
+    c.calls = calls
+    return c
+
+
+class TestConditional:
+    def test_revalidation_skips_view_until_board_changes(self, client, versions):
+        first = client.get("/board/easy")
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+        assert "s-maxage" in first.headers["Cache-Control"]
+
+        again = client.get("/board/easy", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["ETag"] == etag
+        assert client.calls == ["easy"]
+
+        versions.bump(["word_finder:hard"])
+        assert client.get("/board/easy", headers={"If-None-Match": etag}).status_code == 304
+
+        versions.bump(["word_finder:easy"])
+        changed = client.get("/board/easy", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert client.calls == ["easy", "easy"]
+
+    def test_query_string_is_part_of_the_tag(self, client):
+        etag = client.get("/board/easy").headers["ETag"]
+        assert client.get("/board/easy?n=5", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_if_modified_since(self, client, versions):
+        last_modified = client.get("/board/easy").headers["Last-Modified"]
+        assert client.get("/board/easy", headers={"If-Modified-Since": last_modified}).status_code == 304
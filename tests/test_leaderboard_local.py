@@ -0,0 +1,61 @@
+"""
+Unit tests for the in-process leaderboard used while Redis is down.
+
+Run with: python -m pytest tests/test_leaderboard_local.py
+"""
+
+from services.leaderboard_local import LocalBoard, LocalLeaderboards
+
+
+class TestLocalBoard:
+    """Ranks and pages match what the Redis ZSET would return."""
+
+    def test_keep_best_and_rank(self):
+        board = LocalBoard()
+        board.submit("a", "A", 10)
+        board.submit("b", "B", 30)
+        board.submit("a", "A", 5)
+        board.submit("c", "C", 20)
+        assert board.scores["a"] == 10
+        assert [board.rank(u) for u in "bca"] == [0, 1, 2]
+        board.submit("a", "A2", 40)
+        assert board.rank("a") == 0 and board.names["a"] == "A2"
+        assert board.rank("zz") is None
+
+    def test_ties_order_like_zrevrange(self):
+        board = LocalBoard()
+        for uid in ("a", "c", "b"):
+            board.submit(uid, uid.upper(), 10)
+        assert [r["user_id"] for r in board.page(0, 9)] == ["c", "b", "a"]
+        assert [r["rank"] for r in board.page(1, 5)] == [2, 3]
+
+    def test_count_like_zcount(self):
+        board = LocalBoard()
+        for i, score in enumerate((5, 10, 10, 20, 35)):
+            board.submit(str(i), "P", score)
+        assert board.count(10, 10) == 2
+        assert board.count(6, 34) == 3
+        assert board.count(float("-inf"), 9) == 1
+
+
+class TestLocalLeaderboards:
+    def test_submit_around_and_drain(self):
+        local = LocalLeaderboards()
+        result = local.submit("game", "2025-W38", [("1", "One", 50), ("2", "Two", 70)])
+        assert result["1"]["rank"] == 2 and result["2"]["rank"] == 1
+        assert result["1"]["fallback"] is True
+        around = local.around("game", "2025-W38", "1", 1)
+        assert [(r["user_id"], r["me"]) for r in around["rows"]] == [("2", False), ("1", True)]
+        assert local.around("game", "2025-W38", "9", 1)["present"] is False
+        assert local.user_best("game", "2")["best_all_time"] == 70
+
+        drained = local.drain()
+        assert drained == [("game", "2025-W38", [("1", "One", 50), ("2", "Two", 70)])]
+        assert local.top("game", "2025-W38", 10)["rows"] == []
+
+    def test_distribution_counts(self):
+        local = LocalLeaderboards()
+        local.submit("game", "2025-W38", [(str(i), "P", i * 10) for i in range(10)])
+        total, score, hist, below = local.distribution_counts("game", "2025-W38", "4", None, 3)
+        assert (total, score, below) == (10, 40, 4)
+        assert [(a, b, c) for a, b, c in hist] == [(0, 30, 4), (31, 61, 3), (62, 92, 3)]
@@ -0,0 +1,44 @@
+"""
+Unit tests for live event fan-out to SSE streams, on the single-worker (no Redis) path.
+
+Run with: python -m pytest tests/test_live_events.py
+"""
+
+import services.live_events as live
+from services.live_events import LiveEvents
+
+
+def _hub():
+    hub = LiveEvents()
+    hub.redis, hub.redis_available = None, False
+    return hub
+
+
+class TestLiveEvents:
+    def test_publish_reaches_subscribed_channels_only(self):
+        hub = _hub()
+        war, board = hub.subscribe(["war:1"]), hub.subscribe(["leaderboard:g"])
+        hub.publish("war:1", "war_score", {"delta": 1})
+        assert war.get(0) == 'event: war_score\ndata: {"delta": 1, "channel": "war:1"}\n\n'
+        assert board.get(0) is None
+
+    def test_stream_slots_are_capped_and_freed(self, monkeypatch):
+        monkeypatch.setattr(live, "LIVE_MAX_STREAMS", 1)
+        hub = _hub()
+        sub = hub.subscribe(["a"])
+        assert hub.subscribe(["b"]) is None
+        sub.close()
+        sub.close()
+        assert hub.stats()["streams"] == 0
+        assert hub.subscribe(["b"]) is not None
+
+    def test_stream_frames(self, monkeypatch):
+        monkeypatch.setattr(live, "LIVE_STREAM_MAX_SEC", 0.05)
+        monkeypatch.setattr(live, "LIVE_KEEPALIVE_SEC", 0.01)
+        hub = _hub()
+        sub = hub.subscribe(["a"])
+        hub.publish("a", "rank", {})
+        frames = list(hub.stream(sub))
+        assert frames[0] == "retry: 3000\n\n"
+        assert frames[1].startswith("event: rank\n")
+        assert hub.stats()["streams"] == 0
@@ -0,0 +1,21 @@
+"""
+Unit tests for played sets on the no-Redis path, where several workers share only the database.
+
+Run with: python -m pytest tests/test_played_sets.py
+"""
+
+from models import db, PuzzlePlays
+from services.played_sets import PlayedSets
+
+
+class TestPlayedSetsWithoutRedis:
+    def test_plays_written_by_one_worker_are_seen_by_another(self, app, service):
+        a, b = service(PlayedSets), service(PlayedSets)
+        assert 7 not in b.get(1)
+
+        db.session.add(PuzzlePlays(user_id=1, puzzle_id=7))
+        db.session.commit()
+        a.mark(1, 7)
+
+        assert 7 in a.get(1) and 7 in b.get(1)
+        assert b.get(1).built and 7 not in b.get(2)
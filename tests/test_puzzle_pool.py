@@ -0,0 +1,57 @@
+"""
+Unit tests for puzzle pool category registration and the refill lock.
+
+Run with: python -m pytest tests/test_puzzle_pool.py
+"""
+
+import pytest
+
+import services.puzzle_pool as puzzle_pool_mod
+from services import redis_lock
+from services.puzzle_pool import PuzzlePool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(puzzle_pool_mod, "POOL_TARGET", 2)
+    p = PuzzlePool()
+    p.redis, p.redis_available = None, False
+    return p
+
+
+@pytest.fixture
+def redis_pool(pool):
+    fakeredis = pytest.importorskip("fakeredis")
+    pool.redis, pool.redis_available = fakeredis.FakeRedis(decode_responses=True), True
+    return pool
+
+
+class TestPuzzlePool:
+    def test_only_known_categories_get_a_pool(self, pool):
+        assert pool.take("easy", "animals") is None
+        assert pool.take("easy", "no-such-category") is None
+        assert pool.take("nightmare") is None
+        assert "easy:animals" in pool.pool_names()
+        assert not any("no-such-category" in n or "nightmare" in n for n in pool.pool_names())
+
+    def test_stale_redis_names_are_dropped(self, redis_pool):
+        redis_pool.redis.sadd(redis_pool.key_pools(), "easy:junk", "easy:animals")
+        assert "easy:junk" not in redis_pool.pool_names()
+        assert redis_pool.redis.smembers(redis_pool.key_pools()) == {"easy:animals"}
+
+    def test_refill_skips_a_held_lock_and_keeps_it(self, redis_pool):
+        key = redis_pool.key_lock("easy:none")
+        token = redis_lock.acquire(redis_pool.redis, key, 60)
+        assert redis_pool.refill("easy:none") == 0
+        assert redis_pool.redis.get(key) == token
+
+        assert redis_lock.release(redis_pool.redis, key, token)
+        assert redis_pool.refill("easy:none") == 2
+        assert redis_pool.redis.get(key) is None
+
+    def test_release_needs_the_owning_token(self, redis_pool):
+        r, key = redis_pool.redis, "pool:lock:test"
+        token = redis_lock.acquire(r, key, 60)
+        assert token and redis_lock.acquire(r, key, 60) is None
+        assert not redis_lock.release(r, key, "someone-else")
+        assert r.get(key) == token
@@ -0,0 +1,180 @@
+"""
+Unit tests for the word search generator and answer-key solver.
+
+Run with: python -m pytest tests/test_puzzles.py
+"""
+
+import random
+
+import pytest
+from puzzles import (
+    BATCH_MIN_PARALLEL, DIRS, MODE_CONFIG, WORD_BANK, _build_key, _place_words, answer_path,
+    generate_puzzle, generate_puzzle_from_words, generate_puzzles_batch,
+)
+
+
+def _spell(rows, hit):
+    """Read the letters an answer-key entry points at."""
+    dr, dc = DIRS[hit["dir"]]
+    r, c = hit["start"]
+    return "".join(rows[r + dr * i][c + dc * i] for i in range(hit["len"]))
+
+
+class TestBuildKey:
+    """Test _build_key() against small hand-made grids."""
+
+    def test_all_directions(self):
+        """Each of the 8 directions is resolved with the right start cell."""
+        rows = [
+            "CAT",
+            "ODX",
+            "GXY",
+        ]
+        key = _build_key(rows, ["cat", "tac", "cog", "goc", "cdy", "ydc", "gdt", "tdg"])
+        assert key["CAT"] == {"start": [0, 0], "dir": "E", "len": 3}
+        assert key["TAC"] == {"start": [0, 2], "dir": "W", "len": 3}
+        assert key["COG"] == {"start": [0, 0], "dir": "S", "len": 3}
+        assert key["GOC"] == {"start": [2, 0], "dir": "N", "len": 3}
+        assert key["CDY"] == {"start": [0, 0], "dir": "SE", "len": 3}
+        assert key["YDC"] == {"start": [2, 2], "dir": "NW", "len": 3}
+        assert key["GDT"] == {"start": [2, 0], "dir": "NE", "len": 3}
+        assert key["TDG"] == {"start": [0, 2], "dir": "SW", "len": 3}
+
+    def test_missing_word_is_omitted(self):
+        """Words that are not in the grid get no entry."""
+        assert _build_key(["AB", "CD"], ["ZZ"]) == {}
+
+    def test_words_do_not_wrap_across_lines(self):
+        """A word may not continue from the end of one row onto the next."""
+        assert _build_key(["ABC", "DEF", "GHI"], ["CD", "FG"]) == {}
+
+    def test_first_direction_wins_for_palindromes(self):
+        """Ties resolve in DIRS order, then row-major start cell."""
+        key = _build_key(["ABA", "XXX", "ABA"], ["ABA"])
+        assert key["ABA"] == {"start": [0, 0], "dir": "E", "len": 3}
+
+
+class TestGeneratedPuzzles:
+    """Generated puzzles: answer keys must spell their words."""
+
+    @pytest.mark.parametrize("mode", list(MODE_CONFIG))
+    def test_answers_spell_words(self, mode):
+        for seed in range(20):
+            P = generate_puzzle(mode, seed=seed)
+            for word, hit in P["answers"].items():
+                assert _spell(P["grid"], hit) == word
+
+    def test_tight_word_lists_place_every_word(self):
+        """Long words that random placement used to drop are all placed."""
+        words = ["VEGETABLE", "CHOCOLATE", "BASKETBALL", "WRESTLING", "SWIMMING"]
+        for seed in range(50):
+            P = generate_puzzle_from_words("easy", words, seed=seed)
+            assert P["words"] == words
+            assert set(P["answers"]) == set(words)
+
+    def test_same_seed_same_puzzle(self):
+        """Generation stays deterministic per seed."""
+        assert generate_puzzle("hard", seed=42) == generate_puzzle("hard", seed=42)
+
+
+class TestPlaceWords:
+    """Test the backtracking placement engine directly."""
+
+    def test_impossible_board_returns_deepest_partial(self):
+        """When not every word fits, the key only lists the words placed."""
+        G, key = _place_words(3, ["ABC", "DEF", "GHI", "JKL"], random.Random(1))
+        assert len(key) == 3
+        rows = ["".join(G[r * 3:(r + 1) * 3]) for r in range(3)]
+        for word, hit in key.items():
+            assert _spell(rows, hit) == word
+
+    def test_words_never_hide_inside_longer_words(self):
+        for seed in range(200):
+            _, key = _place_words(10, ["BASEBALL", "BALL", "SOCCER", "TENNIS"], random.Random(seed))
+            cells = {w: {(p["row"], p["col"]) for p in answer_path(hit)} for w, hit in key.items()}
+            assert not cells["BALL"] <= cells["BASEBALL"], seed
+
+
+class TestGeneratePuzzlesBatch:
+    """Batch generation must match one-at-a-time generation per seed."""
+
+    def test_matches_sequential(self):
+        word_lists = [random.Random(i).sample(WORD_BANK, 5) for i in range(BATCH_MIN_PARALLEL)]
+        seeds = list(range(BATCH_MIN_PARALLEL))
+        expected = [generate_puzzle_from_words("easy", w, seed=s) for w, s in zip(word_lists, seeds)]
+        assert generate_puzzles_batch("easy", word_lists, seeds, workers=2) == expected
+        assert generate_puzzles_batch("easy", word_lists, seeds, workers=1) == expected
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            generate_puzzles_batch("easy", [["CAT"]], [1, 2])
+
+
+class TestPuzzleCache:
+    """The seed -> puzzle cache must be indistinguishable from regenerating."""
+
+    def test_hit_matches_generation(self):
+        from services.puzzle_cache import PuzzleCache
+        cache = PuzzleCache(size=4, ttl=3600)
+        first = cache.get("medium", seed=7)
+        assert first == generate_puzzle("medium", seed=7)
+        first["puzzle_id"] = None  # callers decorate the dict they get back
+        assert cache.get("medium", seed=7) == generate_puzzle("medium", seed=7)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_peek_never_generates_and_lru_evicts(self):
+        from services.puzzle_cache import PuzzleCache
+        cache = PuzzleCache(size=2, ttl=3600)
+        assert cache.peek("easy", 1) is None
+        for seed in (1, 2, 3):
+            cache.get("easy", seed=seed)
+        assert cache.peek("easy", 1) is None
+        assert cache.peek("easy", 3)["seed"] == 3
+        assert cache.peek("bogus", 3) is None
+
+    def test_expired_entries_are_dropped(self):
+        from services.puzzle_cache import PuzzleCache
+        cache = PuzzleCache(size=4, ttl=-1)
+        cache.get("easy", seed=5)
+        assert cache.peek("easy", 5) is None
+
+
+class TestPuzzleInstances:
+    """The session-side registry stores each distinct puzzle once under a short id."""
+
+    def test_roundtrip_and_content_dedupe(self, service):
+        from services.puzzle_instances import PuzzleInstances
+        registry = service(PuzzleInstances, fake_redis=True)
+        P = generate_puzzle("easy", seed=11)
+        iid = registry.register(P)
+        assert len(iid) == 16
+        assert registry.register(dict(P)) == iid
+        assert registry.register(generate_puzzle("easy", seed=12)) != iid
+        assert registry.get(iid) == P
+        assert registry.get("0" * 16) is None and registry.get(None) is None
+
+    def test_no_ids_without_redis(self, service):
+        from services.puzzle_instances import PuzzleInstances
+        registry = service(PuzzleInstances)
+        # Another worker could not resolve the id, so the caller keeps the puzzle in the session
+        assert registry.register(generate_puzzle("easy", seed=11)) is None
+
+
+class TestWordPaths:
+    """The shared reveal solver returns the cells of the answer-key entry."""
+
+    def test_paths_follow_answer_key(self):
+        from word_paths import find_word_path
+        for seed in range(20):
+            P = generate_puzzle("hard", seed=seed)
+            for word in P["words"]:
+                path = find_word_path(P["grid"], word.lower())
+                assert "".join(P["grid"][c["row"]][c["col"]] for c in path) == word
+                assert path[0] == {"row": P["answers"][word]["start"][0], "col": P["answers"][word]["start"][1]}
+
+    def test_missing_word_and_bad_grids(self):
+        from word_paths import find_word_path, index_for
+        assert find_word_path(["ABC", "DEF", "GHI"], "ZZ") is None
+        assert find_word_path([], "AB") is None
+        assert find_word_path(["ABC", "DE"], "AB") is None
+        assert index_for(["ABC", "DEF", "GHI"]) is index_for(["ABC", "DEF", "GHI"])
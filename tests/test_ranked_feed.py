@@ -0,0 +1,86 @@
+"""
+Unit tests for the Redis ranked feed: rebuild, updates, trimming and the cold-start rebuild lock.
+
+Run with: python -m pytest tests/test_ranked_feed.py
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+import services.ranked_feed as ranked_feed_mod
+from models import db, Post
+from services import redis_lock
+from services.boost_decay import ranked_posts, set_boost
+from services.ranked_feed import RankedFeed
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture
+def posts(user):
+    for pid in range(1, 9):
+        post = Post(id=pid, user_id=1, body=f"post {pid}", created_at=NOW - timedelta(hours=10 - pid))
+        if pid in (2, 5):
+            post.last_boost_at = NOW - timedelta(minutes=pid)
+            set_boost(post, 10 * pid, now=NOW - timedelta(minutes=pid))
+        if pid == 3:
+            post.last_boost_at = NOW - timedelta(days=2)  # boost long run out
+        db.session.add(post)
+    db.session.commit()
+
+
+@pytest.fixture
+def feed(posts, service):
+    return service(RankedFeed, fake_redis=True)
+
+
+def _db_order(n):
+    return [p.id for p in ranked_posts(Post.query.filter_by(is_hidden=False), n)]
+
+
+class TestRankedFeed:
+    def test_cold_read_rebuilds_and_matches_the_database(self, feed):
+        assert feed.ids(8) == _db_order(8) == [5, 2, 3, 8, 7, 6, 4, 1]
+        assert feed.redis.exists(feed.key_built())
+        assert not feed.redis.exists(feed.key_rebuild_lock())
+        assert feed.ids(3) == [5, 2, 3]
+
+    def test_update_reranks_boosted_and_hidden_posts(self, feed):
+        feed.ids(8)
+        post = db.session.get(Post, 1)
+        post.last_boost_at = datetime.utcnow()
+        set_boost(post, 100)
+        hidden = db.session.get(Post, 5)
+        hidden.is_hidden = True
+        db.session.commit()
+
+        feed.update([post, hidden])
+        assert feed.ids(8) == _db_order(8) == [1, 2, 3, 8, 7, 6, 4]
+
+        feed.remove([1])
+        assert 1 not in feed.ids(8)
+
+    def test_update_trims_recent(self, feed, monkeypatch):
+        feed.ids(8)
+        monkeypatch.setattr(ranked_feed_mod, "RECENT_KEEP", 4)
+        feed.update([db.session.get(Post, 8)])
+        assert feed.redis.zcard(feed.key_recent()) == 4
+        assert feed.ids(8) == [5, 2, 3, 8]
+
+    def test_updates_after_a_flush_do_not_count_as_built(self, feed):
+        feed.update([db.session.get(Post, 4)])
+        assert not feed.redis.exists(feed.key_built())
+        assert feed.ids(8) == _db_order(8)
+
+    def test_other_callers_fall_back_while_one_rebuilds(self, feed):
+        token = redis_lock.acquire(feed.redis, feed.key_rebuild_lock(), 30)
+        assert feed.ids(8) is None
+        assert not feed.redis.exists(feed.key_built())
+
+        redis_lock.release(feed.redis, feed.key_rebuild_lock(), token)
+        assert feed.ids(8) == _db_order(8)
+
+    def test_unavailable_redis_reads_nothing(self, feed):
+        feed.redis_available = False
+        assert feed.ids(8) is None
+        feed.update([db.session.get(Post, 1)])  # no-op, never raises
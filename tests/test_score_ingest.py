@@ -0,0 +1,143 @@
+"""
+Unit tests for write-behind score ingestion, run through the synchronous path.
+
+Run with: python -m pytest tests/test_score_ingest.py
+"""
+
+import json
+
+import pytest
+
+from models import db, Score, PuzzlePlays, ScoreSubmission, UserScoreStats
+from services import score_stats, score_distribution
+from services import redis_lock
+from services.score_ingest import ACK_LUA, CLAIM_LUA, ScoreIngest, submission_key
+
+
+@pytest.fixture
+def ingest(app, service):
+    return service(ScoreIngest)
+
+
+@pytest.fixture
+def queued(app, service):
+    ing = service(ScoreIngest, fake_redis=True)
+    ing._claim_script = ing.redis.register_script(CLAIM_LUA)
+    ing._ack_script = ing.redis.register_script(ACK_LUA)
+    return ing
+
+
+def _record(key, user_id=1, puzzle_id=None, mode="easy", duration_sec=40, found_count=3, played=True):
+    return {
+        "key": key, "user_id": user_id, "display_name": "Player", "mode": mode,
+        "found_count": found_count, "total_words": 5, "duration_sec": duration_sec, "completed": False,
+        "seed": 7, "category": None, "hints_used": 0, "puzzle_id": puzzle_id,
+        "played_puzzle_id": puzzle_id if played else None,
+        "points": 320, "leaderboard_score": 3280, "created_at": "2026-10-17T12:00:00",
+    }
+
+
+class TestScoreIngest:
+    """Batches write every submission once, however often it arrives."""
+
+    def test_duplicate_submission_is_written_once(self, ingest):
+        assert ingest.submit(_record("k1"))["duplicate"] is False
+        assert ingest.submit(_record("k1"))["duplicate"] is True
+        assert db.session.query(Score).count() == 1
+
+    def test_batch_writes_scores_and_plays(self, ingest):
+        written = ingest.write_batch([_record("a", 1, 9), _record("b", 2, 9), _record("a", 1, 9), _record("c", 1, 9)])
+        assert sorted(written) == ["a", "b", "c"]
+        assert db.session.query(Score).count() == 3
+        assert db.session.query(ScoreSubmission).count() == 3
+        assert sorted((p.user_id, p.puzzle_id) for p in db.session.query(PuzzlePlays)) == [(1, 9), (2, 9)]
+        assert ingest.write_batch([_record("b", 2, 9)]) == {}
+
+    def test_inactive_template_keeps_its_id_without_a_play(self, ingest):
+        ingest.write_batch([_record("a", 1, 12, played=False)])
+        assert db.session.query(Score).one().puzzle_id == 12
+        assert db.session.query(PuzzlePlays).count() == 0
+
+    def test_submission_key(self):
+        payload = {"mode": "easy", "seed": 7, "found_count": 3}
+        assert submission_key(1, payload, now=1000) == submission_key(1, dict(payload), now=1001)
+        assert submission_key(1, payload, now=1000) != submission_key(2, payload, now=1000)
+        assert submission_key(1, payload, "client-1") != submission_key(1, payload, "client-2")
+        assert submission_key(1, payload, "client-1", now=0) == submission_key(1, payload, "client-1", now=10 ** 6)
+
+    def test_keyless_results_only_dedupe_within_the_window(self):
+        payload = {"mode": "easy", "daily": True, "seed": 7, "found_count": 3, "duration_sec": 90}
+        assert submission_key(1, payload, now=1000) != submission_key(1, payload, now=1000 + 86400)
+
+    def test_user_score_stats_rollup(self, ingest):
+        ingest.write_batch([_record("a", 1, duration_sec=40), _record("b", 1, mode="hard", duration_sec=25),
+                            _record("c", 2, duration_sec=None), _record("d", 2, found_count=0)])
+        ingest.write_batch([_record("e", 1, duration_sec=30)])
+        easy = db.session.get(UserScoreStats, (1, "easy"))
+        overall = db.session.get(UserScoreStats, (1, "*"))
+        assert (easy.games, easy.duration_sum, easy.best_time) == (2, 70, 30)
+        assert (overall.games, overall.duration_sum, overall.duration_count, overall.best_time) == (3, 95, 3, 25)
+        assert db.session.get(UserScoreStats, (2, "*")).duration_count == 0
+        assert score_stats.check()["ok"]
+
+        db.session.delete(easy)
+        db.session.commit()
+        assert score_stats.check()["missing"] == 1
+        score_stats.rebuild()
+        assert score_stats.check()["ok"]
+
+    def test_score_histogram(self, ingest):
+        records = [dict(_record(f"h{i}", i, mode=("easy", "hard")[i % 2]), completed=True,
+                        leaderboard_score=1000 * (i + 1) + 50) for i in range(6)]
+        ingest.write_batch(records + [_record("open")])
+        games = score_distribution.distribution(score=3050)
+        assert games["games"] == 6
+        assert (games["percentile"], games["top_percent"]) == (41.7, 58.3)
+        assert sum(b["count"] for b in score_distribution.distribution("easy", buckets=2)["histogram"]) == 3
+
+        incremental = score_distribution.distribution(buckets=50)
+        score_distribution.rebuild()
+        assert score_distribution.distribution(buckets=50)["games"] == incremental["games"]
+
+
+class TestDrain:
+    """Queued submissions are claimed onto a processing list and only dropped once written."""
+
+    def test_drain_writes_queue_and_clears_processing(self, queued):
+        for k in ("q1", "q2", "q2"):
+            queued.submit(_record(k))
+        assert queued.stats()["queued"] == 2
+        assert queued.drain() == 2
+        assert db.session.query(Score).count() == 2
+        assert queued.stats() == {"ok": True, "backend": "redis", "queued": 0, "processing": 0, "dead": 0}
+
+    def test_batch_left_by_a_dead_drainer_is_written_once(self, queued):
+        queued.redis.rpush(queued.key_processing(), json.dumps(_record("p1")))
+        queued.write_batch([_record("p1")])  # the dead drainer had already committed it
+        queued.submit(_record("p2"))
+        assert queued.drain() == 2
+        assert db.session.query(Score).count() == 2
+        assert queued.stats()["processing"] == 0
+
+    def test_held_lock_is_left_alone(self, queued):
+        token = redis_lock.acquire(queued.redis, queued.key_lock(), 60)
+        queued.submit(_record("q1"))
+        assert queued.drain() == 0
+        assert queued.redis.get(queued.key_lock()) == token
+        assert queued.stats()["queued"] == 1
+
+    def test_queued_completed_game_reports_provisional_rank(self, queued, monkeypatch):
+        from services.leaderboard import leaderboard_service as lb
+        monkeypatch.setattr(lb, "redis", queued.redis)
+        monkeypatch.setattr(lb, "redis_available", True)
+        monkeypatch.setattr(lb, "scripting_available", False)
+        for uid, score in ((2, 5000), (3, 1000)):
+            lb.submit_scores("mini_word_finder", [(str(uid), "P", score)])
+
+        result = queued.submit(dict(_record("r1"), completed=True, leaderboard_score=3280))
+        assert result["queued"] and result["redis_leaderboard"]["provisional"]
+        assert result["redis_leaderboard"]["rank"] == 2
+        assert queued.submit(_record("r2"))["redis_leaderboard"] is None
+
+        queued.drain()
+        assert lb.get_user_rank("mini_word_finder", "1")["rank"] == 2
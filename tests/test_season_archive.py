@@ -0,0 +1,50 @@
+"""
+Unit tests for reading archived leaderboard seasons from the snapshot tables.
+
+Run with: python -m pytest tests/test_season_archive.py
+"""
+
+import pytest
+
+from models import db, LeaderboardSeason, LeaderboardSeasonEntry
+from services.leaderboard import leaderboard_service
+from services.season_archive import SeasonArchive
+
+
+@pytest.fixture
+def archive(app):
+    db.session.add(LeaderboardSeason(game_code="g", season_id="2025-W38", players=5))
+    for rank in range(1, 6):
+        db.session.add(LeaderboardSeasonEntry(game_code="g", season_id="2025-W38", rank=rank,
+                                              user_id=str(10 + rank), display_name=None, score=100 - rank))
+    db.session.commit()
+    return SeasonArchive(leaderboard_service)
+
+
+class TestSeasonArchive:
+    """Archived seasons answer like the live leaderboard; other seasons fall through."""
+
+    def test_unarchived_season_is_not_served(self, archive):
+        assert archive.top("g", "2025-W39", 3) is None
+        assert archive.rank("other", "2025-W38", "11") is None
+
+    def test_top_and_rank(self, archive):
+        top = archive.top("g", "2025-W38", 2)
+        assert [(r["rank"], r["user_id"], r["display_name"]) for r in top["rows"]] == [(1, "11", "Player"), (2, "12", "Player")]
+        assert archive.rank("g", "2025-W38", "13")["rank"] == 3
+        assert archive.rank("g", "2025-W38", "99")["rank"] is None
+
+    def test_around_user(self, archive):
+        around = archive.around("g", "2025-W38", "11", 2)
+        assert [r["rank"] for r in around["rows"]] == [1, 2, 3]
+        assert [r["me"] for r in around["rows"]] == [True, False, False]
+        assert archive.around("g", "2025-W38", "99", 2)["present"] is False
+
+    def test_archive_ended_skips_while_another_worker_holds_the_lock(self, app, service):
+        lb = service(type(leaderboard_service), fake_redis=True)
+        busy = SeasonArchive(lb)
+        busy.ended_seasons = lambda game_code: pytest.fail("archived without the lock")
+        lb.redis.sadd(lb.key_games(), "g")
+        lb.redis.set(busy.key_lock(), "other-worker")
+        assert busy.archive_ended() == 0
+        assert lb.redis.get(busy.key_lock()) == "other-worker"
@@ -0,0 +1,45 @@
+"""
+Unit tests for the in-process category word index.
+
+Run with: python -m pytest tests/test_word_index.py
+"""
+
+import random
+
+from word_index import CategoryWordIndex
+
+
+def _index(rows):
+    """An index loaded from (category_key, text) rows without touching a database."""
+    idx = CategoryWordIndex(check_interval=3600)
+    idx._buckets = idx._build(rows)
+    idx.version = (len(rows),)
+    idx._checked_at = float("inf")
+    return idx
+
+
+ROWS = [
+    ("animals", "cat"), ("animals", "dog"), ("animals", "horse"), ("animals", "zebra"),
+    ("animals", "elephant"), ("animals", "Cat"), ("food", "pizza"),
+]
+
+
+class TestCategoryWordIndex:
+    """Test bucketing and sampling."""
+
+    def test_buckets_by_length_and_dedupes(self):
+        idx = _index(ROWS)
+        assert idx._buckets["animals"] == [(3, "CATDOG"), (5, "HORSEZEBRA"), (8, "ELEPHANT")]
+
+    def test_sample_respects_max_len_and_category(self):
+        idx = _index(ROWS)
+        words = idx.sample("animals", 10, 5, rnd=random.Random(1))
+        assert sorted(words) == ["CAT", "DOG", "HORSE", "ZEBRA"]
+        assert idx.sample("food", 10, 10) == ["PIZZA"]
+        assert idx.sample("missing", 5, 10) == []
+
+    def test_sample_is_deterministic_per_seed(self):
+        idx = _index(ROWS)
+        a = idx.sample("animals", 2, 8, rnd=random.Random(7))
+        b = idx.sample("animals", 2, 8, rnd=random.Random(7))
+        assert a == b and len(set(a)) == 2
@@ -0,0 +1,81 @@
+# tools/bench_leaderboard.py
+"""
+Benchmark for LeaderboardService.submit_score against a local redis-server.
+
+Compares the single EVALSHA script with the pipeline fallback on the same
+stream of submissions, and checks both leave identical leaderboard state.
+Uses a throwaway game code; its keys are deleted afterwards.
+Run with: python tools/bench_leaderboard.py [--url redis://localhost:6379/15] [--n 5000] [--users 500]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import random
+import time
+
+import redis
+
+from services.leaderboard import SUBMIT_SCORE_LUA, LeaderboardService
+
+
+def service(url):
+    """A LeaderboardService bound to url instead of the app's Redis"""
+    svc = LeaderboardService.__new__(LeaderboardService)
+    svc.redis = redis.from_url(url, decode_responses=True)
+    svc.redis.ping()
+    svc.redis_available = True
+    svc._submit_script = svc.redis.register_script(SUBMIT_SCORE_LUA)
+    svc.scripting_available = True
+    svc.allow_dev_unsigned = True
+    svc.secret = "bench"
+    return svc
+
+
+def snapshot(svc, game):
+    season = svc.iso_week_season()
+    return (svc.redis.zrange(svc.key_lb(game, season), 0, -1, withscores=True),
+            svc.redis.hgetall(svc.key_best(game)),
+            svc.redis.hgetall(svc.key_user(game, season)))
+
+
+def cleanup(svc, game):
+    season = svc.iso_week_season()
+    svc.redis.delete(svc.key_lb(game, season), svc.key_user(game, season),
+                     svc.key_best(game), svc.key_meta(game))
+    svc.redis.srem(svc.key_games(), game)
+
+
+def run(svc, game, stream, scripted):
+    svc.scripting_available = scripted
+    cleanup(svc, game)
+    started = time.perf_counter()
+    for uid, score in stream:
+        r = svc.submit_score(uid, f"Player{uid}", game, score)
+        assert r["ok"] and r["rank"] is not None
+    elapsed = time.perf_counter() - started
+    state = snapshot(svc, game)
+    cleanup(svc, game)
+    return elapsed, state
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="redis://localhost:6379/15")
+    ap.add_argument("--n", type=int, default=5000, help="submissions")
+    ap.add_argument("--users", type=int, default=500)
+    args = ap.parse_args()
+
+    svc = service(args.url)
+    rnd = random.Random(1)
+    stream = [(str(rnd.randrange(args.users)), rnd.randrange(10_000)) for _ in range(args.n)]
+    game = f"bench_{os.getpid()}"
+
+    old, old_state = run(svc, game, stream, scripted=False)
+    new, new_state = run(svc, game, stream, scripted=True)
+    assert old_state == new_state, "script and pipeline paths disagree"
+
+    print(f"{args.n} submissions, {args.users} users")
+    print(f"pipeline  {old / args.n * 1e6:8.1f} us/submit  (6 round-trips)")
+    print(f"script    {new / args.n * 1e6:8.1f} us/submit  (1 round-trip)   speedup {old / new:4.1f}x")
@@ -0,0 +1,74 @@
+# tools/bench_puzzles.py
+"""
+Micro-benchmark for the puzzle answer-key solver.
+
+Compares puzzles._build_key against the original brute-force scan on the
+same procedurally generated grids, per mode.
+Run with: python tools/bench_puzzles.py [--puzzles 200] [--repeat 5]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import timeit
+
+from puzzles import DIRS, MODE_CONFIG, _build_key, generate_puzzle
+
+
+def build_key_bruteforce(rows, words):
+    """The pre-index solver: every word x direction x cell x letter."""
+    ans = {}
+    grid = [list(r) for r in rows]
+    n = len(grid)
+    for W in [w.upper() for w in words]:
+        hit = None
+        for cand in (W, W[::-1]):
+            for d, (dr, dc) in DIRS.items():
+                for r in range(n):
+                    for c in range(n):
+                        ok = True
+                        for i, ch in enumerate(cand):
+                            rr, cc = r + dr * i, c + dc * i
+                            if rr < 0 or cc < 0 or rr >= n or cc >= n or grid[rr][cc] != ch:
+                                ok = False
+                                break
+                        if ok:
+                            hit = {"start": [r, c], "dir": d, "len": len(cand)}
+                            break
+                    if hit:
+                        break
+                if hit:
+                    break
+            if hit:
+                break
+        if hit:
+            ans[W] = hit
+    return ans
+
+
+def bench(mode, puzzles, repeat):
+    samples = [generate_puzzle(mode, seed=s) for s in range(puzzles)]
+    for P in samples:
+        assert _build_key(P["grid"], P["words"]) == build_key_bruteforce(P["grid"], P["words"])
+
+    def run(fn):
+        return min(timeit.repeat(
+            lambda: [fn(P["grid"], P["words"]) for P in samples], number=1, repeat=repeat
+        )) / len(samples)
+
+    old = run(build_key_bruteforce)
+    new = run(_build_key)
+    size = MODE_CONFIG[mode]["size"]
+    print(f"{mode:<7} {size}x{size}  brute-force {old * 1e6:8.1f} us   "
+          f"indexed {new * 1e6:7.1f} us   speedup {old / new:5.1f}x")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--puzzles", type=int, default=200, help="grids per mode")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for mode in MODE_CONFIG:
+        bench(mode, args.puzzles, args.repeat)
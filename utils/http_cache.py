@@ -0,0 +1,58 @@
+"""
+Conditional GET for public JSON endpoints backed by services.board_versions
+The ETag hashes the request path and query with the versions of the boards the
+view reads, so a client or CDN revalidating an unchanged board gets a bare 304
+without the view running. A time window is mixed in as well, so changes no
+board version tracks (renamed players, new avatars) still show up within
+HTTP_CACHE_REFRESH_SEC.
+"""
+import os, time, hashlib
+from functools import wraps
+from email.utils import formatdate
+from flask import request, make_response
+
+from services.board_versions import board_versions
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "15"))          # browsers
+HTTP_CACHE_S_MAXAGE = int(os.getenv("HTTP_CACHE_S_MAXAGE", "30"))        # CDN / shared caches
+HTTP_CACHE_SWR = int(os.getenv("HTTP_CACHE_SWR", "60"))                  # stale-while-revalidate
+HTTP_CACHE_REFRESH_SEC = int(os.getenv("HTTP_CACHE_REFRESH_SEC", "300"))  # ETag rolls over at least this often
+
+def cache_control() -> str:
+    return (f"public, max-age={HTTP_CACHE_MAX_AGE}, s-maxage={HTTP_CACHE_S_MAXAGE}, "
+            f"stale-while-revalidate={HTTP_CACHE_SWR}")
+
+def _not_modified(etag: str, last_modified: int) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return since is not None and int(since.timestamp()) >= last_modified
+
+def conditional(boards_fn):
+    """
+    Decorator: answer If-None-Match / If-Modified-Since with 304 when none of
+    boards_fn(**view_args) has changed; tag 200 responses with ETag,
+    Last-Modified and a CDN-friendly Cache-Control.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            tag, last_modified = board_versions.get(boards_fn(**kwargs))
+            window = int(time.time()) // HTTP_CACHE_REFRESH_SEC
+            last_modified = max(last_modified, window * HTTP_CACHE_REFRESH_SEC)
+            etag = hashlib.sha1(f"{request.full_path}|{tag}|{window}".encode()).hexdigest()[:20]
+            headers = {"ETag": f'"{etag}"', "Last-Modified": formatdate(last_modified, usegmt=True),
+                       "Cache-Control": cache_control(), "Vary": "Accept-Encoding"}
+
+            if _not_modified(etag, last_modified):
+                resp = make_response("", 304)
+                resp.headers.update(headers)
+                return resp
+
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code == 200:
+                resp.headers.update(headers)
+            return resp
+        return wrapper
+    return decorator
@@ -0,0 +1,18 @@
+"""Server-Sent Events responses for services.live_events channels"""
+from flask import Response, jsonify
+
+from services.live_events import live_events
+
+def sse_response(channels):
+    """text/event-stream of the given live channels, or 503 when this worker has no stream slots left"""
+    sub = live_events.subscribe(channels)
+    if sub is None:
+        resp = jsonify({"ok": False, "error": "stream_busy"})
+        resp.status_code = 503
+        resp.headers["Retry-After"] = "30"
+        return resp
+    resp = Response(live_events.stream(sub), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    # Frees the slot even if the client disconnects before the first frame
+    resp.call_on_close(sub.close)
+    return resp
@@ -0,0 +1,116 @@
+"""
+Process-wide category word index.
+
+Loads every non-banned word once per process, bucketed by category and word
+length. Each bucket is one string of equal-length words laid end to end, so
+the index stays compact and sampling is pure in-process arithmetic. The index
+is reloaded only when a version stamp over words, categories and
+word_categories changes, and that stamp is checked at most every
+WORD_INDEX_CHECK_SEC. The stamp sums a hash of every row that feeds the
+index, so edits and category reassignments that keep the row counts change
+it too; it is one aggregate per table and transfers nothing but the sums.
+"""
+import os, time, random, threading
+from bisect import bisect_right
+from itertools import accumulate
+
+import psycopg2
+
+WORD_INDEX_CHECK_SEC = int(os.getenv("WORD_INDEX_CHECK_SEC", "300"))
+
+VERSION_SQL = """
+  SELECT (SELECT COUNT(*) FROM words),
+         (SELECT COALESCE(SUM(hashtext(id || ':' || text || ':' || is_banned::text)::bigint), 0) FROM words),
+         (SELECT COALESCE(SUM(hashtext(id || ':' || key)::bigint), 0) FROM categories),
+         (SELECT COUNT(*) FROM word_categories),
+         (SELECT COALESCE(SUM(hashtext(word_id || ':' || category_id)::bigint), 0) FROM word_categories)
+"""
+
+LOAD_SQL = """
+  SELECT c.key, w.text
+  FROM words w
+  JOIN word_categories wc ON wc.word_id = w.id
+  JOIN categories c ON c.id = wc.category_id
+  WHERE w.is_banned = FALSE
+"""
+
+class CategoryWordIndex:
+    def __init__(self, check_interval=WORD_INDEX_CHECK_SEC):
+        self.check_interval = check_interval
+        self.version = None  # stamp of the loaded index; part of any cache key derived from it
+        self._checked_at = None
+        self._buckets = {}   # category -> [(length, "WORD1WORD2...")] sorted by length
+        self._lock = threading.Lock()
+
+    def refresh(self, conn=None, force=False):
+        """Reload if the version stamp changed. Uses conn if given, else DATABASE_URL."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            own = conn is None
+            if own:
+                url = os.getenv("DATABASE_URL")
+                if not url:
+                    return
+                try:
+                    conn = psycopg2.connect(url)
+                except Exception as e:
+                    print(f"Word index: could not connect: {e}")
+                    self._checked_at = now
+                    return
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(VERSION_SQL)
+                    version = tuple(cur.fetchone())
+                    if force or version != self.version:
+                        cur.execute(LOAD_SQL)
+                        self._buckets = self._build(cur.fetchall())
+                        self.version = version
+                self._checked_at = now
+            except Exception as e:
+                print(f"Word index: refresh failed, keeping previous index: {e}")
+                self._checked_at = now
+            finally:
+                if own:
+                    conn.close()
+
+    @staticmethod
+    def _build(rows):
+        by_cat = {}
+        for key, text in rows:
+            word = text.strip().upper()
+            if word:
+                by_cat.setdefault(key, {}).setdefault(len(word), set()).add(word)
+        return {
+            key: [(n, "".join(sorted(words))) for n, words in sorted(lengths.items())]
+            for key, lengths in by_cat.items()
+        }
+
+    def sample(self, category, k, max_len, rnd=None):
+        """Up to k distinct words from category with length <= max_len.
+
+        Deterministic for a given rnd state and index version.
+        """
+        self.refresh()
+        rnd = rnd or random
+        spans = [(n, s) for n, s in self._buckets.get(category, []) if n <= max_len]
+        if not spans:
+            return []
+        cum = list(accumulate(len(s) // n for n, s in spans))
+        out = []
+        for i in rnd.sample(range(cum[-1]), min(k, cum[-1])):
+            b = bisect_right(cum, i)
+            n, s = spans[b]
+            off = i - (cum[b - 1] if b else 0)
+            out.append(s[off * n:(off + 1) * n])
+        return out
+
+    def categories(self):
+        self.refresh()
+        return sorted(self._buckets)
+
+# Global instance (one per process)
+category_words = CategoryWordIndex()
@@ -0,0 +1,66 @@
+"""
+Shared word-path solver for word search grids.
+
+A grid is indexed once (all 8-directional lines joined into one string, see
+puzzles._line_index) and every lookup after that is a substring search plus
+a memoized result per word. Indexes are kept in a small LRU keyed by a hash
+of the grid, so repeated reveals and hints on the same puzzle never rescan it.
+"""
+import os, hashlib, threading
+from collections import OrderedDict
+
+from puzzles import _line_index, _locate, answer_path
+
+WORD_PATH_CACHE_SIZE = int(os.getenv("WORD_PATH_CACHE_SIZE", "1024"))  # grid indexes kept per worker
+
+class WordPathIndex:
+    """All word paths of one grid. Lookups are case-insensitive."""
+
+    __slots__ = ("text", "cells", "_hits")
+
+    def __init__(self, grid):
+        rows = ["".join(r).upper() for r in grid or []]
+        if rows and all(len(r) == len(rows) for r in rows):
+            self.text, self.cells = _line_index(rows)
+        else:
+            self.text, self.cells = "", ()  # generated grids are always square
+        self._hits = {}
+
+    def answer(self, word):
+        """{"start", "dir", "len"} for word, or None if it is not in the grid."""
+        W = str(word or "").upper()
+        if W not in self._hits:
+            self._hits[W] = _locate(self.text, self.cells, W)
+        return self._hits[W]
+
+    def path(self, word):
+        """Cells spelling word as [{"row", "col"}], or None if it is not in the grid."""
+        hit = self.answer(word)
+        return answer_path(hit) if hit else None
+
+def grid_hash(grid) -> str:
+    return hashlib.blake2b("\n".join("".join(r) for r in grid).encode(), digest_size=8).hexdigest()
+
+_lock = threading.Lock()
+_indexes: "OrderedDict[str, WordPathIndex]" = OrderedDict()
+
+def index_for(grid) -> WordPathIndex:
+    """Cached WordPathIndex for grid, built on first use."""
+    h = grid_hash(grid or [])
+    with _lock:
+        idx = _indexes.get(h)
+        if idx is not None:
+            _indexes.move_to_end(h)
+            return idx
+    idx = WordPathIndex(grid)
+    with _lock:
+        _indexes[h] = idx
+        if len(_indexes) > WORD_PATH_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return idx
+
+def find_word_path(grid, word):
+    """Path of word in grid as [{"row", "col"}], or None."""
+    if not grid or not word:
+        return None
+    return index_for(grid).path(word)